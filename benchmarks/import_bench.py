@@ -0,0 +1,54 @@
+"""
+Measures the time taken by import pyrai in fresh interpreters, and fails
+if the fastest of the runs is over budget, or if an optional
+visualization dependency is loaded by the import.
+
+Usage:
+    PYTHONPATH=. python benchmarks/import_bench.py [--runs N] [--budget MS]
+"""
+import argparse
+import subprocess
+import sys
+
+OPTIONAL = ("plotly", "IPython", "numpy", "aiohttp", "orjson")
+
+def import_time():
+    # -X importtime reports the cumulative import time of every module, in microseconds
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pyrai"],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+    for line in out.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "pyrai":
+            return int(fields[1]) / 1000
+    raise RuntimeError("pyrai not found in the import times:\n" + out)
+
+def loaded_optional():
+    code = "import sys, pyrai; print(' '.join(m for m in {!r} if m in sys.modules))".format(OPTIONAL)
+    out = subprocess.run([sys.executable, "-c", code],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+    return out.split()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=300, help="milliseconds")
+    args = parser.parse_args()
+
+    times = sorted(import_time() for _ in range(args.runs))
+    print("import pyrai   min {:6.1f} ms   median {:6.1f} ms   budget {:6.1f} ms".format(
+        times[0], times[len(times) // 2], args.budget))
+
+    failed = False
+    if times[0] > args.budget:
+        print("FAIL: import pyrai is over budget")
+        failed = True
+
+    loaded = loaded_optional()
+    if loaded:
+        print("FAIL: import pyrai loads {}".format(", ".join(loaded)))
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Reports the memory held by vehicle snapshots, i.e. a Vehicle with its
+Location and the Events (each with a Location) of its route, as decoded
+from a get_assignments response. The slotted model classes are compared
+with plain classes that keep attributes in a __dict__, as the models did
+before, and with Location interning enabled. Vehicles and events are
+located at a fixed set of stops, so the same coordinates repeat and
+interning keeps one Location per stop. --stops sets the number of stops.
+
+Usage:
+    PYTHONPATH=. python benchmarks/memory_bench.py [--vehicles N] [--events N] [--stops N]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from pyrai.dispatcher.structures.event import Event
+from pyrai.dispatcher.structures.fleet import Fleet
+from pyrai.dispatcher.structures.location import Location
+from pyrai.dispatcher.structures.vehicle import Vehicle
+from pyrai.dispatcher.structures.vehicle_event import VehicleEvent
+from pyrai.helpers import from_rfc3339
+
+def plain(cls):
+    # the same class, with instance attributes in a __dict__
+    return type("Plain" + cls.__name__, (object,), {"__init__": cls.__init__})
+
+PlainLocation, PlainEvent, PlainVehicle = plain(Location), plain(Event), plain(Vehicle)
+
+def responses(vehicles, events, stops):
+    # vehicles wait at and travel between stops shared by the whole fleet, as
+    # on a network of fixed stops, so the same coordinates repeat in many
+    # vehicles and events, each decoded from its own dictionary
+    stop = lambda i: {"lat": 50.7 + i % stops * 1e-5, "lng": 6.0 + i % stops * 1e-5}
+    return [{
+        "veh_id": v,
+        "location": stop(v),
+        "assigned": True,
+        "req_ids": [v * 10 + e // 2 for e in range(0, events, 2)],
+        "events": [{
+            "req_id": v * 10 + e // 2,
+            "location": stop(v + e + 1),
+            "time": "2020-07-01T12:{:02d}:{:02d}.{:06d}Z".format(e, v % 60, v),
+            "event": VehicleEvent.PICKUP if e % 2 == 0 else VehicleEvent.DROPOFF
+        } for e in range(events)]
+    } for v in range(vehicles)]
+
+def decode_plain(fleet, d):
+    location = lambda l: PlainLocation(l["lat"], l["lng"])
+    return PlainVehicle(fleet, d["veh_id"], location(d["location"]), d["assigned"], d["req_ids"],
+        [PlainEvent(e["req_id"], location(e["location"]), from_rfc3339(e["time"]), e["event"])
+            for e in d["events"]])
+
+def decode_slotted(fleet, d):
+    return Vehicle.fromdict(fleet, d)
+
+def bytes_per_vehicle(decode, fleet, data):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    snapshots = [decode(fleet, d) for d in data]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del snapshots
+    return (after - before) / len(data)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vehicles", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=4)
+    parser.add_argument("--stops", type=int, default=200)
+    args = parser.parse_args()
+
+    fleet = Fleet("api_key", "fleet_key")
+    data = responses(args.vehicles, args.events, args.stops)
+
+    plain_bytes = bytes_per_vehicle(decode_plain, fleet, data)
+    slotted_bytes = bytes_per_vehicle(decode_slotted, fleet, data)
+    Location.intern_locations()
+    interned_bytes = bytes_per_vehicle(decode_slotted, fleet, data)
+    Location.intern_locations(None)
+
+    print("{} events per vehicle, {} stops".format(args.events, args.stops))
+    for name, n in [("plain classes", plain_bytes), ("__slots__", slotted_bytes),
+        ("__slots__, interned locations", interned_bytes)]:
+        print("{:<32} {:8.0f} bytes per vehicle snapshot ({:+.0%})".format(
+            name, n, n / plain_bytes - 1))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares pyrai.helpers.from_rfc3339, with and without memoization, against
+dateutil.parser.isoparse on event times like those of a get_assignments
+response, after checking that both parse every time to the same datetime
+and timezone. Also times to_rfc3339 for naive and UTC datetimes.
+
+Usage:
+    PYTHONPATH=. python benchmarks/rfc3339_bench.py [--times N] [--distinct N]
+"""
+import argparse
+import datetime
+import random
+import timeit
+
+from dateutil.parser import isoparse
+
+from pyrai.helpers import to_rfc3339, from_rfc3339, memoize_rfc3339
+
+def event_times(n, distinct):
+    start = datetime.datetime(2020, 7, 1, tzinfo=datetime.timezone.utc)
+    pool = []
+    for _ in range(distinct):
+        t = start + datetime.timedelta(seconds=random.randint(0, 86400), microseconds=random.randint(0, 999999))
+        s = to_rfc3339(t)
+        # the API may send up to nanosecond precision
+        if "." in s and random.random() < 0.25:
+            s = s[:-1] + str(random.randint(1, 999)) + "Z"
+        pool.append(s)
+    pool += ["2020-07-01T12:00:00Z", "2020-07-01T12:00:00.5Z", "2020-07-01T12:00:00+02:00",
+        "2020-07-01T24:00:00Z", "2020-07-01 12:00:00Z"]
+    return [random.choice(pool) for _ in range(n)], pool
+
+def check(pool):
+    for s in pool:
+        expected, actual = isoparse(s), from_rfc3339(s)
+        if expected != actual or type(expected.tzinfo) is not type(actual.tzinfo) \
+            or expected.utcoffset() != actual.utcoffset():
+            raise AssertionError("{}: isoparse {!r}, from_rfc3339 {!r}".format(s, expected, actual))
+    print("from_rfc3339 matches isoparse on {} distinct strings".format(len(pool)))
+
+def report(name, seconds, n):
+    print("{:<28} {:8.2f} us per time".format(name, seconds / n * 1e6))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--times", type=int, default=40000)
+    parser.add_argument("--distinct", type=int, default=2000)
+    args = parser.parse_args()
+
+    times, pool = event_times(args.times, args.distinct)
+    check(pool)
+
+    report("isoparse", timeit.timeit(lambda: [isoparse(s) for s in times], number=1), len(times))
+    report("from_rfc3339", timeit.timeit(lambda: [from_rfc3339(s) for s in times], number=1), len(times))
+
+    memoize_rfc3339(args.distinct * 2)
+    report("from_rfc3339, memoized", timeit.timeit(lambda: [from_rfc3339(s) for s in times], number=1), len(times))
+    memoize_rfc3339(None)
+
+    naive = datetime.datetime.now()
+    utc = datetime.datetime.now(datetime.timezone.utc)
+    n = 100000
+    report("to_rfc3339, naive", timeit.timeit(lambda: to_rfc3339(naive), number=n), n)
+    report("to_rfc3339, utc", timeit.timeit(lambda: to_rfc3339(utc), number=n), n)
+
+if __name__ == "__main__":
+    main()
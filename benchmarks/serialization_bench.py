@@ -0,0 +1,81 @@
+"""
+Measures request building and JSON encoding of an update_vehicle payload,
+and decoding of a get_assignments response, for every available
+JSONCodec. Also compares building the user key per call, as fleets did
+before, against the cached Fleet.user_key_dict.
+
+Usage:
+    PYTHONPATH=. python benchmarks/serialization_bench.py [--vehicles N] [--repeat N]
+"""
+import argparse
+import datetime
+import timeit
+
+from pyrai.dispatcher.structures.fleet import Fleet
+from pyrai.dispatcher.structures.json_codec import JSONCodec
+from pyrai.dispatcher.structures.location import Location
+from pyrai.dispatcher.structures.user_key import UserKey
+from pyrai.dispatcher.structures.vehicle_event import VehicleEvent
+from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle_call
+
+def codecs():
+    available = [JSONCodec.stdlib()]
+    try:
+        available.append(JSONCodec.orjson())
+    except ImportError:
+        pass
+    return available
+
+def assignments(vehicles):
+    event = {
+        "req_id": 1,
+        "location": {"lat": 50.75, "lng": 6.01},
+        "time": "2020-07-01T12:00:00.000000Z",
+        "event": VehicleEvent.PICKUP
+    }
+    return {
+        "vehs": [{
+            "veh_id": i,
+            "location": {"lat": 50.75, "lng": 6.01},
+            "assigned": True,
+            "req_ids": [1, 2],
+            "events": [event] * 4
+        } for i in range(vehicles)],
+        "reqs": [],
+        "notifications": []
+    }
+
+def report(name, seconds, number):
+    print("{:<36} {:10.2f} us".format(name, seconds / number * 1e6))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vehicles", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    fleet = Fleet("api_key", "fleet_key")
+    location = Location(50.75, 6.01)
+    event_time = datetime.datetime.now()
+
+    number = args.repeat
+    report("user key, built per call", timeit.timeit(
+        lambda: UserKey(fleet.api_key, fleet.fleet_key).todict(), number=number), number)
+    report("user key, cached", timeit.timeit(
+        lambda: fleet.user_key_dict, number=number), number)
+
+    for codec in codecs():
+        def encode():
+            call = update_vehicle_call(fleet, 1, location, VehicleEvent.PROGRESS, event_time=event_time)
+            codec.dumps(call.payload)
+
+        report("build + encode update, " + codec.name, timeit.timeit(encode, number=number), number)
+
+    number = 5
+    body = JSONCodec.stdlib().dumps(assignments(args.vehicles)).encode()
+    for codec in codecs():
+        report("decode {} vehicles, {}".format(args.vehicles, codec.name),
+            timeit.timeit(lambda: codec.loads(body), number=number), number)
+
+if __name__ == "__main__":
+    main()
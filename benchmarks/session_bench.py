@@ -0,0 +1,77 @@
+"""
+Compares per-call latency of the module-level requests functions, which
+open a new connection per call, against a pooled Connection, using a
+local stub server that answers every POST with a StatusResponse.
+
+Usage:
+    PYTHONPATH=. python benchmarks/session_bench.py [--calls N]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import requests
+
+from pyrai.dispatcher.structures.connection import Connection
+
+BODY = json.dumps({"status": 0, "error": ""}).encode()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+def timed(post, url, payload, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        post(url, data=payload).json()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print("{:<12} mean {:8.1f} us   p50 {:8.1f} us   p99 {:8.1f} us".format(
+        name,
+        statistics.mean(latencies) * 1e6,
+        latencies[len(latencies) // 2] * 1e6,
+        latencies[int(len(latencies) * 0.99)] * 1e6))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}/dispatcher/vehicle/update".format(server.server_address[1])
+    payload = json.dumps({"id": 1, "location": {"lat": 50.75, "lng": 6.01}})
+
+    connection = Connection()
+    connection.prewarm(url)
+
+    report("requests", timed(requests.post, url, payload, args.calls))
+    report("Connection", timed(connection.post, url, payload, args.calls))
+
+    connection.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compares the peak memory of Fleet.forward_simulate, which reads and
+decodes the whole response, with Fleet.stream_forward_simulate, which
+decodes it as it arrives, for growing fleets. A local stub server sends
+a forward_simulate response with the given number of vehicles.
+
+Usage:
+    PYTHONPATH=. python benchmarks/stream_bench.py [--vehicles N [N ...]]
+"""
+import argparse
+import json
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from pyrai.dispatcher.structures.fleet import Fleet
+
+VEHICLES = 0
+
+def vehicle(i):
+    return {
+        "veh_id": i,
+        "location": {"lat": 50.75, "lng": 6.01},
+        "assigned": True,
+        "req_ids": [i],
+        "events": [{
+            "req_id": i,
+            "location": {"lat": 50.76, "lng": 6.02},
+            "time": "2020-07-01T12:00:00.000000Z",
+            "event": event
+        } for event in ("pickup", "dropoff")]
+    }
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(s):
+            b = s.encode()
+            self.wfile.write("{:x}\r\n".format(len(b)).encode() + b + b"\r\n")
+
+        # the body is generated piece by piece, so the server holds none of it
+        write('{"vehs": [')
+        for i in range(VEHICLES):
+            write((", " if i else "") + json.dumps(vehicle(i)))
+        write('], "reqs": [], "notifications": []}')
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+def peak(f):
+    tracemalloc.start()
+    f()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main():
+    global VEHICLES
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fleet = Fleet("api_key", "fleet_key", base_url="http://127.0.0.1:{}".format(server.server_address[1]))
+
+    def stream():
+        for _ in fleet.stream_forward_simulate("1m"):
+            pass
+
+    for n in args.vehicles:
+        VEHICLES = n
+        whole = peak(lambda: fleet.forward_simulate("1m"))
+        streamed = peak(stream)
+        print("{:>7} vehicles   forward_simulate {:8.1f} MB   stream_forward_simulate {:6.2f} MB".format(
+            n, whole / 1e6, streamed / 1e6))
+
+    fleet.connection.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
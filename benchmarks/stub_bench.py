@@ -0,0 +1,70 @@
+"""
+Measures the throughput and latency of client calls against the stub
+dispatcher of pyrai.testing, either in-process or over a local HTTP
+server, so it runs without network access.
+
+Usage:
+    PYTHONPATH=. python benchmarks/stub_bench.py [--transport {inprocess,http}] [--vehicles N [N ...]]
+        [--calls N] [--threads N] [--latency SECONDS]
+"""
+import argparse
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pyrai
+from pyrai.testing import StubDispatcher
+
+T0 = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+def percentile(times, p):
+    return times[min(int(len(times) * p), len(times) - 1)]
+
+def measure(name, f, calls, threads):
+    def timed(i):
+        start = time.perf_counter()
+        f(i)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        times = sorted(executor.map(timed, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    print("{:<32} {:>8.0f} calls/s   p50 {:7.2f} ms   p99 {:7.2f} ms".format(
+        name, calls / elapsed, percentile(times, 0.5) * 1000, percentile(times, 0.99) * 1000))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transport", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0)
+    args = parser.parse_args()
+
+    for vehicles in args.vehicles:
+        stub = StubDispatcher(vehicles=vehicles, latency=args.latency, seed=0)
+        server = stub.serve() if args.transport == "http" else None
+        url = server.url if server else StubDispatcher.URL
+
+        rai = pyrai.Pyrai(url=url, api_key="api_key", pool_size=max(args.threads, 1))
+        if server is None:
+            stub.install(rai.connection)
+        fleet = rai.create_sim_fleet()
+
+        print("{} vehicles, {}".format(vehicles, args.transport))
+        pickup, dropoff = pyrai.Location(42.36, -71.05), pyrai.Location(42.38, -71.03)
+        measure("add_request", lambda i: fleet.add_request(i, pickup, dropoff, 1, T0),
+            args.calls, args.threads)
+        measure("update_vehicle", lambda i: fleet.update_vehicle(i % vehicles, pickup, "unassigned", event_time=T0),
+            args.calls, args.threads)
+        measure("get_assignments", lambda i: fleet.get_assignments(T0),
+            max(args.calls * 100 // vehicles, 5), args.threads)
+
+        rai.close()
+        if server is not None:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Runs the micro-benchmarks of the client hot paths at several fleet sizes:
+decoding vehicles, events and assignments, to_rfc3339, building the
+payload of each fleet method, VehicleAssignments.todict, and end-to-end
+calls against the in-process stub dispatcher of pyrai.testing, so it
+runs without network access.
+
+Results can be saved as JSON, and compared against a saved baseline, in
+which case the run fails if a benchmark is slower than the baseline by
+more than the threshold. Only benchmarks found in both runs are compared.
+
+Usage:
+    PYTHONPATH=. python benchmarks/suite.py [--sizes N [N ...]] [--only NAME [NAME ...]]
+        [--min-time SECONDS] [--repeat N] [--save PATH] [--compare PATH] [--threshold RATIO]
+
+    # before a change, then after it
+    PYTHONPATH=. python benchmarks/suite.py --save baseline.json
+    PYTHONPATH=. python benchmarks/suite.py --compare baseline.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import pyrai
+from pyrai.dispatcher.structures.event import Event
+from pyrai.dispatcher.structures.fleet import Fleet
+from pyrai.dispatcher.structures.vehicle import Vehicle
+from pyrai.dispatcher.structures.vehicle_assignments import VehicleAssignments
+from pyrai.dispatcher.methods.fleet.add_request import add_request_call
+from pyrai.dispatcher.methods.fleet.cancel_request import cancel_request_call
+from pyrai.dispatcher.methods.fleet.forward_simulate import forward_simulate_call
+from pyrai.dispatcher.methods.fleet.get_assignments import get_assignments_call
+from pyrai.dispatcher.methods.fleet.get_request import get_request_call
+from pyrai.dispatcher.methods.fleet.get_vehicle_info import get_vehicle_info_call
+from pyrai.dispatcher.methods.fleet.make_vehicle_offline import make_vehicle_offline_call
+from pyrai.dispatcher.methods.fleet.make_vehicle_online import make_vehicle_online_call
+from pyrai.dispatcher.methods.fleet.remove_vehicle import remove_vehicle_call
+from pyrai.dispatcher.methods.fleet.set_params import set_params_call
+from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle_call
+from pyrai.helpers import to_rfc3339
+from pyrai.testing import StubDispatcher
+
+SIZES = [100, 1000, 10000, 50000]
+EVENTS = 4
+CALLS = 200
+T0 = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """
+    Registers a benchmark. The decorated function takes a fleet size and
+    returns the function to time, and the number of items it handles.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+def assignments(vehicles):
+    # every vehicle picks up and drops off EVENTS // 2 requests, at distinct times
+    def event(v, e):
+        return {
+            "req_id": v * EVENTS + e // 2,
+            "location": {"lat": 42.30 + (v * 7 + e) % 1000 * 1e-4, "lng": -71.10 + (v + e) % 1000 * 1e-4},
+            "time": to_rfc3339(T0 + datetime.timedelta(seconds=v % 3600 + e * 60, microseconds=v)),
+            "event": pyrai.VehicleEvent.PICKUP if e % 2 == 0 else pyrai.VehicleEvent.DROPOFF
+        }
+    return {
+        "vehs": [{
+            "veh_id": v,
+            "location": {"lat": 42.30 + v % 1000 * 1e-4, "lng": -71.10 + v % 997 * 1e-4},
+            "assigned": True,
+            "req_ids": [v * EVENTS + e for e in range(EVENTS // 2)],
+            "events": [event(v, e) for e in range(EVENTS)]
+        } for v in range(vehicles)],
+        "reqs": [{
+            "req_id": r,
+            "veh_id": r // (EVENTS // 2),
+            "pickup": {"lat": 42.31, "lng": -71.05},
+            "dropoff": {"lat": 42.35, "lng": -71.02},
+            "request_time": to_rfc3339(T0),
+            "load": 1,
+            "assigned": True
+        } for r in range(vehicles * EVENTS // 2)],
+        "notifications": []
+    }
+
+def offline_fleet():
+    # payloads are only built, so the connection never opens a socket
+    return Fleet(api_key="api_key", fleet_key="fleet_key", base_url=StubDispatcher.URL)
+
+@benchmark("vehicle_fromdict")
+def vehicle_fromdict(size):
+    fleet, vehs = offline_fleet(), assignments(size)["vehs"]
+    return lambda: [Vehicle.fromdict(fleet, d) for d in vehs], size
+
+@benchmark("event_fromdict")
+def event_fromdict(size):
+    events = [e for veh in assignments(size)["vehs"] for e in veh["events"]]
+    return lambda: [Event.fromdict(d) for d in events], len(events)
+
+@benchmark("assignments_fromdict")
+def assignments_fromdict(size):
+    fleet, resp = offline_fleet(), assignments(size)
+    return lambda: VehicleAssignments.fromdict(fleet, resp), size
+
+@benchmark("assignments_todict")
+def assignments_todict(size):
+    decoded = VehicleAssignments.fromdict(offline_fleet(), assignments(size))
+    return decoded.todict, size
+
+@benchmark("to_rfc3339")
+def to_rfc3339_times(size):
+    times = [T0 + datetime.timedelta(seconds=i, microseconds=i) for i in range(size)]
+    return lambda: [to_rfc3339(t) for t in times], size
+
+def payload(build, arguments):
+    # one call per vehicle, as when every vehicle of the fleet reports once
+    def setup(size):
+        fleet, location = offline_fleet(), pyrai.Location(42.36, -71.05)
+        calls = [arguments(i, location) for i in range(size)]
+        return lambda: [build(fleet, *a) for a in calls], size
+    return setup
+
+benchmark("payload_add_request")(payload(add_request_call,
+    lambda i, l: (i, l, l, 1, T0)))
+benchmark("payload_update_vehicle")(payload(update_vehicle_call,
+    lambda i, l: (i, l, pyrai.VehicleEvent.PROGRESS, pyrai.Defaults.DEFAULT_DIRECTION, T0)))
+benchmark("payload_make_vehicle_online")(payload(make_vehicle_online_call,
+    lambda i, l: (i, l, 4)))
+benchmark("payload_cancel_request")(payload(cancel_request_call,
+    lambda i, l: (i, T0)))
+benchmark("payload_get_vehicle_info")(payload(get_vehicle_info_call,
+    lambda i, l: (i,)))
+benchmark("payload_get_assignments")(payload(get_assignments_call,
+    lambda i, l: (T0,)))
+benchmark("payload_forward_simulate")(payload(forward_simulate_call,
+    lambda i, l: ("5m", T0)))
+benchmark("payload_remove_vehicle")(payload(remove_vehicle_call,
+    lambda i, l: (i, l)))
+benchmark("payload_set_params")(payload(set_params_call,
+    lambda i, l: ("3m", "6m", "2m", "1s")))
+benchmark("payload_make_vehicle_offline")(payload(make_vehicle_offline_call,
+    lambda i, l: (i, l)))
+benchmark("payload_get_request")(payload(get_request_call,
+    lambda i, l: (i,)))
+
+def stub_fleet(size, instrumentation=None):
+    stub = StubDispatcher(vehicles=size, seed=0)
+    rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key", instrumentation=instrumentation)
+    stub.install(rai.connection)
+    return rai.create_sim_fleet()
+
+@benchmark("call_add_request")
+def call_add_request(size):
+    fleet, location = stub_fleet(size), pyrai.Location(42.36, -71.05)
+    return lambda: [fleet.add_request(i, location, location, 1, T0) for i in range(CALLS)], CALLS
+
+@benchmark("call_add_request_instrumented")
+def call_add_request_instrumented(size):
+    fleet, location = stub_fleet(size, pyrai.Instrumentation()), pyrai.Location(42.36, -71.05)
+    return lambda: [fleet.add_request(i, location, location, 1, T0) for i in range(CALLS)], CALLS
+
+@benchmark("call_update_vehicle")
+def call_update_vehicle(size):
+    fleet, location = stub_fleet(size), pyrai.Location(42.36, -71.05)
+    return lambda: [fleet.update_vehicle(i % size, location, pyrai.VehicleEvent.UNASSIGNED, event_time=T0)
+        for i in range(CALLS)], CALLS
+
+@benchmark("call_get_assignments")
+def call_get_assignments(size):
+    fleet = stub_fleet(size)
+    return lambda: fleet.get_assignments(T0), size
+
+def measure(f, min_time, repeat):
+    """
+    Times f, calling it as many times per round as needed to run for
+    min_time, and returns the fastest round, in seconds per call.
+    """
+    start = time.perf_counter()
+    f()
+    once = time.perf_counter() - start
+    number = max(1, int(min_time / max(once, 1e-9)))
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            f()
+        rounds.append((time.perf_counter() - start) / number)
+    return min(rounds)
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(names, sizes, min_time, repeat):
+    results = {}
+    print("{:<28} {:>8} {:>12} {:>12}".format("benchmark", "size", "ms", "us/item"))
+    for name, setup in BENCHMARKS:
+        if names and name not in names:
+            continue
+        for size in sizes:
+            f, items = setup(size)
+            seconds = measure(f, min_time, repeat)
+            key = "{}[{}]".format(name, size)
+            results[key] = {"name": name, "size": size, "seconds": seconds, "per_item": seconds / items}
+            print("{:<28} {:>8} {:>12.3f} {:>12.3f}".format(name, size, seconds * 1e3, seconds / items * 1e6))
+    return results
+
+def compare(results, baseline, threshold):
+    """
+    Prints the ratio of each result to its baseline, and returns the keys
+    of the results slower than the baseline by more than threshold.
+    """
+    regressions = []
+    print("\n{:<40} {:>12} {:>12} {:>8}".format("benchmark", "baseline ms", "ms", "ratio"))
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print("{:<40} {:>12.3f} {:>12.3f} {:>8.2f}{}".format(
+            key, base["seconds"] * 1e3, result["seconds"] * 1e3, ratio, flag))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="fleet sizes, in vehicles")
+    parser.add_argument("--only", nargs="+", default=None, choices=[name for name, _ in BENCHMARKS],
+        metavar="NAME", help="benchmarks to run, among: " + ", ".join(name for name, _ in BENCHMARKS))
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--repeat", type=int, default=3, help="rounds per benchmark")
+    parser.add_argument("--save", help="path of the JSON file the results are written to")
+    parser.add_argument("--compare", help="path of the JSON results of a baseline run")
+    parser.add_argument("--threshold", type=float, default=0.1,
+        help="slowdown over the baseline reported as a regression, e.g. 0.1 for 10%%")
+    args = parser.parse_args()
+
+    results = run(args.only, args.sizes, args.min_time, args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "commit": commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "results": results
+            }, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("FAIL: {} slower than the baseline by more than {:.0%}".format(
+                ", ".join(regressions), args.threshold))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,2 @@
-from .dispatcher.structures import Defaults, Fleet, Pyrai, FleetParams, Vehicle, VehicleEvent, UserKey, Location, Request, Event, Notification, NotificationData, StatusResponse, VehicleAssignments, StatusError, Metrics
-__all__ = ["Defaults", "Fleet", "Pyrai", "FleetParams", "Vehicle", "VehicleEvent", "UserKey", "Location", "Request", "Event", "Notification", "NotificationData", "StatusResponse", "VehicleAssignments", "StatusError", "Metrics"]
+from .dispatcher.structures import Defaults, JSONCodec, JSONStream, Instrumentation, Tracer, TrafficRecorder, TrafficLog, Replayer, SimulationRunner, SimulationReport, WallClock, VirtualClock, FastForwardClock, CallRecord, EndpointStats, LatencyHistogram, Connection, Fleet, Pyrai, FleetParams, Vehicle, VehicleEvent, UserKey, Location, Request, Event, Notification, NotificationData, StatusResponse, VehicleAssignments, LazyList, LazyVehicleAssignments, ColumnarAssignments, AssignmentDiff, FleetState, LocalSimulation, LocalSimulator, LocalConnection, StatusError, BulkError, BulkResult, UpdateBuffer, Metrics, MetricsCache, AsyncConnection, AsyncVehicle, AsyncFleet, AsyncPyrai, AsyncUpdateBuffer, AsyncMetricsCache, AsyncReplayer
+__all__ = ["Defaults", "JSONCodec", "JSONStream", "Instrumentation", "Tracer", "TrafficRecorder", "TrafficLog", "Replayer", "SimulationRunner", "SimulationReport", "WallClock", "VirtualClock", "FastForwardClock", "CallRecord", "EndpointStats", "LatencyHistogram", "Connection", "Fleet", "Pyrai", "FleetParams", "Vehicle", "VehicleEvent", "UserKey", "Location", "Request", "Event", "Notification", "NotificationData", "StatusResponse", "VehicleAssignments", "LazyList", "LazyVehicleAssignments", "ColumnarAssignments", "AssignmentDiff", "FleetState", "LocalSimulation", "LocalSimulator", "LocalConnection", "StatusError", "BulkError", "BulkResult", "UpdateBuffer", "Metrics", "MetricsCache", "AsyncConnection", "AsyncVehicle", "AsyncFleet", "AsyncPyrai", "AsyncUpdateBuffer", "AsyncMetricsCache", "AsyncReplayer"]
@@ -1,26 +1,42 @@
 from .make_vehicle_online import make_vehicle_online
 from .make_vehicle_offline import  make_vehicle_offline
 from .update_vehicle import update_vehicle
+from .update_vehicles import update_vehicles
+from .enable_update_buffer import enable_update_buffer
+from .disable_update_buffer import disable_update_buffer
 from .remove_vehicle import remove_vehicle
 from .get_vehicle_info import get_vehicle_info
 from .set_params import set_params
 from .add_request import add_request
+from .add_requests import add_requests
 from .cancel_request import cancel_request
 from .get_request import get_request
 from .get_assignments import get_assignments
 from .forward_simulate import forward_simulate
+from .stream_forward_simulate import stream_forward_simulate
+from .get_metrics import get_metrics
 from .plot_metrics import plot_metrics
 from .visualize import visualize
+from .trace import trace
+from .replay import replay
 __all__ = ["make_vehicle_online", 
 "make_vehicle_offline",
 "update_vehicle",
+"update_vehicles",
+"enable_update_buffer",
+"disable_update_buffer",
 "remove_vehicle",
 "get_vehicle_info",
 "set_params",
 "add_request",
+"add_requests",
 "cancel_request",
 "get_request",
 "get_assignments",
 "forward_simulate",
-"plot_metrics"
+"stream_forward_simulate",
+"get_metrics",
+"plot_metrics",
+"trace",
+"replay"
 ]
\ No newline at end of file
@@ -1,9 +1,6 @@
 from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.status_response import StatusResponse
-from pyrai.dispatcher.structures.status_error import StatusError
-import datetime
-import requests
-import json
+from pyrai.dispatcher.structures.call import Call
 from pyrai.helpers import to_rfc3339
 
 def add_request(self, rid, pickup, dropoff, load, request_time=None):
@@ -15,7 +12,7 @@ def add_request(self, rid, pickup, dropoff, load, request_time=None):
         pickup (Location): The pickup location.
         dropoff (Location): The dropoff location.
         load (int): The load (number of passengers).
-        request_time (datetime.datetime, optional): Time of the request. This may be in the future for scheduled pickups. Set to datetime.datetime.now() if not provided. Defaults to None.
+        request_time (datetime.datetime, optional): Time of the request. This may be in the future for scheduled pickups. Set to the time of the fleet's clock if not provided. Defaults to None.
 
     Returns:
         StatusResponse: If successful.
@@ -23,27 +20,28 @@ def add_request(self, rid, pickup, dropoff, load, request_time=None):
     Raises:
         StatusError: If unsuccessful.
     """
-    
+    return self.connection.send(add_request_call, self, rid, pickup, dropoff, load, request_time)
+
+def add_request_call(self, rid, pickup, dropoff, load, request_time=None):
+    """
+    Builds the Call made by add_request.
+
+    Returns:
+        Call: The call adding the request.
+    """
     if request_time is None:
-        request_time = datetime.datetime.now()
+        request_time = self.clock.now()
 
-    if request_time > self.end_time:
-        self.end_time = request_time
+    self.extend_end_time(request_time)
 
-    url = self.build_url(Endpoints.ADD_REQUEST)
     payload = {
         'id': rid,
         'pickup': pickup.todict(),
         'dropoff': dropoff.todict(),
         'load': load,
         'request_time': to_rfc3339(request_time),
-        'user_key': self.user_key.todict()
+        'user_key': self.user_key_dict
     }
 
-    r = requests.post(url, data=json.dumps(payload))
-    resp = r.json()
-
-    if r.status_code == 200:
-        return StatusResponse(resp=resp)
-    else:
-        raise StatusError(resp=resp)
+    return Call("POST", Endpoints.ADD_REQUEST, self.build_url(Endpoints.ADD_REQUEST),
+        payload, StatusResponse.fromdict)
@@ -0,0 +1,135 @@
+import csv
+import datetime
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pyrai.helpers import from_rfc3339
+from pyrai.dispatcher.structures.defaults import Defaults
+from pyrai.dispatcher.structures.location import Location
+from pyrai.dispatcher.structures.bulk_error import BulkError
+from pyrai.dispatcher.structures.bulk_result import BulkResult
+from pyrai.dispatcher.methods.fleet.add_request import add_request_call
+
+def add_requests(self, source, max_in_flight=Defaults.MAX_CONCURRENCY):
+    """
+    Attempts to add many requests, streamed from source. Trips are read one
+    at a time and only when fewer than max_in_flight requests are in flight,
+    so memory stays bounded however long the source is. Locations and
+    request times are built just before each request is sent. A failed
+    trip does not stop the others, and is reported in the result instead
+    of being raised.
+
+    Each trip provides rid, pickup, dropoff, load and optionally request_time,
+    either with the arguments of add_request (pickup and dropoff as Locations
+    or {'lat', 'lng'} dicts, request_time as a datetime or RFC3339 string), or
+    as flat pickup_lat, pickup_lng, dropoff_lat and dropoff_lng columns.
+
+    Args:
+        source (iterable or str): An iterable of trip dicts, or the path of a CSV
+            file with a header row, or of a JSONL file with one trip per line.
+        max_in_flight (int, optional): The maximum number of requests in flight.
+            This should not exceed the pool size of the fleet's connection.
+            Defaults to Defaults.MAX_CONCURRENCY.
+
+    Returns:
+        BulkResult: The number of trips sent and the failed trips, indexed by their
+            position in source. Responses of successful trips are not kept.
+
+    Raises:
+        ValueError: If source is a path that is not a .csv or .jsonl file.
+    """
+    errors = []
+    count = 0
+
+    def send(i, trip):
+        try:
+            self.connection.send(add_request_call, self, **trip_kwargs(trip))
+        except Exception as e:
+            errors.append(BulkError(i, trip, e))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        in_flight = set()
+        for i, trip in enumerate(read_trips(source)):
+            if len(in_flight) >= max_in_flight:
+                _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            in_flight.add(executor.submit(send, i, trip))
+            count += 1
+        wait(in_flight)
+
+    return BulkResult(count, errors, time.perf_counter() - start)
+
+def read_trips(source):
+    """
+    Lazily reads trips from source.
+
+    Args:
+        source (iterable or str): An iterable of trips, or the path of a .csv
+            or .jsonl file.
+
+    Returns:
+        iterator: The trips. CSV rows are dicts of strings and JSONL rows are
+            undecoded lines, both converted by trip_kwargs.
+
+    Raises:
+        ValueError: If source is a path that is not a .csv or .jsonl file.
+    """
+    if not isinstance(source, str):
+        return iter(source)
+
+    if source.endswith('.csv'):
+        return _read_csv(source)
+    elif source.endswith('.jsonl') or source.endswith('.ndjson'):
+        return _read_jsonl(source)
+    else:
+        raise ValueError("Trip files must be .csv or .jsonl, got {}".format(source))
+
+def _read_csv(path):
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            yield row
+
+def _read_jsonl(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+def trip_kwargs(trip):
+    """
+    Converts a trip to the keyword arguments of add_request.
+
+    Args:
+        trip (dict or str): A trip, or a JSON encoded trip.
+
+    Returns:
+        dict: The keyword arguments of add_request.
+    """
+    if isinstance(trip, str):
+        trip = json.loads(trip)
+
+    return {
+        'rid': int(trip['rid']),
+        'pickup': _location(trip, 'pickup'),
+        'dropoff': _location(trip, 'dropoff'),
+        'load': int(trip['load']),
+        'request_time': _time(trip.get('request_time'))
+    }
+
+def _location(trip, prefix):
+    location = trip.get(prefix)
+
+    if isinstance(location, Location):
+        return location
+    elif location is not None:
+        return Location(float(location['lat']), float(location['lng']))
+    else:
+        return Location(float(trip[prefix + '_lat']), float(trip[prefix + '_lng']))
+
+def _time(t):
+    if t is None or t == '':
+        return None
+    elif isinstance(t, datetime.datetime):
+        return t
+    else:
+        return from_rfc3339(t)
@@ -1,9 +1,6 @@
 from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.status_response import StatusResponse
-from pyrai.dispatcher.structures.status_error import StatusError
-import datetime
-import requests
-import json
+from pyrai.dispatcher.structures.call import Call
 from pyrai.helpers import to_rfc3339
 
 def cancel_request(self, rid, event_time=None):
@@ -12,7 +9,7 @@ def cancel_request(self, rid, event_time=None):
 
     Args:
         rid (int): The unique request ID
-        event_time (datetime.datetime, optional): Time of the cancellation. Set to datetime.datetime.now() if not provided. Defaults to None.
+        event_time (datetime.datetime, optional): Time of the cancellation. Set to the time of the fleet's clock if not provided. Defaults to None.
 
     Raises:
         StatusError: If unsuccessful.
@@ -20,23 +17,25 @@ def cancel_request(self, rid, event_time=None):
     Returns:
         Status Response: If the request is sucessfully cancelled.
     """
+    return self.connection.send(cancel_request_call, self, rid, event_time)
+
+def cancel_request_call(self, rid, event_time=None):
+    """
+    Builds the Call made by cancel_request.
+
+    Returns:
+        Call: The call cancelling the request.
+    """
     if event_time is None:
-        event_time = datetime.datetime.now()
+        event_time = self.clock.now()
 
-    if event_time > self.end_time:
-        self.end_time = event_time
+    self.extend_end_time(event_time)
 
-    url = self.build_url(Endpoints.CANCEL_REQUEST)
     payload = {
         'id': rid,
         'event_time': to_rfc3339(event_time),
-        'user_key': self.user_key.todict()
+        'user_key': self.user_key_dict
     }
 
-    r = requests.post(url, data = json.dumps(payload))
-    resp = r.json()
-    
-    if r.status_code == 200:
-        return StatusResponse(resp=resp)
-    else:
-        raise StatusError(resp=resp)
\ No newline at end of file
+    return Call("POST", Endpoints.CANCEL_REQUEST, self.build_url(Endpoints.CANCEL_REQUEST),
+        payload, StatusResponse.fromdict)
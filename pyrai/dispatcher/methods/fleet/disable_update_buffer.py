@@ -0,0 +1,14 @@
+def disable_update_buffer(self):
+    """
+    Sends the held location updates and stops buffering them.
+
+    Returns:
+        BulkResult: The result of sending the held updates, None if
+            no update was held or the buffer was not enabled.
+    """
+    if self.update_buffer is None:
+        return None
+
+    update_buffer = self.update_buffer
+    self.update_buffer = None
+    return update_buffer.close()
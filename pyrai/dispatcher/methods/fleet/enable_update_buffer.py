@@ -0,0 +1,27 @@
+from pyrai.dispatcher.structures.defaults import Defaults
+from pyrai.dispatcher.structures.update_buffer import UpdateBuffer
+
+def enable_update_buffer(self, window=Defaults.UPDATE_BUFFER_WINDOW, max_concurrency=Defaults.MAX_CONCURRENCY):
+    """
+    Buffers the location updates of update_vehicle. Within each window,
+    repeated progress and unassigned updates of a vehicle are coalesced
+    into the newest one, and update_vehicle returns None for them. Pickup
+    and dropoff updates are still sent immediately. Held updates are sent
+    every window seconds, and before assignments are computed.
+
+    Args:
+        window (float, optional): Seconds between flushes of the held updates.
+            If None, they are only sent before assignments are computed, or
+            by calling update_buffer.flush(). Defaults to Defaults.UPDATE_BUFFER_WINDOW.
+        max_concurrency (int, optional): The maximum number of updates in flight
+            during a flush. Defaults to Defaults.MAX_CONCURRENCY.
+
+    Returns:
+        UpdateBuffer: The buffer, also set as self.update_buffer, with counters
+            of coalesced and sent updates.
+    """
+    if self.update_buffer is not None:
+        self.update_buffer.close()
+
+    self.update_buffer = UpdateBuffer(self, window=window, max_concurrency=max_concurrency)
+    return self.update_buffer
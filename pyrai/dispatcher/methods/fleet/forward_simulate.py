@@ -1,56 +1,58 @@
 import datetime
-from dateutil.parser import isoparse
-from pyrai.dispatcher.structures.endpoints import Endpoints 
-from pyrai.dispatcher.structures.vehicle_assignments import VehicleAssignments
-from pyrai.dispatcher.structures.vehicle import Vehicle
-from pyrai.dispatcher.structures.request import Request 
-from pyrai.dispatcher.structures.notification import Notification
-from pyrai.dispatcher.structures.status_error import StatusError
-import requests
-import json
-from pyrai.helpers import to_rfc3339
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.dispatcher.structures.call import Call
+from pyrai.dispatcher.methods.fleet.get_assignments import assignments_decoder, advancing_clock
+from pyrai.helpers import to_rfc3339, from_rfc3339
 from pytimeparse.timeparse import timeparse
 
-def forward_simulate(self, duration, current_time=None):
+def forward_simulate(self, duration, current_time=None, columnar=False, lazy=False):
     """
     Forward simulates the fleet for a given duration.
 
     Args:
         duration (string): A duration to forward simulate for, e.g. "5m."
-        current_time (datetime.datetime or str, optional): The current time, from when the simulation will begin. Can be provided as a datetime.datetime object or ISO string. Set to datetime.datetime.now() if not provided. Defaults to None.
+        current_time (datetime.datetime or str, optional): The current time, from when the simulation will begin. Can be provided as a datetime.datetime object or ISO string. Set to the time of the fleet's clock if not provided. Defaults to None.
+        columnar (bool, optional): Return the final state as NumPy columns instead of
+            objects. Columnar assignments do not update the fleet state. Defaults to False.
+        lazy (bool, optional): Decode each vehicle, request and notification only when
+            it is first accessed. Lazy assignments do not update the fleet state.
+            Defaults to False.
 
     Returns:
         VehicleAssignments: The final state of all vehicles and requests, after the simulation.
+            ColumnarAssignments if columnar is True, LazyVehicleAssignments
+            if lazy is True.
 
     Raises:
         StatusError: If unsuccessful.
+        ValueError: If both columnar and lazy are True.
+    """
+    if self.update_buffer is not None:
+        self.update_buffer.flush()
+
+    return self.connection.send(forward_simulate_call, self, duration, current_time, columnar, lazy)
+
+def forward_simulate_call(self, duration, current_time=None, columnar=False, lazy=False):
+    """
+    Builds the Call made by forward_simulate.
+
+    Returns:
+        Call: The call forward simulating the fleet.
     """
     if current_time is None:
-        current_time = datetime.datetime.now()
+        current_time = self.clock.now()
 
     if isinstance(current_time, str):
-        current_time = isoparse(current_time)
-
-    duration_td = datetime.timedelta(seconds=timeparse(duration))
+        current_time = from_rfc3339(current_time)
 
-    if current_time + duration_td > self.end_time:
-        self.end_time = current_time + duration_td
+    end_time = current_time + datetime.timedelta(seconds=timeparse(duration))
+    self.extend_end_time(end_time)
 
-    url = self.build_url(Endpoints.FORWARD_SIMULATE)
     payload = {
-        'user_key': self.user_key.todict(),
+        'user_key': self.user_key_dict,
         'sim_duration': duration,
         'current_time': to_rfc3339(current_time)
     }
 
-    r = requests.post(url, data = json.dumps(payload))
-    resp = r.json()
-
-    if r.status_code == 200:
-        return VehicleAssignments(
-            vehs=[Vehicle.fromdict(self, veh) for veh in resp.get('vehs')],
-            requests=[Request.fromdict(self, req) for req in resp.get('reqs')],
-            notifications=[Notification.fromdict(notif) for notif in resp.get('notifications')],
-        )
-    else:
-        raise StatusError(resp = resp)
\ No newline at end of file
+    return Call("POST", Endpoints.FORWARD_SIMULATE, self.build_url(Endpoints.FORWARD_SIMULATE),
+        payload, advancing_clock(self, end_time, assignments_decoder(self, columnar, lazy)))
@@ -1,47 +1,99 @@
-from pyrai.dispatcher.structures.endpoints import Endpoints 
+from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.vehicle_assignments import VehicleAssignments
-from pyrai.dispatcher.structures.vehicle import Vehicle
-from pyrai.dispatcher.structures.request import Request 
-from pyrai.dispatcher.structures.notification import Notification
-from pyrai.dispatcher.structures.status_error import StatusError
-import datetime
-import requests
+from pyrai.dispatcher.structures.columnar_assignments import ColumnarAssignments
+from pyrai.dispatcher.structures.lazy_vehicle_assignments import LazyVehicleAssignments
+from pyrai.dispatcher.structures.call import Call
 from pyrai.helpers import to_rfc3339
 
-def get_assignments(self, current_time=None):
+def get_assignments(self, current_time=None, columnar=False, lazy=False):
     """
     Computes vehicle assignments for the fleet in the current state.
 
     Args:
-        current_time (datetime.datetime, optional): Current time. Set to datetime.datetime.now() if not provided. Defaults to None.
+        current_time (datetime.datetime, optional): Current time. Set to the time of the fleet's clock if not provided. Defaults to None.
+        columnar (bool, optional): Return the assignments as NumPy columns instead of
+            objects. Columnar assignments do not update the fleet state. Defaults to False.
+        lazy (bool, optional): Decode each vehicle, request and notification only when
+            it is first accessed. Lazy assignments do not update the fleet state.
+            Defaults to False.
 
     Raises:
         StatusError: If unsuccessful.
+        ValueError: If both columnar and lazy are True.
 
     Returns:
         VehicleAssignments: If assignments are successfully computed.
+            ColumnarAssignments if columnar is True, LazyVehicleAssignments
+            if lazy is True.
+    """
+    if self.update_buffer is not None:
+        self.update_buffer.flush()
+
+    return self.connection.send(get_assignments_call, self, current_time, columnar, lazy)
+
+def get_assignments_call(self, current_time=None, columnar=False, lazy=False):
+    """
+    Builds the Call made by get_assignments.
+
+    Returns:
+        Call: The call computing the assignments.
     """
     if current_time is None:
-        current_time = datetime.datetime.now()
+        current_time = self.clock.now()
 
-    if current_time > self.end_time:
-        self.end_time = current_time
+    self.extend_end_time(current_time)
 
-    url = self.build_url(Endpoints.COMPUTE_ASSIGNMENTS)
     payload = {
         'api_key': self.api_key,
         'fleet_key': self.fleet_key,
         'current_time': to_rfc3339(current_time)
     }
 
-    r = requests.get(url, params=payload)
-    resp = r.json()
-
-    if r.status_code == 200:
-        return VehicleAssignments(
-            vehs=[Vehicle.fromdict(self, veh) for veh in resp.get('vehs')],
-            requests=[Request.fromdict(self, req) for req in resp.get('reqs')],
-            notifications=[Notification.fromdict(notif) for notif in resp.get('notifications')],
-        )
-    else:
-        raise StatusError(resp = resp)
\ No newline at end of file
+    return Call("GET", Endpoints.COMPUTE_ASSIGNMENTS, self.build_url(Endpoints.COMPUTE_ASSIGNMENTS),
+        payload, advancing_clock(self, current_time, assignments_decoder(self, columnar, lazy)))
+
+def advancing_clock(self, time, decode):
+    """
+    Wraps the decode function of a call so that it also moves the fleet's
+    clock forward to time. Decode functions only run for successful calls,
+    so a failed call leaves the clock where it was.
+
+    Args:
+        time (datetime.datetime): The time the call moves the fleet to.
+        decode (function): The decode function of the call.
+
+    Returns:
+        function: The decode function, advancing the clock first.
+    """
+    def advance(resp):
+        self.clock.advance_to(time)
+        return decode(resp)
+
+    return advance
+
+def assignments_decoder(self, columnar=False, lazy=False):
+    """
+    Builds the function decoding get_assignments and forward_simulate responses.
+
+    Args:
+        columnar (bool, optional): Decode to ColumnarAssignments. Defaults to False.
+        lazy (bool, optional): Decode to LazyVehicleAssignments. Defaults to False.
+
+    Returns:
+        function: Decodes a response to ColumnarAssignments if columnar is True, to
+            LazyVehicleAssignments if lazy is True, or else to VehicleAssignments,
+            updating the fleet state.
+
+    Raises:
+        ValueError: If both columnar and lazy are True.
+    """
+    if columnar and lazy:
+        raise ValueError("Assignments can be columnar or lazy, not both")
+
+    if columnar:
+        return ColumnarAssignments.fromdict
+
+    if lazy:
+        return lambda resp: LazyVehicleAssignments.fromdict(self, resp)
+
+    return lambda resp: self.state.update(VehicleAssignments.fromdict(self, resp))
@@ -0,0 +1,72 @@
+from pyrai.dispatcher.structures.metrics import Metrics
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.dispatcher.structures.call import Call
+from pyrai.helpers import to_rfc3339, from_rfc3339
+
+def get_metrics(self, start_time=None, end_time=None, metrics=None, cached=True):
+    """
+    Gets the time series metrics of the fleet.
+
+    Args:
+        start_time (datetime.datetime or str): The start time, either as a datetime.datetime object or an ISO string. Set to the fleet creation time if not set. Defaults to None.
+        end_time (datetime.datetime or str): The end time, either as a datetime.datetime object or an ISO string. Set to the latest API call time if not set. Defaults to None.
+        metrics (list[Metrics], optional): The metrics to query, besides Metrics.TIME.
+            If None, all metrics are queried. Defaults to None.
+        cached (bool, optional): Only query the part of the range that is not in
+            self.metrics_cache. If False, the whole range is queried and the cache
+            is left unchanged. Defaults to True.
+
+    Returns:
+        list[dict]: The metrics, one dictionary of Metrics per point, in time order.
+
+    Raises:
+        StatusError: If unsuccessful.
+        ValueError: If a metric is not one of Metrics.FIELDS.
+    """
+    start_time, end_time = metrics_range(self, start_time, end_time)
+
+    if cached:
+        return self.metrics_cache.get(start_time, end_time, metrics)
+
+    return self.connection.send(get_metrics_call, self, start_time, end_time, metrics)
+
+def get_metrics_call(self, start_time, end_time, metrics=None):
+    """
+    Builds the Call made by get_metrics.
+
+    Args:
+        start_time (datetime.datetime): The start time.
+        end_time (datetime.datetime): The end time.
+        metrics (list[Metrics], optional): The metrics to query. If None, all
+            metrics are queried. Defaults to None.
+
+    Returns:
+        Call: The call querying the metrics.
+    """
+    query = Metrics.query([(self.api_key, self.fleet_key)],
+        to_rfc3339(start_time), to_rfc3339(end_time), metrics)
+
+    return Call("POST", Endpoints.GRAPHQL, self.build_url(Endpoints.GRAPHQL),
+        {"query": query}, lambda resp: resp['data'][Metrics.alias(0)][0]['metrics'])
+
+def metrics_range(self, start_time=None, end_time=None):
+    """
+    Fills in the default start and end times of metrics queries.
+
+    Returns:
+        tuple[datetime.datetime]: The start and end times, the fleet creation time
+            and the latest API call time if not set, parsed if given as strings.
+    """
+    if start_time is None:
+        start_time = self.start_time
+
+    if end_time is None:
+        end_time = self.end_time
+
+    if isinstance(start_time, str):
+        start_time = from_rfc3339(start_time)
+
+    if isinstance(end_time, str):
+        end_time = from_rfc3339(end_time)
+
+    return start_time, end_time
@@ -1,8 +1,6 @@
 from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.request import Request
-from pyrai.dispatcher.structures.status_error import StatusError
-import requests
-import json
+from pyrai.dispatcher.structures.call import Call
 
 def get_request(self, rid):
     """
@@ -17,17 +15,20 @@ def get_request(self, rid):
     Returns:
         Request: A request object representing the request with ID rid.
     """
-    url = self.build_url(Endpoints.GET_REQUEST)
+    return self.connection.send(get_request_call, self, rid)
+
+def get_request_call(self, rid):
+    """
+    Builds the Call made by get_request.
+
+    Returns:
+        Call: The call querying the request.
+    """
     payload = {
         'api_key': self.api_key,
         'fleet_key': self.fleet_key,
         'id': rid
     }
 
-    r = requests.get(url, params=payload)
-    resp = r.json()
-    
-    if r.status_code == 200:
-        return Request.fromdict(self, resp)
-    else:
-        raise StatusError(resp=resp) 
+    return Call("GET", Endpoints.GET_REQUEST, self.build_url(Endpoints.GET_REQUEST),
+        payload, lambda resp: Request.fromdict(self, resp))
@@ -1,8 +1,5 @@
-import requests
-import json
-from pyrai.dispatcher.structures.endpoints import Endpoints 
-from pyrai.dispatcher.structures.vehicle import Vehicle
-from pyrai.dispatcher.structures.status_error import StatusError
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.dispatcher.structures.call import Call
 
 
 def get_vehicle_info(self, vid):
@@ -19,16 +16,20 @@ def get_vehicle_info(self, vid):
         Vehicle: If succesful, returns a vehicle object corresponding to the
             vehicle with ID vid.
     """
-    url = self.build_url(Endpoints.GET_VEHICLE_INFO)
+    return self.connection.send(get_vehicle_info_call, self, vid)
+
+def get_vehicle_info_call(self, vid):
+    """
+    Builds the Call made by get_vehicle_info.
+
+    Returns:
+        Call: The call querying the vehicle.
+    """
     params = {
         'api_key': self.api_key,
         'fleet_key': self.fleet_key,
         'id': vid
     }
-    r = requests.get(url, params=params)
-    resp = r.json()
 
-    if r.status_code == 200:
-        return Vehicle.fromdict(self, resp)
-    else:
-        raise StatusError(resp=resp)
\ No newline at end of file
+    return Call("GET", Endpoints.GET_VEHICLE_INFO, self.build_url(Endpoints.GET_VEHICLE_INFO),
+        params, lambda resp: self.vehicle_class.fromdict(self, resp))
@@ -1,9 +1,6 @@
-import requests
-import datetime
-import json
 from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.status_response import StatusResponse
-from pyrai.dispatcher.structures.status_error import StatusError
+from pyrai.dispatcher.structures.call import Call
 
 def make_vehicle_offline(self, vid, location):
     """
@@ -19,19 +16,22 @@ def make_vehicle_offline(self, vid, location):
     Returns:
         StatusReponse: If successful.
     """
-    if datetime.datetime.now() > self.end_time:
-        self.end_time = datetime.datetime.now()
+    return self.connection.send(make_vehicle_offline_call, self, vid, location)
+
+def make_vehicle_offline_call(self, vid, location):
+    """
+    Builds the Call made by make_vehicle_offline.
+
+    Returns:
+        Call: The call taking the vehicle offline.
+    """
+    self.extend_end_time(self.clock.now())
 
-    url = self.build_url(Endpoints.MAKE_VEHICLE_OFFLINE)
     payload = {
         'location': location.todict(),
         'id': vid,
-        'user_key': self.user_key.todict()
+        'user_key': self.user_key_dict
     }
-    r = requests.post(url, data = json.dumps(payload))
-    resp = r.json()
-    
-    if r.status_code == 200:
-        return StatusResponse(resp=resp)
-    else:
-        raise StatusError(resp=resp)
\ No newline at end of file
+
+    return Call("POST", Endpoints.MAKE_VEHICLE_OFFLINE, self.build_url(Endpoints.MAKE_VEHICLE_OFFLINE),
+        payload, StatusResponse.fromdict)
@@ -1,9 +1,6 @@
-import requests
-import datetime
-import json
 from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.status_response import StatusResponse
-from pyrai.dispatcher.structures.status_error import StatusError
+from pyrai.dispatcher.structures.call import Call
 
 def make_vehicle_online(self, vid, location, capacity):
     """
@@ -20,21 +17,23 @@ def make_vehicle_online(self, vid, location, capacity):
     Returns:
         StatusReponse: If successful.
     """
+    return self.connection.send(make_vehicle_online_call, self, vid, location, capacity)
 
-    if datetime.datetime.now() > self.end_time:
-        self.end_time = datetime.datetime.now()
+def make_vehicle_online_call(self, vid, location, capacity):
+    """
+    Builds the Call made by make_vehicle_online.
+
+    Returns:
+        Call: The call making the vehicle online.
+    """
+    self.extend_end_time(self.clock.now())
 
-    url = self.build_url(Endpoints.MAKE_VEHICLE_ONLINE)
     payload = {
         "location": location.todict(),
         "id": vid,
         'capacity': capacity,
-        'user_key': self.user_key.todict()
+        'user_key': self.user_key_dict
     }
-    r = requests.post(url, data=json.dumps(payload))
-    resp = r.json()
 
-    if r.status_code == 200:
-        return StatusResponse(resp=resp)
-    else:
-        raise StatusError(resp=resp)
\ No newline at end of file
+    return Call("POST", Endpoints.MAKE_VEHICLE_ONLINE, self.build_url(Endpoints.MAKE_VEHICLE_ONLINE),
+        payload, StatusResponse.fromdict)
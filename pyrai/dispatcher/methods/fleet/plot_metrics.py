@@ -1,49 +1,74 @@
-from dateutil.parser import isoparse
 from pyrai.dispatcher.structures.metrics import Metrics
-from pyrai.dispatcher.structures.endpoints import Endpoints
-import plotly.graph_objects as go
-from pyrai.helpers import to_rfc3339
-import requests
+from pyrai.dispatcher.structures.defaults import Defaults
+from pyrai.helpers import from_rfc3339, downsample
 
-def plot_metrics(self, metrics, start_time=None, end_time=None):
+def plot_metrics(self, metrics, start_time=None, end_time=None, max_points=None, method="lttb"):
     """
-    Plots time series metrics.
+    Plots time series metrics. Only the plotted metrics are queried, and
+    those already in self.metrics_cache are not queried again. Long series
+    can be downsampled to max_points points before plotting, and series
+    longer than Defaults.WEBGL_THRESHOLD points are drawn with WebGL.
 
     Args:
         metrics (list[Metrics]): A list of metrics to plot.
         start_time (datetime.datetime or str): The start time, either as a datetime.datetime object or an ISO string. Set to the fleet creation time if not set. Defaults to None.
         end_time (datetime.datetime or str): The end time, either as a datetime.datetime object or an ISO string. Set to the latest API call time if not set. Defaults to None.
+        max_points (int, optional): The number of points plotted per metric. If None,
+            all points are plotted. Requires numpy. Defaults to None.
+        method (str, optional): How points are selected, "lttb" to preserve the shape
+            of the series, or "minmax" to keep the minimum and maximum of each bucket.
+            Defaults to "lttb".
 
     Returns:
         Plotly.Figure: A figure that graphs the metrics
             over the time interval.
     """
-    if start_time is None:
-        start_time = self.start_time
-    
-    if end_time is None:
-        end_time = self.end_time
-
-    if isinstance(start_time, str):
-        start_time = isoparse(start_time)
-
-    if isinstance(end_time, str):
-        end_time = isoparse(end_time)
-
-    url = self.build_url(Endpoints.GRAPHQL)
-    query = Metrics.QUERY.format(
-        api_key = self.api_key,
-        fleet_key = self.fleet_key,
-        start_time = to_rfc3339(start_time),
-        end_time = to_rfc3339(end_time)
-    )
-    r = requests.post(url, json={"query": query})
-    resp = r.json()
-    data = resp['data']['live_fleets'][0]['metrics']
-    x = [met[Metrics.TIME] for met in data]
+    return metrics_figure(metrics, self.get_metrics(start_time, end_time, metrics), max_points, method)
+
+def metrics_figure(metrics, rows, max_points=None, method="lttb"):
+    """
+    Plots time series metrics.
+
+    Args:
+        metrics (list[Metrics]): A list of metrics to plot.
+        rows (list[dict]): The metrics, one dictionary of Metrics per point.
+        max_points (int, optional): The number of points plotted per metric. If None,
+            all points are plotted. Defaults to None.
+        method (str, optional): The downsampling method, see pyrai.helpers.downsample.
+            Defaults to "lttb".
+
+    Returns:
+        Plotly.Figure: A figure that graphs the metrics.
+
+    Raises:
+        ImportError: If plotly is not installed.
+    """
+    # plotly takes longer to import than the rest of pyrai, so it is only loaded when plotting
+    try:
+        import plotly.graph_objects as go
+    except ImportError:
+        raise ImportError("plot_metrics requires plotly, install it with: pip install pyrai[plot]")
+
+    x = [met[Metrics.TIME] for met in rows]
+    downsampled = max_points is not None and len(rows) > max_points
+    if downsampled:
+        seconds = [from_rfc3339(time).timestamp() for time in x]
+
     figure = go.Figure()
     for metric in metrics:
-        figure.add_trace(go.Scatter(x=x, y=[met[metric] for met in data],
-                    mode='lines+markers',
-                    name=metric))
-    return figure
\ No newline at end of file
+        y = [met[metric] for met in rows]
+        if downsampled:
+            # None values are gaps, which downsample skips as NaN
+            indices = downsample(seconds, [float('nan') if v is None else v for v in y], max_points, method)
+            xs, y = [x[i] for i in indices], [y[i] for i in indices]
+        else:
+            xs = x
+
+        # SVG traces with markers stall the browser on long series
+        if len(xs) > Defaults.WEBGL_THRESHOLD:
+            figure.add_trace(go.Scattergl(x=xs, y=y, mode='lines', name=metric))
+        else:
+            figure.add_trace(go.Scatter(x=xs, y=y,
+                        mode='lines+markers',
+                        name=metric))
+    return figure
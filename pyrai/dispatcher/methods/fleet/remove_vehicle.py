@@ -1,8 +1,5 @@
-import datetime
-import requests
-import json
 from pyrai.dispatcher.structures.endpoints import Endpoints
-from pyrai.dispatcher.structures.status_error import StatusError
+from pyrai.dispatcher.structures.call import Call
 
 def remove_vehicle(self, vid, location):
     """
@@ -19,23 +16,28 @@ def remove_vehicle(self, vid, location):
     Raises:
         StatusError: If unsuccessful.
     """
+    return self.connection.send(remove_vehicle_call, self, vid, location)
+
+def remove_vehicle_call(self, vid, location):
+    """
+    Builds the Call made by remove_vehicle.
+
+    Returns:
+        Call: The call removing the vehicle.
+    """
+    self.extend_end_time(self.clock.now())
 
-    if datetime.datetime.now() > self.end_time:
-        self.end_time = datetime.datetime.now()
-    
-    url = self.build_url(Endpoints.REMOVE_VEHICLE)
     payload = {
         'location': location.todict(),
         'id': vid,
-        'user_key': self.user_key.todict()
+        'user_key': self.user_key_dict
     }
-    r = requests.post(url, data = json.dumps(payload))
-    resp = r.json()
-
-    if r.status_code == 200:
-        if resp is not None:
-            return resp.get('req_ids')
-        else:
-            return []
+
+    return Call("POST", Endpoints.REMOVE_VEHICLE, self.build_url(Endpoints.REMOVE_VEHICLE),
+        payload, _decode_req_ids)
+
+def _decode_req_ids(resp):
+    if resp is not None:
+        return resp.get('req_ids')
     else:
-        raise StatusError(resp = resp)
\ No newline at end of file
+        return []
@@ -0,0 +1,33 @@
+from pyrai.dispatcher.structures.defaults import Defaults
+from pyrai.dispatcher.structures.replayer import Replayer
+from pyrai.dispatcher.structures.traffic_log import TrafficLog
+
+def replay(self, log, speed=1, max_concurrency=Defaults.MAX_CONCURRENCY, fleet_key=None, reads=True):
+    """
+    Replays the calls of a traffic log on this fleet, through the same
+    fleet methods, at the recorded pace divided by speed, or as fast as
+    possible. The calls of each vehicle, and of each request, keep their
+    order. See Replayer.
+
+    Args:
+        log (str or iterable[dict]): The path of a log written by a TrafficRecorder,
+            or its entries, e.g. an open TrafficLog.
+        speed (float, optional): The replay speed, e.g. 10 for 10x. None to replay
+            as fast as possible. Defaults to 1.
+        max_concurrency (int, optional): The maximum number of calls in flight.
+            This should not exceed the pool size of the fleet's connection.
+            Defaults to Defaults.MAX_CONCURRENCY.
+        fleet_key (str, optional): If set, only the calls recorded for this fleet
+            are replayed. Defaults to None.
+        reads (bool, optional): Replay get_vehicle_info and get_request.
+            Defaults to True.
+
+    Returns:
+        BulkResult: The number of calls replayed, the failed calls, with the index
+            of their entry in the log, and the elapsed time.
+    """
+    replayer = Replayer(self, speed, max_concurrency, fleet_key, reads)
+    if isinstance(log, str):
+        with TrafficLog(log) as entries:
+            return replayer.run(entries)
+    return replayer.run(log)
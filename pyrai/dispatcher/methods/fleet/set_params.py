@@ -1,8 +1,6 @@
-import requests
-import json
 from pyrai.dispatcher.structures.endpoints import Endpoints
 from pyrai.dispatcher.structures.status_response import StatusResponse
-from pyrai.dispatcher.structures.status_error import StatusError
+from pyrai.dispatcher.structures.call import Call
 
 def set_params(self,
     max_wait=None,
@@ -24,7 +22,20 @@ def set_params(self,
     Raises:
         StatusError: If unsuccessful.
     """
+    return self.connection.send(set_params_call, self, max_wait, max_delay,
+        unlocked_window, close_pickup_window)
 
+def set_params_call(self,
+    max_wait=None,
+    max_delay=None,
+    unlocked_window=None,
+    close_pickup_window=None):
+    """
+    Builds the Call made by set_params.
+
+    Returns:
+        Call: The call setting the params.
+    """
     if max_wait is not None:
         self.params.max_wait = max_wait
 
@@ -37,15 +48,10 @@ def set_params(self,
     if close_pickup_window is not None:
         self.params.close_pickup_window = close_pickup_window
 
-    url = self.build_url(Endpoints.SET_PARAMS)
     payload = {
         "params": self.params.todict(),
-        "user_key": self.user_key.todict()
+        "user_key": self.user_key_dict
     }
-    r = requests.post(url, data=json.dumps(payload))
-    resp = r.json()
-    
-    if r.status_code == 200:
-        return StatusResponse(resp=resp)
-    else:
-        raise StatusError(resp=resp)
\ No newline at end of file
+
+    return Call("POST", Endpoints.SET_PARAMS, self.build_url(Endpoints.SET_PARAMS),
+        payload, StatusResponse.fromdict)
@@ -0,0 +1,101 @@
+from pyrai.dispatcher.structures.request import Request
+from pyrai.dispatcher.structures.notification import Notification
+from pyrai.dispatcher.structures.columnar_assignments import ColumnarAssignments
+import datetime
+from pyrai.dispatcher.methods.fleet.forward_simulate import forward_simulate_call
+from pyrai.helpers import from_rfc3339
+from pytimeparse.timeparse import timeparse
+
+# the response fields streamed element by element
+SECTIONS = ('vehs', 'reqs', 'notifications')
+
+def stream_forward_simulate(self, duration, current_time=None, chunk_size=None):
+    """
+    Forward simulates the fleet for a given duration, like forward_simulate,
+    but parses the response as it arrives and yields each vehicle, request
+    and notification as soon as it is complete. Neither the whole response
+    nor the whole final state is held in memory, so memory stays flat
+    however large the fleet is. The simulation is requested when iteration
+    starts, and the fleet state is not updated.
+
+    Args:
+        duration (string): A duration to forward simulate for, e.g. "5m."
+        current_time (datetime.datetime or str, optional): The current time, from when the
+            simulation will begin. Set to the time of the fleet's clock if not provided.
+            Defaults to None.
+        chunk_size (int, optional): If set, yield ColumnarAssignments of up to chunk_size
+            vehicles, requests or notifications instead of objects. Each chunk holds
+            items of a single kind, and its other tables are empty. Defaults to None.
+
+    Returns:
+        iterator: The Vehicle, Request and Notification objects of the final state,
+            in response order, or ColumnarAssignments chunks if chunk_size is set.
+
+    Raises:
+        StatusError: If unsuccessful.
+        ValueError: If the response is incomplete.
+    """
+    if self.update_buffer is not None:
+        self.update_buffer.flush()
+
+    items = self.connection.stream(stream_forward_simulate_call, self, duration, current_time, chunk_size)
+
+    if chunk_size is None:
+        return (item for _, item in items)
+
+    return _chunks(items, chunk_size)
+
+def stream_forward_simulate_call(self, duration, current_time=None, chunk_size=None):
+    """
+    Builds the Call made by stream_forward_simulate.
+
+    Returns:
+        Call: The streamed call forward simulating the fleet. It decodes each
+            (section, element) pair of the response to a (section, object) pair,
+            or leaves the element undecoded if chunk_size is set.
+    """
+    call = forward_simulate_call(self, duration, current_time)
+    call.stream_sections = SECTIONS
+    # the clock moves once the response is known to be successful, even if it has no elements
+    end_time = from_rfc3339(call.payload['current_time']) + datetime.timedelta(seconds=timeparse(duration))
+    call.on_success = lambda: self.clock.advance_to(end_time)
+
+    if chunk_size is not None:
+        call.decode = lambda item: item
+        return call
+
+    decoders = {
+        'vehs': lambda d: self.vehicle_class.fromdict(self, d),
+        'reqs': lambda d: Request.fromdict(self, d),
+        'notifications': Notification.fromdict
+    }
+    call.decode = lambda item: (item[0], decoders[item[0]](item[1]))
+    return call
+
+def columnar_chunk(section, items):
+    """
+    Builds a ColumnarAssignments chunk from the elements of one section of
+    a forward_simulate response.
+
+    Args:
+        section (str): The response field of the elements, 'vehs', 'reqs' or 'notifications'.
+        items (list[dict]): The undecoded elements.
+
+    Returns:
+        ColumnarAssignments: The chunk, with empty tables for the other sections.
+    """
+    resp = {'vehs': [], 'reqs': [], 'notifications': []}
+    resp[section] = items
+    return ColumnarAssignments.fromdict(resp)
+
+def _chunks(items, chunk_size):
+    section, batch = None, []
+    for key, item in items:
+        if batch and (key != section or len(batch) >= chunk_size):
+            yield columnar_chunk(section, batch)
+            batch = []
+        section = key
+        batch.append(item)
+
+    if batch:
+        yield columnar_chunk(section, batch)
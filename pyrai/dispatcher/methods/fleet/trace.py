@@ -0,0 +1,40 @@
+import contextlib
+from pyrai.dispatcher.structures.tracer import Tracer
+
+@contextlib.contextmanager
+def trace(self, path=None, tracer=None):
+    """
+    Timestamps the phases of every call sent within a with block: payload
+    building, JSON encoding, network wait, JSON decoding and model
+    construction, and optionally writes them as Chrome trace-event JSON.
+    The fleet's connection is traced, so calls of other fleets sharing it
+    are traced too, labelled with their fleet key.
+
+    Example:
+        with fleet.trace("tick.json") as tracer:
+            with tracer.span("tick"):
+                fleet.update_vehicles(updates)
+                fleet.get_assignments()
+        print(tracer.summary())
+
+    Args:
+        path (str, optional): The file the trace is written to when the block
+            exits. If None, the trace is only kept in the returned Tracer.
+            Defaults to None.
+        tracer (Tracer, optional): The tracer recording the calls, e.g. to trace
+            several blocks together. If None, a new Tracer is used. Defaults to None.
+
+    Returns:
+        Tracer: The tracer, as the target of the with statement.
+    """
+    if tracer is None:
+        tracer = Tracer()
+
+    previous = self.connection.tracer
+    self.connection.tracer = tracer
+    try:
+        yield tracer
+    finally:
+        self.connection.tracer = previous
+        if path is not None:
+            tracer.dump(path)
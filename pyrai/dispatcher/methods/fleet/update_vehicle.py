@@ -1,11 +1,6 @@
-import datetime
-import json
-import requests
-from pyrai.dispatcher.structures.fleet_params import FleetParams
 from pyrai.dispatcher.structures.defaults import Defaults
 from pyrai.dispatcher.structures.endpoints import Endpoints 
-from pyrai.dispatcher.structures.vehicle import Vehicle
-from pyrai.dispatcher.structures.status_error import StatusError
+from pyrai.dispatcher.structures.call import Call
 from pyrai.helpers import to_rfc3339
 
 def update_vehicle(self, vid, location, event, direction=Defaults.DEFAULT_DIRECTION, event_time=None, req_id=None):
@@ -23,39 +18,53 @@ def update_vehicle(self, vid, location, event, direction=Defaults.DEFAULT_DIRECT
             either picking up or dropping off. The vehicle should be marked as 
             unassigned when it is is not assigned to any requests.
         event_time (datetime.datetime, optional): Time at which the vehicle update has occurred. 
-            Set to datetime.datetime.now() if not provided. Defaults to None.
+            Set to the time of the fleet's clock if not provided. Defaults to None.
         req_id (int, optional): The unique ID of request the vehicle is servicing. 
             If the vehicle is unassigned, this may be omitted. Defaults to None.
 
     Returns:
-        Vehicle: If successful.
+        Vehicle: If successful. None if the update was held by the fleet's
+            update buffer, see enable_update_buffer.
 
     Raises:
         StatusError: If unsucessful.
     """
+    if self.update_buffer is not None:
+        return self.update_buffer.add({
+            'vid': vid,
+            'location': location,
+            'event': event,
+            'direction': direction,
+            'event_time': event_time,
+            'req_id': req_id
+        })
+
+    return self.connection.send(update_vehicle_call, self, vid, location, event,
+        direction, event_time, req_id)
+
+def update_vehicle_call(self, vid, location, event, direction=Defaults.DEFAULT_DIRECTION, event_time=None, req_id=None):
+    """
+    Builds the Call made by update_vehicle.
+
+    Returns:
+        Call: The call updating the vehicle.
+    """
     if event_time is None:
-        event_time = datetime.datetime.now()
+        event_time = self.clock.now()
 
-    if event_time > self.end_time:
-        self.end_time = event_time
+    self.extend_end_time(event_time)
 
-    url = self.build_url(Endpoints.UPDATE_VEHICLE)
     payload = {
         'id': vid,
         'location': location.todict(),
         'direction': direction,
         'event_time': to_rfc3339(event_time),
         'event': event,
-        'user_key': self.user_key.todict()
+        'user_key': self.user_key_dict
     }
     
     if req_id is not None:
         payload['req_id'] = req_id
-    
-    r = requests.post(url, data = json.dumps(payload))
-    resp = r.json()
 
-    if r.status_code == 200:
-        return Vehicle.fromdict(self, resp)
-    else:
-        raise StatusError(resp = resp)
\ No newline at end of file
+    return Call("POST", Endpoints.UPDATE_VEHICLE, self.build_url(Endpoints.UPDATE_VEHICLE),
+        payload, lambda resp: self.vehicle_class.fromdict(self, resp))
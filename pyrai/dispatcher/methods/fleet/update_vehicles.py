@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pyrai.dispatcher.structures.defaults import Defaults
+from pyrai.dispatcher.structures.bulk_error import BulkError
+from pyrai.dispatcher.structures.bulk_result import BulkResult
+from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle_call
+
+def update_vehicles(self, updates, max_concurrency=Defaults.MAX_CONCURRENCY):
+    """
+    Attempts to update many vehicles at once. Updates of different vehicles
+    are sent concurrently, while updates of the same vehicle are sent one
+    after another, in the order given. A failed update does not stop the
+    others, and is reported in the result instead of being raised.
+
+    Args:
+        updates (iterable[dict]): The keyword arguments of update_vehicle for each
+            update, e.g. {'vid': 1, 'location': Location(50, 6), 'event': VehicleEvent.PROGRESS}.
+        max_concurrency (int, optional): The maximum number of updates in flight.
+            This should not exceed the pool size of the fleet's connection.
+            Defaults to Defaults.MAX_CONCURRENCY.
+
+    Returns:
+        BulkResult: results[i] is the Vehicle returned for the i-th update, or None
+            if it failed, in which case it is listed in errors. throughput is the
+            number of updates sent per second.
+    """
+    updates = list(updates)
+    results = [None] * len(updates)
+    errors = []
+
+    def send_chain(indices):
+        for i in indices:
+            try:
+                results[i] = self.connection.send(update_vehicle_call, self, **updates[i])
+            except Exception as e:
+                errors.append(BulkError(i, updates[i], e))
+
+    start = time.perf_counter()
+    chains = vehicle_chains(updates)
+
+    if chains:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chains))) as executor:
+            list(executor.map(send_chain, chains))
+
+    return BulkResult(len(updates), errors, time.perf_counter() - start, results)
+
+def vehicle_chains(updates):
+    """
+    Groups updates by vehicle, keeping the order of the updates of each vehicle.
+
+    Args:
+        updates (list[dict]): The keyword arguments of update_vehicle for each update.
+
+    Returns:
+        list[list[int]]: The indices of the updates of each vehicle, in input order.
+    """
+    chains = OrderedDict()
+    for i, update in enumerate(updates):
+        chains.setdefault(update.get('vid'), []).append(i)
+    return list(chains.values())
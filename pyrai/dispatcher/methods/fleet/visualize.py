@@ -1,4 +1,3 @@
-import IPython
 from dateutil.parser import isoparse
 from pyrai.helpers import to_rfc3339
 
@@ -12,7 +11,16 @@ def visualize(self, start_time=None, end_time=None):
 
     Returns:
         IFrame: A graphic view of the fleet through time.
+
+    Raises:
+        ImportError: If IPython is not installed.
     """
+    # IPython is only needed in notebooks, so it is not loaded with pyrai
+    try:
+        import IPython.display
+    except ImportError:
+        raise ImportError("visualize requires IPython, install it with: pip install pyrai[notebook]")
+
     if start_time is None:
         start_time = self.start_time
     
@@ -1,4 +1,3 @@
-import datetime
 
 def cancel(self, event_time=None):
     """
@@ -6,7 +5,7 @@ def cancel(self, event_time=None):
 
     Args:
         event_time (datetime.datetime, optional): The event time. 
-            Set to datetime.datetime.now() if not provided. Defaults to None.
+            Set to the time of the fleet's clock if not provided. Defaults to None.
 
     Returns:
         Status Response: If successful.
@@ -15,6 +14,6 @@ def cancel(self, event_time=None):
         StatusError: If unsuccessful.
     """
     if event_time is None:
-        event_time = datetime.datetime.now()
+        event_time = self.fleet.clock.now()
 
     return self.fleet.cancel_request(self.req_id, event_time)
\ No newline at end of file
@@ -1,35 +1,105 @@
 from .endpoints import Endpoints
 from .status_error import StatusError
 from .status_response import StatusResponse
+from .bulk_error import BulkError
+from .bulk_result import BulkResult
 from .defaults import Defaults
+from .json_codec import JSONCodec
+from .latency_histogram import LatencyHistogram
+from .call_record import CallRecord
+from .endpoint_stats import EndpointStats
+from .instrumentation import Instrumentation
+from .tracer import Tracer
+from .traffic_recorder import TrafficRecorder
+from .traffic_log import TrafficLog
+from .connection import Connection
 from .fleet_params import FleetParams
 from .event import Event
 from .location import Location
 from .vehicle import Vehicle
 from .fleet import Fleet
+from .update_buffer import UpdateBuffer
 from .metrics import Metrics
+from .metrics_cache import MetricsCache
 from .user_key import UserKey
 from .request import Request
 from .vehicle_event import VehicleEvent
 from .notification import Notification
 from .notification_data import NotificationData
 from .vehicle_assignments import VehicleAssignments
+from .lazy_list import LazyList
+from .lazy_vehicle_assignments import LazyVehicleAssignments
+from .columnar_assignments import ColumnarAssignments
+from .json_stream import JSONStream
+from .assignment_diff import AssignmentDiff
+from .fleet_state import FleetState
+from .local_simulation import LocalSimulation
+from .local_simulator import LocalSimulator
+from .local_connection import LocalConnection
+from .replayer import Replayer
+from .simulation_report import SimulationReport
+from .simulation_runner import SimulationRunner
+from .wall_clock import WallClock
+from .virtual_clock import VirtualClock
+from .fast_forward_clock import FastForwardClock
 from .pyrai import Pyrai
+from .async_connection import AsyncConnection
+from .async_vehicle import AsyncVehicle
+from .async_fleet import AsyncFleet
+from .async_pyrai import AsyncPyrai
+from .async_update_buffer import AsyncUpdateBuffer
+from .async_metrics_cache import AsyncMetricsCache
+from .async_replayer import AsyncReplayer
 __all__ = ["Endpoints", 
 "StatusResponse", 
 "StatusError", 
+"BulkError",
+"BulkResult",
+"UpdateBuffer",
 "Defaults", 
+"JSONCodec",
+"LatencyHistogram",
+"CallRecord",
+"EndpointStats",
+"Instrumentation",
+"Tracer",
+"TrafficRecorder",
+"TrafficLog",
+"Connection",
+"JSONStream",
 "FleetParams",
 "Event",
 "Location",
 "Vehicle",
 "Fleet",
 "Metrics",
+"MetricsCache",
 "UserKey",
 "Request",
 "VehicleEvent",
 "Notification",
 "NotificationData",
 "VehicleAssignments",
-'Pyrai'
+"LazyList",
+"LazyVehicleAssignments",
+"ColumnarAssignments",
+"AssignmentDiff",
+"FleetState",
+"LocalSimulation",
+"LocalSimulator",
+"LocalConnection",
+"Replayer",
+"SimulationReport",
+"SimulationRunner",
+"WallClock",
+"VirtualClock",
+"FastForwardClock",
+'Pyrai',
+"AsyncConnection",
+"AsyncVehicle",
+"AsyncFleet",
+"AsyncPyrai",
+"AsyncUpdateBuffer",
+"AsyncMetricsCache",
+"AsyncReplayer"
 ]
@@ -0,0 +1,68 @@
+class AssignmentDiff(object):
+    """
+    Class used to represent the changes between two successive assignments
+    of a fleet.
+
+    Attributes:
+        changed (list[Vehicle]): Vehicles whose events changed.
+        added (list[Vehicle]): Vehicles that were not in the previous assignments.
+        removed (list[int]): The IDs of vehicles that are no longer in the assignments.
+        assigned (list[int]): The IDs of requests that became assigned.
+        unassigned (list[int]): The IDs of requests that are no longer assigned,
+            including requests that are no longer in the assignments.
+        notifications (list[Notification]): The notifications of the assignments,
+            as received. The API sends each notification once.
+    """
+    def __init__(self, changed=None, added=None, removed=None, assigned=None, unassigned=None, notifications=None):
+        """
+        Initializes an AssignmentDiff object.
+
+        Args:
+            changed (list[Vehicle], optional): Vehicles whose events changed. Defaults to None,
+                for no vehicles.
+            added (list[Vehicle], optional): New vehicles. Defaults to None, for no vehicles.
+            removed (list[int], optional): The IDs of removed vehicles. Defaults to None,
+                for no vehicles.
+            assigned (list[int], optional): The IDs of newly assigned requests. Defaults to
+                None, for no requests.
+            unassigned (list[int], optional): The IDs of requests no longer assigned.
+                Defaults to None, for no requests.
+            notifications (list[Notification], optional): The notifications. Defaults to
+                None, for no notifications.
+        """
+        self.changed = changed if changed is not None else []
+        self.added = added if added is not None else []
+        self.removed = removed if removed is not None else []
+        self.assigned = assigned if assigned is not None else []
+        self.unassigned = unassigned if unassigned is not None else []
+        self.notifications = notifications if notifications is not None else []
+
+    @property
+    def empty(self):
+        """
+        bool: True if nothing changed.
+        """
+        return not (self.changed or self.added or self.removed or
+            self.assigned or self.unassigned or self.notifications)
+
+    def todict(self):
+        """
+        Converts an AssignmentDiff object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self, with vehicles by ID.
+        """
+        return {
+            'changed': [v.veh_id for v in self.changed],
+            'added': [v.veh_id for v in self.added],
+            'removed': self.removed,
+            'assigned': self.assigned,
+            'unassigned': self.unassigned,
+            'notifications': [n.todict() for n in self.notifications]
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
@@ -0,0 +1,235 @@
+import asyncio
+import time
+from .connection import observe_call
+from .defaults import Defaults
+from .json_codec import JSONCodec
+from .json_stream import JSONStream
+
+class AsyncConnection(object):
+    """
+    Class used to send API calls from asyncio code over a pooled,
+    non-blocking aiohttp session. It sends the same Call objects as
+    Connection, so a single event loop can keep many calls in flight.
+    aiohttp is an optional dependency, installed with pyrai[async].
+
+    Attributes:
+        pool_size (int): The maximum number of simultaneous connections.
+        keep_alive (bool): True if connections are reused between calls.
+        codec (JSONCodec): The codec encoding payloads and decoding responses.
+        session (aiohttp.ClientSession): The underlying session, opened on first use.
+        instrumentation (Instrumentation): Records every call sent. None to
+            record nothing.
+        tracer (Tracer): Timestamps the phases of every call sent, with one row
+            per asyncio task. None to trace nothing. See Fleet.trace.
+    """
+
+    def __init__(self, pool_size=Defaults.ASYNC_POOL_SIZE, keep_alive=True, codec=None, instrumentation=None):
+        """
+        Initializes an AsyncConnection object.
+
+        Args:
+            pool_size (int, optional): The maximum number of simultaneous connections.
+                Defaults to Defaults.ASYNC_POOL_SIZE.
+            keep_alive (bool, optional): Reuse connections between calls.
+                Defaults to True.
+            codec (JSONCodec, optional): The codec encoding payloads and decoding
+                responses. If None, JSONCodec.default() is used. Defaults to None.
+            instrumentation (Instrumentation, optional): Records every call sent.
+                Defaults to None.
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.codec = codec if codec is not None else JSONCodec.default()
+        self.instrumentation = instrumentation
+        self.tracer = None
+        self.session = None
+
+    def _session(self):
+        # aiohttp sessions must be opened inside a running event loop
+        if self.session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("AsyncConnection requires aiohttp, install it with: pip install pyrai[async]")
+
+            connector = aiohttp.TCPConnector(limit=self.pool_size, force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector)
+
+        return self.session
+
+    async def send(self, build, *args, **kwargs):
+        """
+        Builds a Call and sends it.
+
+        Args:
+            build (function): Returns the Call to send when called with
+                args and kwargs.
+
+        Returns:
+            The decoded response of the call.
+
+        Raises:
+            StatusError: If the response is not a 200.
+        """
+        if self.instrumentation is not None or self.tracer is not None:
+            return await self._send_observed(build, args, kwargs)
+
+        call = build(*args, **kwargs)
+        session = self._session()
+
+        if call.method == "GET":
+            request = session.get(call.url, params=call.payload)
+        else:
+            request = session.post(call.url, data=self.codec.dumps(call.payload))
+
+        async with request as r:
+            resp = self.codec.loads(await r.read())
+            return call.result(r.status, resp)
+
+    async def _send_observed(self, build, args, kwargs):
+        # send, timing each phase for the instrumentation and tracer
+        instrumentation, tracer = self.instrumentation, self.tracer
+        clock = time.perf_counter
+        phases = []
+        call, status, resp, request_bytes, response_bytes, error = None, None, None, 0, 0, None
+        start = clock()
+        try:
+            call = build(*args, **kwargs)
+            t = clock()
+            phases.append(("build", start, t))
+            session = self._session()
+
+            if call.method == "GET":
+                request = session.get(call.url, params=call.payload)
+            else:
+                data = self.codec.dumps(call.payload)
+                request_bytes = len(data)
+                phases.append(("encode", t, clock()))
+                t = clock()
+                request = session.post(call.url, data=data)
+
+            async with request as r:
+                status = r.status
+                if call.method == "GET":
+                    request_bytes = len(r.url.query_string)
+                content = await r.read()
+                response_bytes = len(content)
+                phases.append(("network", t, clock()))
+
+                t = clock()
+                resp = self.codec.loads(content)
+                phases.append(("decode", t, clock()))
+
+                t = clock()
+                result = call.result(status, resp)
+                phases.append(("model", t, clock()))
+                return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            observe_call(instrumentation, tracer, call, start, phases, status, request_bytes, response_bytes,
+                error, resp, _task_id())
+
+    async def stream(self, build, *args, **kwargs):
+        """
+        Builds a Call and sends it, decoding the elements of the arrays of
+        the response as they arrive. See Connection.stream.
+
+        Args:
+            build (function): Returns the Call to send when called with
+                args and kwargs.
+
+        Returns:
+            async iterator: The decoded elements, in response order.
+
+        Raises:
+            StatusError: If the response is not a 200.
+            ValueError: If the response is incomplete.
+        """
+        # when observed, streamed calls are timed as a whole, with their
+        # build, encode and network phases until the response headers
+        instrumentation, tracer = self.instrumentation, self.tracer
+        phases = []
+        call, status, request_bytes, response_bytes, error = None, None, 0, 0, None
+        start = time.perf_counter()
+        try:
+            call = build(*args, **kwargs)
+            t = time.perf_counter()
+            phases.append(("build", start, t))
+            session = self._session()
+
+            if call.method == "GET":
+                request = session.get(call.url, params=call.payload)
+            else:
+                data = self.codec.dumps(call.payload)
+                request_bytes = len(data)
+                phases.append(("encode", t, time.perf_counter()))
+                t = time.perf_counter()
+                request = session.post(call.url, data=data)
+
+            async with request as r:
+                status = r.status
+                phases.append(("network", t, time.perf_counter()))
+                if call.method == "GET":
+                    request_bytes = len(r.url.query_string)
+                if r.status != 200:
+                    content = await r.read()
+                    response_bytes = len(content)
+                    call.result(r.status, self.codec.loads(content))
+                call.succeeded()
+
+                parser = JSONStream(call.stream_sections)
+                async for chunk in r.content.iter_chunked(Defaults.STREAM_CHUNK_SIZE):
+                    response_bytes += len(chunk)
+                    for item in parser.feed(chunk):
+                        yield call.decode(item)
+                parser.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            observe_call(instrumentation, tracer, call, start, phases, status, request_bytes, response_bytes,
+                error, tid=_task_id())
+
+    async def prewarm(self, url, connections=Defaults.PREWARM_CONNECTIONS, timeout=Defaults.PREWARM_TIMEOUT):
+        """
+        Opens connections to the host of url ahead of time. See Connection.prewarm.
+
+        Args:
+            url (str): Any URL on the host to warm up.
+            connections (int, optional): The number of connections to open,
+                capped at pool_size. Defaults to Defaults.PREWARM_CONNECTIONS.
+            timeout (float, optional): Seconds to wait for each connection.
+                Defaults to Defaults.PREWARM_TIMEOUT.
+        """
+        if not self.keep_alive:
+            return
+
+        import aiohttp
+        session = self._session()
+
+        async def warm():
+            try:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)):
+                    pass
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        await asyncio.gather(*[warm() for _ in range(min(connections, self.pool_size))])
+
+    async def close(self):
+        """
+        Closes all pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+def _task_id():
+    # one trace row per task, since a task's calls never overlap
+    try:
+        task = asyncio.current_task()
+    except AttributeError:
+        task = asyncio.Task.current_task()
+    return id(task) if task is not None else None
@@ -0,0 +1,413 @@
+import asyncio
+import time
+from .defaults import Defaults
+from .bulk_error import BulkError
+from .bulk_result import BulkResult
+from .fleet import Fleet
+from .async_vehicle import AsyncVehicle
+from .async_connection import AsyncConnection
+from .async_metrics_cache import AsyncMetricsCache
+from .async_replayer import AsyncReplayer
+from .async_update_buffer import AsyncUpdateBuffer
+from .traffic_log import TrafficLog
+from pyrai.dispatcher.methods.fleet.make_vehicle_online import make_vehicle_online_call
+from pyrai.dispatcher.methods.fleet.make_vehicle_offline import make_vehicle_offline_call
+from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle_call
+from pyrai.dispatcher.methods.fleet.update_vehicles import vehicle_chains
+from pyrai.dispatcher.methods.fleet.remove_vehicle import remove_vehicle_call
+from pyrai.dispatcher.methods.fleet.get_vehicle_info import get_vehicle_info_call
+from pyrai.dispatcher.methods.fleet.set_params import set_params_call
+from pyrai.dispatcher.methods.fleet.add_request import add_request_call
+from pyrai.dispatcher.methods.fleet.add_requests import read_trips, trip_kwargs
+from pyrai.dispatcher.methods.fleet.cancel_request import cancel_request_call
+from pyrai.dispatcher.methods.fleet.get_request import get_request_call
+from pyrai.dispatcher.methods.fleet.get_assignments import get_assignments_call
+from pyrai.dispatcher.methods.fleet.forward_simulate import forward_simulate_call
+from pyrai.dispatcher.methods.fleet.stream_forward_simulate import stream_forward_simulate_call, columnar_chunk
+from pyrai.dispatcher.methods.fleet.get_metrics import get_metrics_call, metrics_range
+from pyrai.dispatcher.methods.fleet.plot_metrics import metrics_figure
+
+class AsyncFleet(Fleet):
+    """
+    Class used to represent a fleet from asyncio code. It has the same
+    attributes and methods as Fleet, with the same arguments and return
+    values, but every API call is a coroutine sent over an AsyncConnection.
+    Its vehicles are AsyncVehicles, and Request.cancel returns an awaitable
+    for requests of this fleet. enable_update_buffer, disable_update_buffer
+    and replay are coroutines too, and the update buffer, metrics cache
+    and replayer are their asyncio counterparts.
+    """
+
+    vehicle_class = AsyncVehicle
+
+    def __init__(self,
+        api_key,
+        fleet_key,
+        params=Defaults.DEFAULT_PARAMS,
+        vis_url=Defaults.VISUALIZATION_URL,
+        base_url=Defaults.BASE_URL,
+        connection=None,
+        clock=None):
+        """
+        Initializes an AsyncFleet object. See Fleet.
+
+        Args:
+            connection (AsyncConnection, optional): The connection used for API calls.
+                Fleets created from an AsyncPyrai object share its connection. If None,
+                the fleet opens its own. Defaults to None.
+        """
+        if connection is None:
+            connection = AsyncConnection()
+
+        super().__init__(api_key, fleet_key, params=params, vis_url=vis_url,
+            base_url=base_url, connection=connection, clock=clock)
+        self.metrics_cache = AsyncMetricsCache(self)
+
+    async def make_vehicle_online(self, vid, location, capacity):
+        """
+        Attempts to make vehicle online. See Fleet.make_vehicle_online.
+
+        Returns:
+            StatusReponse: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(make_vehicle_online_call, self, vid, location, capacity)
+
+    async def make_vehicle_offline(self, vid, location):
+        """
+        Attempts to take vehicle offline. See Fleet.make_vehicle_offline.
+
+        Returns:
+            StatusReponse: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(make_vehicle_offline_call, self, vid, location)
+
+    async def update_vehicle(self, vid, location, event, direction=Defaults.DEFAULT_DIRECTION, event_time=None, req_id=None):
+        """
+        Attempts to update a vehicle. See Fleet.update_vehicle.
+
+        Returns:
+            AsyncVehicle: If successful. None if the update was held by the fleet's
+                update buffer, see enable_update_buffer.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        if self.update_buffer is not None:
+            return await self.update_buffer.add({
+                'vid': vid,
+                'location': location,
+                'event': event,
+                'direction': direction,
+                'event_time': event_time,
+                'req_id': req_id
+            })
+
+        return await self.connection.send(update_vehicle_call, self, vid, location, event,
+            direction, event_time, req_id)
+
+    async def update_vehicles(self, updates, max_concurrency=Defaults.ASYNC_MAX_CONCURRENCY):
+        """
+        Attempts to update many vehicles at once. See Fleet.update_vehicles.
+
+        Args:
+            updates (iterable[dict]): The keyword arguments of update_vehicle for each update.
+            max_concurrency (int, optional): The maximum number of updates in flight.
+                Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+
+        Returns:
+            BulkResult: The refreshed vehicles and the failed updates.
+        """
+        updates = list(updates)
+        results = [None] * len(updates)
+        errors = []
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send_chain(indices):
+            for i in indices:
+                async with semaphore:
+                    try:
+                        results[i] = await self.connection.send(update_vehicle_call, self, **updates[i])
+                    except Exception as e:
+                        errors.append(BulkError(i, updates[i], e))
+
+        start = time.perf_counter()
+        await asyncio.gather(*[send_chain(chain) for chain in vehicle_chains(updates)])
+
+        return BulkResult(len(updates), errors, time.perf_counter() - start, results)
+
+    async def enable_update_buffer(self, window=Defaults.UPDATE_BUFFER_WINDOW,
+        max_concurrency=Defaults.ASYNC_MAX_CONCURRENCY):
+        """
+        Buffers the location updates of update_vehicle. See Fleet.enable_update_buffer.
+        The held updates are flushed by a task of the running event loop.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of updates in flight
+                during a flush. Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+
+        Returns:
+            AsyncUpdateBuffer: The buffer, also set as self.update_buffer.
+        """
+        if self.update_buffer is not None:
+            await self.update_buffer.close()
+
+        self.update_buffer = AsyncUpdateBuffer(self, window=window, max_concurrency=max_concurrency)
+        return self.update_buffer
+
+    async def disable_update_buffer(self):
+        """
+        Sends the held location updates and stops buffering them.
+        See Fleet.disable_update_buffer.
+
+        Returns:
+            BulkResult: The result of sending the held updates, None if
+                no update was held or the buffer was not enabled.
+        """
+        if self.update_buffer is None:
+            return None
+
+        update_buffer = self.update_buffer
+        self.update_buffer = None
+        return await update_buffer.close()
+
+    async def replay(self, log, speed=1, max_concurrency=Defaults.ASYNC_MAX_CONCURRENCY, fleet_key=None, reads=True):
+        """
+        Replays the calls of a traffic log on this fleet. See Fleet.replay.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of calls in flight.
+                Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+
+        Returns:
+            BulkResult: The number of calls replayed, the failed calls, with the index
+                of their entry in the log, and the elapsed time.
+        """
+        replayer = AsyncReplayer(self, speed, max_concurrency, fleet_key, reads)
+        if isinstance(log, str):
+            with TrafficLog(log) as entries:
+                return await replayer.run(entries)
+        return await replayer.run(log)
+
+    async def remove_vehicle(self, vid, location):
+        """
+        Attempts to remove a vehicle. See Fleet.remove_vehicle.
+
+        Returns:
+            list[int]: If vehicle is successfully removed, returns
+                a list of IDs of passengers of the vehicle.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(remove_vehicle_call, self, vid, location)
+
+    async def get_vehicle_info(self, vid):
+        """
+        Attempts to get vehicle info. See Fleet.get_vehicle_info.
+
+        Returns:
+            AsyncVehicle: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(get_vehicle_info_call, self, vid)
+
+    async def set_params(self,
+        max_wait=None,
+        max_delay=None,
+        unlocked_window=None,
+        close_pickup_window=None):
+        """
+        Mutates the fleet object and sets the provided params. See Fleet.set_params.
+
+        Returns:
+            StatusResponse: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(set_params_call, self, max_wait, max_delay,
+            unlocked_window, close_pickup_window)
+
+    async def add_request(self, rid, pickup, dropoff, load, request_time=None):
+        """
+        Attempts to add a request. See Fleet.add_request.
+
+        Returns:
+            StatusResponse: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(add_request_call, self, rid, pickup, dropoff, load, request_time)
+
+    async def add_requests(self, source, max_in_flight=Defaults.ASYNC_MAX_CONCURRENCY):
+        """
+        Attempts to add many requests, streamed from source. See Fleet.add_requests.
+
+        Args:
+            source (iterable or str): An iterable of trip dicts, or the path of a .csv
+                or .jsonl file of trips.
+            max_in_flight (int, optional): The maximum number of requests in flight.
+                Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+
+        Returns:
+            BulkResult: The number of trips sent and the failed trips.
+        """
+        errors = []
+        count = 0
+        semaphore = asyncio.Semaphore(max_in_flight)
+        in_flight = set()
+
+        async def send(i, trip):
+            try:
+                await self.connection.send(add_request_call, self, **trip_kwargs(trip))
+            except Exception as e:
+                errors.append(BulkError(i, trip, e))
+            finally:
+                semaphore.release()
+
+        start = time.perf_counter()
+        try:
+            for i, trip in enumerate(read_trips(source)):
+                await semaphore.acquire()
+                task = asyncio.ensure_future(send(i, trip))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                count += 1
+        except asyncio.CancelledError:
+            for task in in_flight:
+                task.cancel()
+            raise
+        finally:
+            # also when reading source fails, the requests sent are waited for, as in Fleet.add_requests
+            if in_flight:
+                await asyncio.wait(in_flight)
+
+        return BulkResult(count, errors, time.perf_counter() - start)
+
+    async def cancel_request(self, rid, event_time=None):
+        """
+        Attempts to cancel a request. See Fleet.cancel_request.
+
+        Returns:
+            StatusResponse: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(cancel_request_call, self, rid, event_time)
+
+    async def get_request(self, rid):
+        """
+        Allows user to query request with given ID. See Fleet.get_request.
+
+        Returns:
+            Request: If successful.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        return await self.connection.send(get_request_call, self, rid)
+
+    async def get_assignments(self, current_time=None, columnar=False, lazy=False):
+        """
+        Computes vehicle assignments for the fleet in the current state.
+        See Fleet.get_assignments.
+
+        Returns:
+            VehicleAssignments: If assignments are successfully computed.
+                ColumnarAssignments if columnar is True, LazyVehicleAssignments
+                if lazy is True.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        if self.update_buffer is not None:
+            await self.update_buffer.flush()
+
+        return await self.connection.send(get_assignments_call, self, current_time, columnar, lazy)
+
+    async def forward_simulate(self, duration, current_time=None, columnar=False, lazy=False):
+        """
+        Forward simulates the fleet for a given duration. See Fleet.forward_simulate.
+
+        Returns:
+            VehicleAssignments: The final state of all vehicles and requests, after the simulation.
+                ColumnarAssignments if columnar is True, LazyVehicleAssignments
+                if lazy is True.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        if self.update_buffer is not None:
+            await self.update_buffer.flush()
+
+        return await self.connection.send(forward_simulate_call, self, duration, current_time, columnar, lazy)
+
+    async def stream_forward_simulate(self, duration, current_time=None, chunk_size=None):
+        """
+        Forward simulates the fleet for a given duration, yielding the final
+        state as it arrives. See Fleet.stream_forward_simulate.
+
+        Returns:
+            async iterator: The AsyncVehicle, Request and Notification objects of the
+                final state, in response order, or ColumnarAssignments chunks if
+                chunk_size is set.
+
+        Raises:
+            StatusError: If unsuccessful.
+            ValueError: If the response is incomplete.
+        """
+        if self.update_buffer is not None:
+            await self.update_buffer.flush()
+
+        section, batch = None, []
+        async for key, item in self.connection.stream(stream_forward_simulate_call, self,
+            duration, current_time, chunk_size):
+            if chunk_size is None:
+                yield item
+                continue
+
+            if batch and (key != section or len(batch) >= chunk_size):
+                yield columnar_chunk(section, batch)
+                batch = []
+            section = key
+            batch.append(item)
+
+        if batch:
+            yield columnar_chunk(section, batch)
+
+    async def get_metrics(self, start_time=None, end_time=None, metrics=None, cached=True):
+        """
+        Gets the time series metrics of the fleet. See Fleet.get_metrics.
+
+        Returns:
+            list[dict]: The metrics, one dictionary of Metrics per point, in time order.
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+        start_time, end_time = metrics_range(self, start_time, end_time)
+
+        if cached:
+            return await self.metrics_cache.get(start_time, end_time, metrics)
+
+        return await self.connection.send(get_metrics_call, self, start_time, end_time, metrics)
+
+    async def plot_metrics(self, metrics, start_time=None, end_time=None, max_points=None, method="lttb"):
+        """
+        Plots time series metrics. See Fleet.plot_metrics.
+
+        Returns:
+            Plotly.Figure: A figure that graphs the metrics
+                over the time interval.
+        """
+        return metrics_figure(metrics, await self.get_metrics(start_time, end_time, metrics), max_points, method)
@@ -0,0 +1,60 @@
+import asyncio
+from .defaults import Defaults
+from .metrics_cache import MetricsCache, _utc
+
+class AsyncMetricsCache(MetricsCache):
+    """
+    Class used to keep the metrics time series of an AsyncFleet in memory.
+    It has the same attributes and behaviour as MetricsCache, but get is a
+    coroutine, and the windows of a missing range are queried concurrently
+    over the fleet's AsyncConnection.
+    """
+    def __init__(self, fleet, window=Defaults.METRICS_WINDOW, max_concurrency=Defaults.ASYNC_MAX_CONCURRENCY):
+        """
+        Initializes an empty AsyncMetricsCache object. See MetricsCache.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of queries in flight.
+                Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+        """
+        super().__init__(fleet, window, max_concurrency)
+        self._async_lock = None
+
+    async def get(self, start_time, end_time, fields=None):
+        """
+        Gets the metrics between start_time and end_time, querying the
+        ranges that are not cached. See MetricsCache.get.
+
+        Returns:
+            list[dict]: The metrics between start_time and end_time, one
+                dictionary of Metrics per point, in time order.
+
+        Raises:
+            StatusError: If a query is unsuccessful.
+        """
+        start_time, end_time = _utc(start_time), _utc(end_time)
+
+        # created here, so that it belongs to the running event loop
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+
+        async with self._async_lock:
+            self._require(fields)
+            rows = await self._fetch_async(self._windows(self._missing(start_time, end_time)))
+            self._merge(rows, start_time)
+            return self._slice(start_time, end_time)
+
+    async def _fetch_async(self, windows):
+        if not windows:
+            return []
+
+        from pyrai.dispatcher.methods.fleet.get_metrics import get_metrics_call
+        fields = None if self.fields is None else sorted(self.fields)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(window):
+            async with semaphore:
+                return await self.fleet.connection.send(get_metrics_call, self.fleet, window[0], window[1], fields)
+
+        results = await asyncio.gather(*[send(window) for window in windows])
+        return [row for rows in results for row in rows]
@@ -0,0 +1,121 @@
+from .defaults import Defaults
+from .endpoints import Endpoints
+from .pyrai import Pyrai
+from .async_fleet import AsyncFleet
+from .async_connection import AsyncConnection
+
+
+class AsyncPyrai(Pyrai):
+    """
+    Class used to connect to API with API key (no fleet key) from asyncio
+    code. It creates AsyncFleets, which share its AsyncConnection.
+
+    Example:
+        async with AsyncPyrai(api_key=API_KEY) as rai:
+            fleet = await rai.create_sim_fleet()
+            await fleet.make_vehicle_online(1, Location(50, 7), 4)
+    """
+
+    fleet_class = AsyncFleet
+
+    def __init__(self, url=Defaults.BASE_URL, api_key=None,
+        pool_size=Defaults.ASYNC_POOL_SIZE, keep_alive=True,
+        prewarm=Defaults.PREWARM_CONNECTIONS, codec=None, instrumentation=None):
+        """
+        Initializes new AsyncPyrai Object. See Pyrai.
+
+        Args:
+            pool_size (int, optional): The maximum number of simultaneous connections.
+                Defaults to Defaults.ASYNC_POOL_SIZE.
+            instrumentation (Instrumentation, optional): Records the calls sent by the
+                connection. If None, nothing is recorded. Defaults to None.
+        """
+
+        self.api_key = api_key
+        self.base_url = url
+        self.prewarm = prewarm
+        self.connection = AsyncConnection(pool_size=pool_size, keep_alive=keep_alive, codec=codec,
+            instrumentation=instrumentation)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the pooled connections shared with the fleets created
+        from this object.
+        """
+        await self.connection.close()
+
+    async def _create_fleet(self, endpoint, **params):
+        fleet = await self.connection.send(self._create_fleet_call, endpoint, **params)
+
+        if self.prewarm > 0:
+            await self.connection.prewarm(self.base_url, self.prewarm)
+
+        return fleet
+
+    async def create_sim_fleet(
+        self, max_wait="3m", max_delay="6m",
+        unlocked_window="2m", close_pickup_window="1s", clock=None
+    ):
+        """
+        Creates a new simulation fleet. See Pyrai.create_sim_fleet.
+
+        Returns:
+            AsyncFleet: The newly created fleet, if successful.
+
+        Raises:
+            StatusError: If the API call does not return a 200 response.
+        """
+
+        return await self._create_fleet(
+            Endpoints.CREATE_SIM_FLEET,
+            max_wait=max_wait,
+            max_delay=max_delay,
+            unlocked_window=unlocked_window,
+            close_pickup_window=close_pickup_window,
+            clock=clock,
+        )
+
+    async def create_live_fleet(
+        self, max_wait="3m", max_delay="6m",
+        unlocked_window="2m", close_pickup_window="1s"
+    ):
+        """
+        Creates a new live fleet. See Pyrai.create_live_fleet.
+
+        Returns:
+            AsyncFleet: The newly created fleet, if successful.
+
+        Raises:
+            StatusError: If the API call does not return a 200 response.
+        """
+
+        return await self._create_fleet(
+            Endpoints.CREATE_LIVE_FLEET,
+            max_wait=max_wait,
+            max_delay=max_delay,
+            unlocked_window=unlocked_window,
+            close_pickup_window=close_pickup_window,
+        )
+
+    async def get_metrics(self, fleets, metrics=None, start_time=None, end_time=None):
+        """
+        Gets the time series metrics of many fleets in a single API call.
+        See Pyrai.get_metrics.
+
+        Returns:
+            dict[str, list[dict]]: The metrics of each fleet, by fleet key.
+
+        Raises:
+            StatusError: If the API call does not return a 200 response.
+            ValueError: If a metric is not one of Metrics.FIELDS.
+        """
+        if not fleets:
+            return {}
+
+        return await self.connection.send(self._get_metrics_call, fleets, metrics, start_time, end_time)
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from .bulk_error import BulkError
+from .bulk_result import BulkResult
+from .defaults import Defaults
+from .replayer import Replayer
+
+class AsyncReplayer(Replayer):
+    """
+    Class used to replay a traffic log against an AsyncFleet. It has the
+    same attributes and ordering rules as Replayer, but run is a coroutine,
+    and calls are sent as tasks of the event loop instead of threads.
+    """
+
+    def __init__(self, fleet, speed=1, max_concurrency=Defaults.ASYNC_MAX_CONCURRENCY,
+        fleet_key=None, reads=True):
+        """
+        Initializes an AsyncReplayer object. See Replayer.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of calls in flight.
+                Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+        """
+        super().__init__(fleet, speed, max_concurrency, fleet_key, reads)
+
+    async def run(self, entries):
+        """
+        Replays entries, and returns once every call has completed.
+        See Replayer.run.
+
+        Args:
+            entries (iterable[dict]): The entries, e.g. a TrafficLog.
+
+        Returns:
+            BulkResult: The number of calls replayed, the failed calls, with the
+                index of their entry, and the elapsed time.
+        """
+        self.skipped = 0
+        self.max_lag = 0.0
+        errors = []
+        latest = {}
+        slots = asyncio.Semaphore(self.max_concurrency)
+        count = 0
+        origin = None
+        start = time.perf_counter()
+
+        async def send(index, entry, replay, previous=None):
+            if previous is not None:
+                await asyncio.wait([previous])
+            try:
+                async with slots:
+                    await replay(self.fleet, entry['payload'])
+            except Exception as e:
+                errors.append(BulkError(index, entry, e))
+
+        def release(key, future):
+            if latest.get(key) is future:
+                del latest[key]
+
+        for index, entry in enumerate(entries):
+            replay, kind = self._replay_of(entry)
+            if replay is None:
+                continue
+
+            if origin is None:
+                origin = entry['time']
+            delay = self._delay(start, entry['time'] - origin)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            count += 1
+
+            if kind is None:
+                if latest:
+                    await asyncio.wait(list(latest.values()))
+                await send(index, entry, replay)
+                continue
+
+            # bounds the tasks waiting for a slot, like the sync replayer
+            while len(latest) >= self.max_concurrency * 2:
+                await asyncio.wait(list(latest.values()), return_when=asyncio.FIRST_COMPLETED)
+
+            key = (kind, entry['payload']['id'])
+            task = asyncio.ensure_future(send(index, entry, replay, latest.get(key)))
+            latest[key] = task
+            task.add_done_callback(lambda f, key=key: release(key, f))
+
+        if latest:
+            await asyncio.wait(list(latest.values()))
+
+        return BulkResult(count, errors, time.perf_counter() - start)
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from .defaults import Defaults
+from .update_buffer import UpdateBuffer
+from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle_call
+
+class AsyncUpdateBuffer(UpdateBuffer):
+    """
+    Class used to coalesce the vehicle location updates of an AsyncFleet
+    before they are sent. It has the same attributes and behaviour as
+    UpdateBuffer, but add, flush and close are coroutines, and the held
+    updates are flushed every window seconds by a task of the event loop
+    instead of a thread.
+    """
+    _Event = asyncio.Event
+
+    def __init__(self, fleet, window=Defaults.UPDATE_BUFFER_WINDOW, max_concurrency=Defaults.ASYNC_MAX_CONCURRENCY):
+        """
+        Initializes an AsyncUpdateBuffer object, and starts flushing it every
+        window seconds. Must be called from a running event loop.
+
+        Args:
+            fleet (AsyncFleet): The fleet whose updates are buffered.
+            window (float, optional): Seconds between automatic flushes. If None,
+                updates are only flushed by the fleet or by calling flush.
+                Defaults to Defaults.UPDATE_BUFFER_WINDOW.
+            max_concurrency (int, optional): The maximum number of updates in flight
+                during a flush. Defaults to Defaults.ASYNC_MAX_CONCURRENCY.
+        """
+        # no flushing thread, the flushes run on the event loop
+        super().__init__(fleet, window=None, max_concurrency=max_concurrency)
+        self.window = window
+        self._stopped = asyncio.Event()
+        self._task = None
+
+        if window is not None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while not self._stopped.is_set():
+            try:
+                await asyncio.wait_for(self._stopped.wait(), self.window)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    async def add(self, update):
+        """
+        Buffers or sends an update. See UpdateBuffer.add.
+
+        Args:
+            update (dict): The keyword arguments of AsyncFleet.update_vehicle.
+
+        Returns:
+            AsyncVehicle: The updated vehicle, for pickup and dropoff updates.
+                None for buffered location updates.
+
+        Raises:
+            StatusError: If a pickup or dropoff update is unsuccessful.
+        """
+        if self._hold(update):
+            return None
+
+        held, previous, sending = self._take(update.get('vid'))
+        try:
+            for done in previous:
+                await done.wait()
+
+            if held is not None:
+                start = time.perf_counter()
+                try:
+                    result, error = await self.fleet.connection.send(update_vehicle_call, self.fleet, **held), None
+                except Exception as e:
+                    result, error = None, e
+                self._held_sent(held, start, result, error)
+
+            try:
+                vehicle = await self.fleet.connection.send(update_vehicle_call, self.fleet, **update)
+            except Exception:
+                self._count(0, 1)
+                raise
+            self._count(1, 0, passed_through=True)
+            return vehicle
+        finally:
+            self._release(sending)
+
+    async def flush(self):
+        """
+        Sends all held updates.
+
+        Returns:
+            BulkResult: The result of sending the held updates, None if
+                no update was held.
+        """
+        updates, previous, sending = self._take_all()
+        try:
+            if not updates:
+                return None
+
+            for done in previous:
+                await done.wait()
+            return self._flushed(await self.fleet.update_vehicles(updates, max_concurrency=self.max_concurrency))
+        finally:
+            self._release(sending)
+
+    async def close(self):
+        """
+        Stops the automatic flushes and sends all held updates.
+
+        Returns:
+            BulkResult: The result of sending the held updates, None if
+                no update was held.
+        """
+        self._stopped.set()
+        if self._task is not None:
+            await self._task
+        return await self.flush()
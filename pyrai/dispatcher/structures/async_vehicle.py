@@ -0,0 +1,51 @@
+from .vehicle import Vehicle
+from .defaults import Defaults
+
+class AsyncVehicle(Vehicle):
+    """
+    Class used to represent vehicles of an AsyncFleet. It has the same
+    attributes and methods as Vehicle, but every method that makes an
+    API call returns an awaitable.
+    """
+
+    __slots__ = ()
+
+    async def update(self,
+        event,
+        req_id=None,
+        location=None,
+        direction=Defaults.DEFAULT_DIRECTION,
+        event_time=None):
+        """
+        Updates the vehicle. Note that this mutates the vehicle, so nothing is returned.
+        See Vehicle.update.
+
+        Returns:
+            None
+
+        Raises:
+            StatusError: If unsuccessful.
+        """
+
+        if location is None:
+            location = self.location
+
+        updated_veh = await self.fleet.update_vehicle(
+            vid=self.veh_id,
+            location=location,
+            direction=direction,
+            event_time=event_time,
+            req_id=req_id,
+            event=event
+        )
+
+        if updated_veh is None:
+            self.location = location
+            return
+
+        self.location = updated_veh.location
+        self.assigned = updated_veh.assigned
+        self.req_ids = updated_veh.req_ids
+        self.events = updated_veh.events
+
+        return
@@ -0,0 +1,39 @@
+class BulkError(object):
+    """
+    Class used to represent the failure of a single item of a bulk API call.
+
+    Attributes:
+        index (int): The position of the item in the bulk input.
+        item: The item that failed.
+        error (Exception): The error raised for the item, usually a StatusError.
+    """
+    def __init__(self, index, item, error):
+        """
+        Initializes a BulkError object.
+
+        Args:
+            index (int): The position of the item in the bulk input.
+            item: The item that failed.
+            error (Exception): The error raised for the item.
+        """
+        self.index = index
+        self.item = item
+        self.error = error
+
+    def todict(self):
+        """
+        Converts a BulkError object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'index': self.index,
+            'error': str(self.error)
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
@@ -0,0 +1,71 @@
+class BulkResult(object):
+    """
+    Class used to report the outcome of a bulk API call. Failed items
+    are reported in errors instead of raising on the first failure.
+
+    Attributes:
+        count (int): The number of items processed.
+        errors (list[BulkError]): The failed items, in input order.
+        elapsed (float): The wall-clock duration of the bulk call, in seconds.
+        results (list): The value returned for each item, in input order,
+            with None for failed items. None if results are not kept.
+    """
+    def __init__(self, count, errors, elapsed, results=None):
+        """
+        Initializes a BulkResult object.
+
+        Args:
+            count (int): The number of items processed.
+            errors (list[BulkError]): The failed items.
+            elapsed (float): The wall-clock duration of the bulk call, in seconds.
+            results (list, optional): The value returned for each item. Defaults to None.
+        """
+        self.count = count
+        self.errors = sorted(errors, key=lambda e: e.index)
+        self.elapsed = elapsed
+        self.results = results
+
+    @property
+    def succeeded(self):
+        """
+        int: The number of items that succeeded.
+        """
+        return self.count - len(self.errors)
+
+    @property
+    def failed(self):
+        """
+        int: The number of items that failed.
+        """
+        return len(self.errors)
+
+    @property
+    def throughput(self):
+        """
+        float: The number of items processed per second.
+        """
+        if self.elapsed > 0:
+            return self.count / self.elapsed
+        return 0.0
+
+    def todict(self):
+        """
+        Converts a BulkResult object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self, without results.
+        """
+        return {
+            'count': self.count,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'elapsed': self.elapsed,
+            'throughput': self.throughput,
+            'errors': [e.todict() for e in self.errors]
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
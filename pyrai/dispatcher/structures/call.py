@@ -0,0 +1,89 @@
+from .status_error import StatusError
+
+class Call(object):
+    """
+    Class used to describe a single API call, independently of the
+    connection that sends it. Fleet and AsyncFleet methods build the
+    same Call, so request building and response decoding are shared
+    by the sync and async clients.
+
+    Attributes:
+        method (str): The HTTP method, either "GET" or "POST".
+        endpoint (Endpoints: str): The API endpoint.
+        url (str): The URL of the endpoint.
+        payload (dict): The JSON body of a POST, or the query parameters of a GET.
+        decode (function): Converts a successful response into the value returned
+            to the caller.
+        stream_sections (tuple[str]): For streamed calls, the array fields of the
+            response whose elements are decoded one by one. None otherwise.
+        on_success (function): For streamed calls, called without arguments once the
+            response status is known to be 200, before any element is decoded.
+            None if not needed.
+    """
+
+    def __init__(self, method, endpoint, url, payload, decode, stream_sections=None, on_success=None):
+        """
+        Initializes a Call object.
+
+        Args:
+            method (str): The HTTP method, either "GET" or "POST".
+            endpoint (Endpoints: str): The API endpoint.
+            url (str): The URL of the endpoint.
+            payload (dict): The JSON body of a POST, or the query parameters of a GET.
+            decode (function): Converts a successful response into the value returned
+                to the caller. For streamed calls, converts one (section, element)
+                pair of the response.
+            stream_sections (tuple[str], optional): For streamed calls, the array fields
+                of the response whose elements are decoded one by one. Defaults to None.
+            on_success (function, optional): For streamed calls, called once the response
+                status is known to be 200. Defaults to None.
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.payload = payload
+        self.decode = decode
+        self.stream_sections = stream_sections
+        self.on_success = on_success
+
+    @property
+    def fleet_key(self):
+        """
+        str: The fleet key the call is made for, or None for calls outside a fleet.
+        """
+        # POST payloads hold a user_key, GET payloads its fields
+        payload = self.payload
+        if not isinstance(payload, dict):
+            return None
+        user_key = payload.get('user_key')
+        if isinstance(user_key, dict):
+            payload = user_key
+        return payload.get('fleet_key')
+
+    def succeeded(self):
+        """
+        Called by connections once the status of a streamed response is
+        known to be 200, before its elements are decoded. Calls on_success,
+        if set.
+        """
+        if self.on_success is not None:
+            self.on_success()
+
+    def result(self, status_code, resp):
+        """
+        Converts a response to the value returned to the caller.
+
+        Args:
+            status_code (int): The HTTP status code.
+            resp (dict): The decoded JSON response.
+
+        Returns:
+            The decoded response, if status_code is 200.
+
+        Raises:
+            StatusError: If status_code is not 200.
+        """
+        if status_code == 200:
+            return self.decode(resp)
+        else:
+            raise StatusError(resp=resp)
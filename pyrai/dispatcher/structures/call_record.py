@@ -0,0 +1,79 @@
+class CallRecord(object):
+    """
+    Class used to describe one API call as seen by an Instrumentation,
+    and passed to its hooks.
+
+    Attributes:
+        endpoint (Endpoints: str): The API endpoint.
+        fleet_key (str): The fleet key of the call, or "" for calls outside a fleet.
+        method (str): The HTTP method, either "GET" or "POST".
+        seconds (float): The time taken by the call, from building its payload
+            to decoding its response.
+        status_code (int): The HTTP status code. None if no response was received.
+        request_bytes (int): The size of the request body, or of the query string
+            of a GET.
+        response_bytes (int): The size of the response body.
+        error (Exception): The error raised by the call, e.g. a StatusError. None
+            if it succeeded.
+        time (float): The wall-clock time the call started at, in seconds since
+            the epoch.
+        payload (dict): The payload of the call. None if it could not be built.
+        response (dict): The decoded JSON response. None if no response was
+            received, or if it was streamed.
+    """
+
+    def __init__(self, endpoint, fleet_key, method, seconds, status_code,
+        request_bytes=0, response_bytes=0, error=None, time=None, payload=None, response=None):
+        """
+        Initializes a CallRecord object.
+
+        Args:
+            endpoint (Endpoints: str): The API endpoint.
+            fleet_key (str): The fleet key of the call, or "" for calls outside a fleet.
+            method (str): The HTTP method, either "GET" or "POST".
+            seconds (float): The time taken by the call.
+            status_code (int): The HTTP status code, or None.
+            request_bytes (int, optional): The size of the request. Defaults to 0.
+            response_bytes (int, optional): The size of the response. Defaults to 0.
+            error (Exception, optional): The error raised by the call. Defaults to None.
+            time (float, optional): The wall-clock time the call started at.
+                Defaults to None.
+            payload (dict, optional): The payload of the call. Defaults to None.
+            response (dict, optional): The decoded JSON response. Defaults to None.
+        """
+        self.endpoint = endpoint
+        self.fleet_key = fleet_key
+        self.method = method
+        self.seconds = seconds
+        self.status_code = status_code
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.error = error
+        self.time = time
+        self.payload = payload
+        self.response = response
+
+    def todict(self):
+        """
+        Converts the CallRecord object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'endpoint': self.endpoint,
+            'fleet_key': self.fleet_key,
+            'method': self.method,
+            'seconds': self.seconds,
+            'status_code': self.status_code,
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'error': None if self.error is None else type(self.error).__name__,
+            'time': self.time
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
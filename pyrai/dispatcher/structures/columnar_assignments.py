@@ -0,0 +1,147 @@
+from .notification import Notification
+from pyrai.helpers import from_rfc3339
+
+class ColumnarAssignments(object):
+    """
+    Class used to represent vehicle assignments as NumPy columns, for
+    vectorized analytics over large fleets. It is built directly from a
+    get_assignments or forward_simulate response, without creating a
+    Vehicle, Event or Request per item. Each table is a dict of equally
+    long arrays, e.g. pandas.DataFrame(assignments.vehs). Times are
+    seconds since the epoch. numpy is an optional dependency, installed
+    with pyrai[numpy].
+
+    Attributes:
+        vehs (dict[str, numpy.ndarray]): One row per vehicle, with columns veh_id,
+            lat, lng, assigned, req_count and event_count.
+        events (dict[str, numpy.ndarray]): One row per event, vehicle by vehicle in
+            route order, with columns veh_id, req_id, event, lat, lng and time.
+        requests (dict[str, numpy.ndarray]): One row per request, with columns req_id,
+            veh_id, pickup_lat, pickup_lng, dropoff_lat, dropoff_lng, request_time,
+            load and assigned.
+        notifications (list[Notification]): The notifications for the fleet.
+    """
+    def __init__(self, vehs, events, requests, notifications=None):
+        """
+        Initializes a ColumnarAssignments object.
+
+        Args:
+            vehs (dict[str, numpy.ndarray]): The vehicle table.
+            events (dict[str, numpy.ndarray]): The event table.
+            requests (dict[str, numpy.ndarray]): The request table.
+            notifications (list[Notification], optional): The notifications for
+                the fleet. Defaults to None, for no notifications.
+        """
+        self.vehs = vehs
+        self.events = events
+        self.requests = requests
+        self.notifications = notifications if notifications is not None else []
+
+    @staticmethod
+    def fromdict(d):
+        """
+        Converts a get_assignments or forward_simulate response into a
+        ColumnarAssignments object.
+
+        Args:
+            d (dict): The response, with 'vehs', 'reqs' and 'notifications' fields.
+
+        Returns:
+            ColumnarAssignments: The assignments described by d.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("ColumnarAssignments requires numpy, install it with: pip install pyrai[numpy]")
+
+        vehs = d.get('vehs')
+        reqs = d.get('reqs')
+
+        veh_ids, lats, lngs, assigned, req_counts, event_counts = [], [], [], [], [], []
+        e_veh_ids, e_req_ids, e_types, e_lats, e_lngs, e_times = [], [], [], [], [], []
+
+        for veh in vehs:
+            veh_id = veh.get('veh_id')
+            location = veh.get('location')
+            events = veh.get('events')
+
+            veh_ids.append(veh_id)
+            lats.append(location.get('lat'))
+            lngs.append(location.get('lng'))
+            assigned.append(bool(veh.get('assigned')))
+            req_counts.append(len(veh.get('req_ids') or ()))
+            event_counts.append(len(events))
+
+            for e in events:
+                location = e.get('location')
+                e_veh_ids.append(veh_id)
+                e_req_ids.append(e.get('req_id'))
+                e_types.append(e.get('event'))
+                e_lats.append(location.get('lat'))
+                e_lngs.append(location.get('lng'))
+                e_times.append(e.get('time'))
+
+        return ColumnarAssignments(
+            vehs={
+                'veh_id': np.array(veh_ids, dtype=np.int64),
+                'lat': np.array(lats, dtype=np.float64),
+                'lng': np.array(lngs, dtype=np.float64),
+                'assigned': np.array(assigned, dtype=bool),
+                'req_count': np.array(req_counts, dtype=np.int64),
+                'event_count': np.array(event_counts, dtype=np.int64)
+            },
+            events={
+                'veh_id': np.array(e_veh_ids, dtype=np.int64),
+                'req_id': np.array(e_req_ids, dtype=np.int64),
+                'event': np.array(e_types, dtype=str),
+                'lat': np.array(e_lats, dtype=np.float64),
+                'lng': np.array(e_lngs, dtype=np.float64),
+                'time': _epoch_seconds(np, e_times)
+            },
+            requests={
+                'req_id': np.array([r.get('req_id') for r in reqs], dtype=np.int64),
+                'veh_id': np.array([r.get('veh_id') for r in reqs], dtype=np.int64),
+                'pickup_lat': np.array([r.get('pickup').get('lat') for r in reqs], dtype=np.float64),
+                'pickup_lng': np.array([r.get('pickup').get('lng') for r in reqs], dtype=np.float64),
+                'dropoff_lat': np.array([r.get('dropoff').get('lat') for r in reqs], dtype=np.float64),
+                'dropoff_lng': np.array([r.get('dropoff').get('lng') for r in reqs], dtype=np.float64),
+                'request_time': _epoch_seconds(np, [r.get('request_time') for r in reqs]),
+                'load': np.array([r.get('load') for r in reqs], dtype=np.int64),
+                'assigned': np.array([bool(r.get('assigned')) for r in reqs], dtype=bool)
+            },
+            notifications=[Notification.fromdict(n) for n in d.get('notifications')]
+        )
+
+    def todict(self):
+        """
+        Converts the ColumnarAssignments object to a python dictionary of
+        its sizes.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'vehs': len(self.vehs['veh_id']),
+            'events': len(self.events['veh_id']),
+            'requests': len(self.requests['req_id']),
+            'notifications': len(self.notifications)
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
+
+def _epoch_seconds(np, times):
+    # NumPy parses UTC times in bulk, but warns on the Z suffix
+    if all(t.endswith('Z') for t in times):
+        try:
+            ns = np.array([t[:-1] for t in times], dtype='datetime64[ns]')
+            return ns.astype(np.int64) / 1e9
+        except ValueError:
+            pass
+    return np.array([from_rfc3339(t).timestamp() for t in times], dtype=np.float64)
@@ -0,0 +1,314 @@
+import logging
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from .defaults import Defaults
+from .json_codec import JSONCodec
+from .json_stream import JSONStream
+
+class Connection(object):
+    """
+    Class used to send HTTP calls to the API over a pooled, keep-alive
+    session. A Pyrai object owns one Connection, and every Fleet it
+    creates shares it, so TCP and TLS handshakes are paid once per
+    pooled connection instead of once per call.
+
+    Attributes:
+        pool_size (int): The maximum number of connections kept open per host.
+        keep_alive (bool): True if connections are reused between calls.
+        codec (JSONCodec): The codec encoding payloads and decoding responses.
+        session (requests.Session): The underlying session.
+        instrumentation (Instrumentation): Records every call sent. None to
+            record nothing.
+        tracer (Tracer): Timestamps the phases of every call sent. None to
+            trace nothing. See Fleet.trace.
+    """
+
+    def __init__(self, pool_size=Defaults.POOL_SIZE, keep_alive=True, codec=None, instrumentation=None):
+        """
+        Initializes a Connection object.
+
+        Args:
+            pool_size (int, optional): The maximum number of connections kept
+                open per host. Defaults to Defaults.POOL_SIZE.
+            keep_alive (bool, optional): Reuse connections between calls. If False,
+                every call asks the server to close its connection. Defaults to True.
+            codec (JSONCodec, optional): The codec encoding payloads and decoding
+                responses. If None, JSONCodec.default() is used. Defaults to None.
+            instrumentation (Instrumentation, optional): Records every call sent.
+                Defaults to None.
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.codec = codec if codec is not None else JSONCodec.default()
+        self.instrumentation = instrumentation
+        self.tracer = None
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def get(self, url, params=None):
+        """
+        Sends a GET request.
+
+        Args:
+            url (str): The URL.
+            params (dict, optional): The query parameters. Defaults to None.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.session.get(url, params=params)
+
+    def post(self, url, data=None, json=None):
+        """
+        Sends a POST request.
+
+        Args:
+            url (str): The URL.
+            data (str, optional): The encoded request body. Defaults to None.
+            json (dict, optional): A request body to be JSON encoded. Defaults to None.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self.session.post(url, data=data, json=json)
+
+    def send(self, build, *args, **kwargs):
+        """
+        Builds a Call and sends it.
+
+        Args:
+            build (function): Returns the Call to send when called with
+                args and kwargs.
+
+        Returns:
+            The decoded response of the call.
+
+        Raises:
+            StatusError: If the response is not a 200.
+        """
+        if self.instrumentation is not None or self.tracer is not None:
+            return self._send_observed(build, args, kwargs)
+
+        call = build(*args, **kwargs)
+
+        if call.method == "GET":
+            r = self.session.get(call.url, params=call.payload)
+        else:
+            r = self.session.post(call.url, data=self.codec.dumps(call.payload))
+
+        return call.result(r.status_code, self.codec.loads(r.content))
+
+    def _send_observed(self, build, args, kwargs):
+        # send, timing each phase for the instrumentation and tracer
+        instrumentation, tracer = self.instrumentation, self.tracer
+        clock = time.perf_counter
+        phases = []
+        call, r, resp, request_bytes, error = None, None, None, 0, None
+        start = clock()
+        try:
+            call = build(*args, **kwargs)
+            t = clock()
+            phases.append(("build", start, t))
+
+            if call.method == "GET":
+                r = self.session.get(call.url, params=call.payload)
+                request_bytes = len(r.request.url) - len(call.url)
+            else:
+                data = self.codec.dumps(call.payload)
+                request_bytes = len(data)
+                phases.append(("encode", t, clock()))
+                t = clock()
+                r = self.session.post(call.url, data=data)
+            phases.append(("network", t, clock()))
+
+            t = clock()
+            resp = self.codec.loads(r.content)
+            phases.append(("decode", t, clock()))
+
+            t = clock()
+            result = call.result(r.status_code, resp)
+            phases.append(("model", t, clock()))
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            observe_call(instrumentation, tracer, call, start, phases, r.status_code if r is not None else None,
+                request_bytes, len(r.content) if r is not None else 0, error, resp)
+
+    def stream(self, build, *args, **kwargs):
+        """
+        Builds a Call and sends it, decoding the elements of the arrays of
+        the response as they arrive, instead of reading the whole response.
+        The Call's decode function is called with each (section, element)
+        pair, where the sections are given by the call's stream_sections.
+
+        Args:
+            build (function): Returns the Call to send when called with
+                args and kwargs.
+
+        Returns:
+            iterator: The decoded elements, in response order.
+
+        Raises:
+            StatusError: If the response is not a 200.
+            ValueError: If the response is incomplete.
+        """
+        if self.instrumentation is not None or self.tracer is not None:
+            yield from self._stream_observed(build, args, kwargs)
+            return
+
+        call = build(*args, **kwargs)
+
+        if call.method == "GET":
+            r = self.session.get(call.url, params=call.payload, stream=True)
+        else:
+            r = self.session.post(call.url, data=self.codec.dumps(call.payload), stream=True)
+
+        with r:
+            if r.status_code != 200:
+                call.result(r.status_code, self.codec.loads(r.content))
+            call.succeeded()
+
+            parser = JSONStream(call.stream_sections)
+            for chunk in r.iter_content(chunk_size=Defaults.STREAM_CHUNK_SIZE):
+                for item in parser.feed(chunk):
+                    yield call.decode(item)
+            parser.close()
+
+    def _stream_observed(self, build, args, kwargs):
+        # stream, timing each phase for the instrumentation and tracer. The
+        # elements of a chunk are parsed and decoded before being yielded, so
+        # that the caller's time is not counted in the phases
+        instrumentation, tracer = self.instrumentation, self.tracer
+        clock = time.perf_counter
+        phases = []
+        call, r, request_bytes, response_bytes, error = None, None, 0, 0, None
+        start = clock()
+        try:
+            call = build(*args, **kwargs)
+            t = clock()
+            phases.append(("build", start, t))
+
+            if call.method == "GET":
+                r = self.session.get(call.url, params=call.payload, stream=True)
+                request_bytes = len(r.request.url) - len(call.url)
+            else:
+                data = self.codec.dumps(call.payload)
+                request_bytes = len(data)
+                phases.append(("encode", t, clock()))
+                t = clock()
+                r = self.session.post(call.url, data=data, stream=True)
+            phases.append(("network", t, clock()))
+
+            with r:
+                if r.status_code != 200:
+                    content = r.content
+                    response_bytes = len(content)
+                    call.result(r.status_code, self.codec.loads(content))
+                call.succeeded()
+
+                parser = JSONStream(call.stream_sections)
+                chunks = r.iter_content(chunk_size=Defaults.STREAM_CHUNK_SIZE)
+                while True:
+                    t = clock()
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    response_bytes += len(chunk)
+                    phases.append(("network", t, clock()))
+
+                    t = clock()
+                    items = list(parser.feed(chunk))
+                    phases.append(("decode", t, clock()))
+
+                    t = clock()
+                    decoded = [call.decode(item) for item in items]
+                    phases.append(("model", t, clock()))
+
+                    for elem in decoded:
+                        yield elem
+                parser.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            observe_call(instrumentation, tracer, call, start, phases, r.status_code if r is not None else None,
+                request_bytes, response_bytes, error)
+
+    def prewarm(self, url, connections=Defaults.PREWARM_CONNECTIONS, timeout=Defaults.PREWARM_TIMEOUT):
+        """
+        Opens connections to the host of url ahead of time, so the first
+        calls of a fleet do not pay for the handshake. The connections are
+        opened in parallel and returned to the pool. Failures are ignored,
+        since a cold connection is only slower, not wrong.
+
+        Args:
+            url (str): Any URL on the host to warm up.
+            connections (int, optional): The number of connections to open,
+                capped at pool_size. Defaults to Defaults.PREWARM_CONNECTIONS.
+            timeout (float, optional): Seconds to wait for each connection.
+                Defaults to Defaults.PREWARM_TIMEOUT.
+        """
+        if not self.keep_alive:
+            return
+
+        def warm():
+            try:
+                self.session.head(url, timeout=timeout)
+            except requests.RequestException:
+                pass
+
+        threads = [threading.Thread(target=warm) for _ in range(min(connections, self.pool_size))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self.session.close()
+
+_logger = logging.getLogger(__name__)
+
+def observe_call(instrumentation, tracer, call, start, phases, status_code, request_bytes=0,
+    response_bytes=0, error=None, response=None, tid=None):
+    """
+    Passes a completed call to the instrumentation and tracer of a connection.
+    Their failures are logged instead of raised, so that they never replace
+    the result or the error of the call they observe.
+
+    Args:
+        instrumentation (Instrumentation): The instrumentation, or None.
+        tracer (Tracer): The tracer, or None.
+        call (Call): The call, or None if it could not be built.
+        start (float): The start of the call, from time.perf_counter.
+        phases (list[tuple]): The (name, start, end) of each phase.
+        status_code (int): The HTTP status code, or None if no response was received.
+        request_bytes (int, optional): The size of the request. Defaults to 0.
+        response_bytes (int, optional): The size of the response. Defaults to 0.
+        error (Exception, optional): The error raised by the call. Defaults to None.
+        response (dict, optional): The decoded JSON response. Defaults to None.
+        tid (int, optional): The tracer row of the call. If None, the current thread.
+            Defaults to None.
+    """
+    if instrumentation is not None:
+        try:
+            instrumentation.finish(call, start, status_code, request_bytes, response_bytes, error, response)
+        except Exception:
+            _logger.exception("Instrumentation failed to record a call")
+    if tracer is not None:
+        try:
+            tracer.record_call(call, start, time.perf_counter(), phases, status_code, error, tid)
+        except Exception:
+            _logger.exception("Tracer failed to record a call")
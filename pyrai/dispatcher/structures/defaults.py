@@ -10,6 +10,24 @@ class Defaults:
     VISUALIZATION_URL = "https://dashboard.routable.ai/pyraimap?start={start}&end={end}&api_key={api_key}&fleet_key={fleet_key}"
     DEFAULT_CAPACITY = 6
     DEFAULT_DIRECTION = 0
+    POOL_SIZE = 10
+    ASYNC_POOL_SIZE = 100
+    MAX_CONCURRENCY = 10
+    ASYNC_MAX_CONCURRENCY = 100
+    UPDATE_BUFFER_WINDOW = 1
+    PREWARM_CONNECTIONS = 2
+    PREWARM_TIMEOUT = 5
+    STREAM_CHUNK_SIZE = 65536
+    METRICS_WINDOW = 3600
+    WEBGL_THRESHOLD = 5000
+    LOCAL_SPEED = 30 / 3.6
+    LOCAL_BATCH_WINDOW = 30
+    LOCAL_CANDIDATES = 32
+    HISTOGRAM_PRECISION = 8
+    QUANTILES = (0.5, 0.99, 0.999)
+    SIMULATION_STEP = 300
+    SIMULATION_MIN_STEP = 30
+    SIMULATION_MAX_STEP = 900
     DEFAULT_PARAMS = FleetParams(
             max_wait="3m",
             max_delay="6m",
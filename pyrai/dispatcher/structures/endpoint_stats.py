@@ -0,0 +1,81 @@
+from collections import Counter
+from .defaults import Defaults
+from .latency_histogram import LatencyHistogram
+
+class EndpointStats(object):
+    """
+    Class used to aggregate the CallRecords of one endpoint and fleet.
+
+    Attributes:
+        endpoint (Endpoints: str): The API endpoint.
+        fleet_key (str): The fleet key, or "" for calls outside a fleet.
+        latency (LatencyHistogram): The latencies of the calls.
+        request_bytes (int): The total size of the requests.
+        response_bytes (int): The total size of the responses.
+        status_codes (Counter[int]): The number of calls per HTTP status code.
+        errors (Counter[str]): The number of calls per type of error raised,
+            e.g. 'StatusError'.
+    """
+
+    def __init__(self, endpoint, fleet_key, precision=Defaults.HISTOGRAM_PRECISION):
+        """
+        Initializes an empty EndpointStats object.
+
+        Args:
+            endpoint (Endpoints: str): The API endpoint.
+            fleet_key (str): The fleet key, or "" for calls outside a fleet.
+            precision (int, optional): The precision of the latency histogram.
+                Defaults to Defaults.HISTOGRAM_PRECISION.
+        """
+        self.endpoint = endpoint
+        self.fleet_key = fleet_key
+        self.latency = LatencyHistogram(precision)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_codes = Counter()
+        self.errors = Counter()
+
+    @property
+    def count(self):
+        """
+        int: The number of calls.
+        """
+        return self.latency.count
+
+    def record(self, record):
+        """
+        Adds one call.
+
+        Args:
+            record (CallRecord): The call.
+        """
+        self.latency.record(record.seconds)
+        self.request_bytes += record.request_bytes
+        self.response_bytes += record.response_bytes
+        if record.status_code is not None:
+            self.status_codes[record.status_code] += 1
+        if record.error is not None:
+            self.errors[type(record.error).__name__] += 1
+
+    def todict(self):
+        """
+        Converts the EndpointStats object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'endpoint': self.endpoint,
+            'fleet_key': self.fleet_key,
+            'latency': self.latency.todict(),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'status_codes': dict(self.status_codes),
+            'errors': dict(self.errors)
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
@@ -1,6 +1,5 @@
 from .location import Location
-from dateutil.parser import isoparse
-from pyrai.helpers import to_rfc3339
+from pyrai.helpers import to_rfc3339, from_rfc3339
 
 class Event(object):
     """
@@ -12,6 +11,9 @@ class Event(object):
         time (datetime.datetime): the event time.
         event (VehicleEvent): the vehicle event corresponding to the event.
     """
+
+    __slots__ = ('req_id', 'location', 'time', 'event')
+
     def __init__(self, req_id, location, time, event):
         """
         Initializes an Event object.
@@ -41,7 +43,7 @@ class Event(object):
         return Event(
             d.get('req_id'),
             Location.fromdict(d.get('location')),
-            isoparse(d.get('time')),
+            from_rfc3339(d.get('time')),
             d.get('event')
         )
 
@@ -0,0 +1,52 @@
+import datetime
+import threading
+import time as _time
+from .virtual_clock import _local
+
+class FastForwardClock(object):
+    """
+    Class used to give a fleet a time that runs speed times faster than
+    the wall clock, from a start time, e.g. to replay a day of live
+    traffic in an hour against a simulation fleet. Like a VirtualClock,
+    it also jumps forward to the end of each forward_simulate.
+
+    Attributes:
+        speed (float): The number of simulated seconds per wall-clock second.
+    """
+
+    def __init__(self, speed, time=None):
+        """
+        Initializes a FastForwardClock object.
+
+        Args:
+            speed (float): The number of simulated seconds per wall-clock second.
+            time (datetime.datetime, optional): The start time. If None, the current
+                wall-clock time. Defaults to None.
+        """
+        self.speed = speed
+        self._origin = _local(time) if time is not None else datetime.datetime.now()
+        self._start = _time.perf_counter()
+        self._lock = threading.Lock()
+
+    def now(self):
+        """
+        Returns the current time.
+
+        Returns:
+            datetime.datetime: The naive local time of the clock.
+        """
+        return self._origin + datetime.timedelta(seconds=(_time.perf_counter() - self._start) * self.speed)
+
+    def advance_to(self, time):
+        """
+        Moves the current time forward to time, if time is later, and keeps
+        running from there. Safe to call from several threads at once.
+
+        Args:
+            time (datetime.datetime): The time.
+        """
+        time = _local(time)
+        with self._lock:
+            if time > self.now():
+                self._origin = time
+                self._start = _time.perf_counter()
@@ -1,8 +1,12 @@
 from .defaults import Defaults
 from .user_key import UserKey
-import datetime
+from .connection import Connection
+from .vehicle import Vehicle
+from .fleet_state import FleetState
+from .metrics_cache import MetricsCache
+from .wall_clock import WallClock
+import threading
 from dateutil.parser import isoparse
-import requests
 import json
 from pyrai.helpers import to_rfc3339
 from pytimeparse.timeparse import timeparse
@@ -18,14 +22,29 @@ class Fleet(object):
         api_key (string): The API key corresponding to this fleet.
         params (FleetParams): The parameters of this fleet.
         vis_url (string): The URL used for visualizations. 
+        connection (Connection): The pooled connection used for API calls.
+        vehicle_class (type): The class of the vehicles returned by API calls.
+        update_buffer (UpdateBuffer): The buffer coalescing location updates,
+            None unless enabled with enable_update_buffer.
+        state (FleetState): The vehicles and requests of the latest assignments,
+            indexed for lookups without API calls.
+        metrics_cache (MetricsCache): The metrics already queried by get_metrics
+            and plot_metrics.
+        clock (WallClock): The clock giving the time of calls made without one.
+        start_time (datetime.datetime): The time the fleet was created at, by its clock.
+        end_time (datetime.datetime): The latest time of the fleet's calls.
     """
 
+    vehicle_class = Vehicle
+
     def __init__(self,
         api_key, 
         fleet_key, 
         params=Defaults.DEFAULT_PARAMS,
         vis_url=Defaults.VISUALIZATION_URL, 
-        base_url=Defaults.BASE_URL):
+        base_url=Defaults.BASE_URL,
+        connection=None,
+        clock=None):
         """
         Initializes a Fleet object.
 
@@ -41,6 +60,12 @@ class Fleet(object):
                 used when a user wants to create a fleet without creating a fleet from
                 a Pyrai object (e.g. using a predetermined fleet key).
                 Defaults to Defaults.BASE_URL.
+            connection (Connection, optional): The pooled connection used for API calls.
+                Fleets created from a Pyrai object share its connection. If None, the
+                fleet opens its own. Defaults to None.
+            clock (WallClock, optional): The clock giving the time of calls made without
+                one, e.g. a VirtualClock for simulations. If None, a WallClock.
+                Defaults to None.
         """
 
         self.api_key = api_key
@@ -48,15 +73,73 @@ class Fleet(object):
         self.base_url = base_url
         self.params = params
         self.vis_url = vis_url
-        self.start_time = datetime.datetime.now()
-        self.end_time = datetime.datetime.now()
+        self._end_time_lock = threading.Lock()
+        self.clock = clock if clock is not None else WallClock()
+
+        if connection is None:
+            connection = Connection()
+
+        self.connection = connection
+        self.update_buffer = None
+        self.state = FleetState()
+        self.metrics_cache = MetricsCache(self)
+        self._user_key = None
+        self._user_key_dict = None
     
     @property
     def user_key(self):
         """
-        UserKey: UserKey object corresponding to the fleet. 
+        UserKey: UserKey object corresponding to the fleet. It is built once,
+        and again only if api_key or fleet_key change.
+        """
+        key = self._user_key
+        if key is None or key.api_key != self.api_key or key.fleet_key != self.fleet_key:
+            key = UserKey(self.api_key, self.fleet_key)
+            self._user_key_dict = key.todict()
+            self._user_key = key
+        return key
+
+    @property
+    def user_key_dict(self):
+        """
+        dict: The user key as sent in payloads. The same dictionary is shared
+        by every payload of the fleet, so it must not be mutated.
         """
-        return UserKey(self.api_key, self.fleet_key)
+        # refreshes the cached dictionary if the keys changed
+        self.user_key
+        return self._user_key_dict
+
+    @property
+    def clock(self):
+        """
+        WallClock: The clock giving the time of calls made without one. Setting
+        it restarts start_time and end_time at the time of the new clock, so it
+        should be set before the first call of the fleet.
+        """
+        return self._clock
+
+    @clock.setter
+    def clock(self, clock):
+        self._clock = clock
+        with self._end_time_lock:
+            self.start_time = clock.now()
+            self.end_time = self.start_time
+
+    def extend_end_time(self, time):
+        """
+        Moves end_time forward to time, if time is later. Safe to call
+        from several threads at once. Timezone aware times are converted
+        to naive local time, like the times given by clocks.
+
+        Args:
+            time (datetime.datetime): The time of an API call.
+        """
+        if time.tzinfo is not None:
+            time = time.astimezone().replace(tzinfo=None)
+
+        with self._end_time_lock:
+            if time > self.end_time:
+                self.end_time = time
 
     def todict(self):
         """
@@ -79,13 +162,21 @@ class Fleet(object):
     from pyrai.dispatcher.methods.fleet.make_vehicle_online import make_vehicle_online
     from pyrai.dispatcher.methods.fleet.make_vehicle_offline import make_vehicle_offline
     from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle
+    from pyrai.dispatcher.methods.fleet.update_vehicles import update_vehicles
+    from pyrai.dispatcher.methods.fleet.enable_update_buffer import enable_update_buffer
+    from pyrai.dispatcher.methods.fleet.disable_update_buffer import disable_update_buffer
     from pyrai.dispatcher.methods.fleet.remove_vehicle import remove_vehicle
     from pyrai.dispatcher.methods.fleet.get_vehicle_info import get_vehicle_info
     from pyrai.dispatcher.methods.fleet.set_params import set_params
     from pyrai.dispatcher.methods.fleet.add_request import add_request
+    from pyrai.dispatcher.methods.fleet.add_requests import add_requests
     from pyrai.dispatcher.methods.fleet.cancel_request import cancel_request
     from pyrai.dispatcher.methods.fleet.get_request import get_request
     from pyrai.dispatcher.methods.fleet.get_assignments import get_assignments
     from pyrai.dispatcher.methods.fleet.forward_simulate import forward_simulate
+    from pyrai.dispatcher.methods.fleet.stream_forward_simulate import stream_forward_simulate
+    from pyrai.dispatcher.methods.fleet.get_metrics import get_metrics
     from pyrai.dispatcher.methods.fleet.plot_metrics import plot_metrics
-    from pyrai.dispatcher.methods.fleet.visualize import visualize
\ No newline at end of file
+    from pyrai.dispatcher.methods.fleet.visualize import visualize
+    from pyrai.dispatcher.methods.fleet.trace import trace
+    from pyrai.dispatcher.methods.fleet.replay import replay
\ No newline at end of file
@@ -0,0 +1,208 @@
+import threading
+from .vehicle_event import VehicleEvent
+from .assignment_diff import AssignmentDiff
+
+class FleetState(object):
+    """
+    Class used to mirror the state of a fleet in memory. Every
+    get_assignments and forward_simulate response replaces the state,
+    and its indexes answer lookups without API calls. Updates, e.g. from
+    calls made by the threads of a bulk method, are serialized by a lock.
+
+    Attributes:
+        vehs (dict[int, Vehicle]): The vehicles, by veh_id.
+        requests (dict[int, Request]): The requests, by req_id.
+        request_events (dict[int, tuple]): For each req_id in the events of a vehicle,
+            a (Vehicle, pickup Event, dropoff Event) tuple. The pickup Event is None
+            once the request has been picked up.
+        assigned (set[int]): The IDs of assigned vehicles.
+        idle (set[int]): The IDs of unassigned vehicles.
+        assignments (VehicleAssignments): The assignments the state was built from,
+            None before the first update.
+        diff (AssignmentDiff): The changes made by the latest update. Every vehicle
+            and request is new on the first update.
+    """
+    def __init__(self):
+        """
+        Initializes an empty FleetState object.
+        """
+        self.vehs = {}
+        self.requests = {}
+        self.request_events = {}
+        self.assigned = set()
+        self.idle = set()
+        self.assignments = None
+        self.diff = AssignmentDiff()
+
+        self._event_hashes = {}
+        self._assigned_requests = set()
+        self._lock = threading.Lock()
+
+    def update(self, assignments):
+        """
+        Replaces the state with new assignments, and diffs them against the
+        previous ones. Each vehicle's events are compared by a hash of the
+        event sequence, so unchanged vehicles cost one hash. The indexes are
+        built aside and each is swapped in at once, so concurrent readers see
+        either the old or the new version of an index, without locking.
+
+        Args:
+            assignments (VehicleAssignments): The assignments.
+
+        Returns:
+            VehicleAssignments: assignments, unchanged.
+        """
+        with self._lock:
+            vehs = {}
+            request_events = {}
+            assigned = set()
+            idle = set()
+            event_hashes = {}
+            changed = []
+            added = []
+
+            for veh in assignments.vehs:
+                vehs[veh.veh_id] = veh
+
+                h = _events_hash(veh.events)
+                event_hashes[veh.veh_id] = h
+                previous = self._event_hashes.get(veh.veh_id)
+                if previous is None:
+                    added.append(veh)
+                elif previous != h:
+                    changed.append(veh)
+
+                if veh.assigned:
+                    assigned.add(veh.veh_id)
+                else:
+                    idle.add(veh.veh_id)
+
+                for e in veh.events:
+                    _, pickup, dropoff = request_events.get(e.req_id, (veh, None, None))
+                    if e.event == VehicleEvent.PICKUP:
+                        pickup = e
+                    elif e.event == VehicleEvent.DROPOFF:
+                        dropoff = e
+                    request_events[e.req_id] = (veh, pickup, dropoff)
+
+            assigned_requests = {req.req_id for req in assignments.requests if req.assigned}
+
+            diff = AssignmentDiff(
+                changed=changed,
+                added=added,
+                removed=[veh_id for veh_id in self._event_hashes if veh_id not in event_hashes],
+                assigned=sorted(assigned_requests - self._assigned_requests),
+                unassigned=sorted(self._assigned_requests - assigned_requests),
+                notifications=list(assignments.notifications)
+            )
+
+            self.vehs = vehs
+            self.requests = {req.req_id: req for req in assignments.requests}
+            self.request_events = request_events
+            self.assigned = assigned
+            self.idle = idle
+            self.assignments = assignments
+            self.diff = diff
+            self._event_hashes = event_hashes
+            self._assigned_requests = assigned_requests
+
+        return assignments
+
+    def vehicle(self, veh_id):
+        """
+        Looks up a vehicle.
+
+        Args:
+            veh_id (int): The vehicle ID.
+
+        Returns:
+            Vehicle: The vehicle with ID veh_id, None if unknown.
+        """
+        return self.vehs.get(veh_id)
+
+    def request(self, req_id):
+        """
+        Looks up a request.
+
+        Args:
+            req_id (int): The request ID.
+
+        Returns:
+            Request: The request with ID req_id, None if unknown.
+        """
+        return self.requests.get(req_id)
+
+    def vehicle_for_request(self, req_id):
+        """
+        Looks up the vehicle serving a request.
+
+        Args:
+            req_id (int): The request ID.
+
+        Returns:
+            Vehicle: The vehicle serving the request with ID req_id, None
+                if the request is not in the events of any vehicle.
+        """
+        entry = self.request_events.get(req_id)
+        if entry is None:
+            return None
+        return entry[0]
+
+    def events_for_request(self, req_id):
+        """
+        Looks up the scheduled events of a request.
+
+        Args:
+            req_id (int): The request ID.
+
+        Returns:
+            tuple: The (pickup Event, dropoff Event) of the request with ID req_id,
+                each None if not scheduled, or None if the request is not in the
+                events of any vehicle.
+        """
+        entry = self.request_events.get(req_id)
+        if entry is None:
+            return None
+        return entry[1:]
+
+    def idle_vehicles(self):
+        """
+        Lists the unassigned vehicles.
+
+        Returns:
+            list[Vehicle]: The unassigned vehicles.
+        """
+        vehs = self.vehs
+        return [vehs[veh_id] for veh_id in self.idle if veh_id in vehs]
+
+    def assigned_vehicles(self):
+        """
+        Lists the assigned vehicles.
+
+        Returns:
+            list[Vehicle]: The assigned vehicles.
+        """
+        vehs = self.vehs
+        return [vehs[veh_id] for veh_id in self.assigned if veh_id in vehs]
+
+    def todict(self):
+        """
+        Converts the FleetState object to a python dictionary of its sizes.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'vehs': len(self.vehs),
+            'requests': len(self.requests),
+            'assigned': len(self.assigned),
+            'idle': len(self.idle)
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+def _events_hash(events):
+    return hash(tuple(
+        (e.req_id, e.event, e.location.lat, e.location.lng, e.time) for e in events
+    ))
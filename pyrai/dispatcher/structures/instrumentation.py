@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from .call_record import CallRecord
+from .defaults import Defaults
+from .endpoint_stats import EndpointStats
+
+_logger = logging.getLogger(__name__)
+
+class Instrumentation(object):
+    """
+    Class used to record the latency, payload sizes, status codes and
+    errors of the API calls sent by a connection, per endpoint and fleet
+    key. Set it as the instrumentation of a Connection, AsyncConnection
+    or LocalConnection to enable it; connections without one record
+    nothing. The statistics can be exported in the Prometheus text
+    format, and hooks receive every call as it completes, to forward
+    it to other backends.
+
+    Attributes:
+        stats (dict[tuple, EndpointStats]): The statistics, by (endpoint, fleet_key).
+        hooks (list[function]): The functions called with the CallRecord of every call.
+        quantiles (tuple[float]): The latency quantiles exported to Prometheus.
+        precision (int): The precision of the latency histograms.
+        hook_errors (int): The number of times a hook raised. Hook errors are
+            logged, and never reach the caller of the observed call.
+    """
+
+    def __init__(self, hooks=None, quantiles=Defaults.QUANTILES, precision=Defaults.HISTOGRAM_PRECISION):
+        """
+        Initializes an Instrumentation object without recorded calls.
+
+        Args:
+            hooks (list[function], optional): Functions called with the CallRecord of
+                every call, from the thread that sent it. Defaults to None.
+            quantiles (tuple[float], optional): The latency quantiles exported to
+                Prometheus. Defaults to Defaults.QUANTILES.
+            precision (int, optional): The precision of the latency histograms.
+                Defaults to Defaults.HISTOGRAM_PRECISION.
+        """
+        self.stats = {}
+        self.hooks = list(hooks) if hooks else []
+        self.quantiles = quantiles
+        self.precision = precision
+        self.hook_errors = 0
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        Calls hook with the CallRecord of every call from now on. Hooks run
+        in the thread that sent the call, so they should return quickly.
+
+        Args:
+            hook (function): Takes a CallRecord.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Stops calling hook.
+
+        Args:
+            hook (function): A hook previously added.
+        """
+        self.hooks.remove(hook)
+
+    def start(self):
+        """
+        Returns the start time of a call, to be given to finish.
+
+        Returns:
+            float: The current time of time.perf_counter.
+        """
+        return time.perf_counter()
+
+    def finish(self, call, start, status_code, request_bytes=0, response_bytes=0, error=None, response=None):
+        """
+        Records a call that started at start.
+
+        Args:
+            call (Call): The call, or None if it could not be built.
+            start (float): The value returned by start.
+            status_code (int): The HTTP status code, or None if no response was received.
+            request_bytes (int, optional): The size of the request. Defaults to 0.
+            response_bytes (int, optional): The size of the response. Defaults to 0.
+            error (Exception, optional): The error raised by the call. Defaults to None.
+            response (dict, optional): The decoded JSON response. Defaults to None.
+
+        Returns:
+            CallRecord: The recorded call.
+        """
+        seconds = time.perf_counter() - start
+        if call is None:
+            endpoint, fleet_key, method, payload = "", "", "", None
+        else:
+            endpoint, fleet_key, method, payload = call.endpoint, call.fleet_key or "", call.method, call.payload
+
+        record = CallRecord(endpoint, fleet_key, method, seconds, status_code,
+            request_bytes, response_bytes, error, time.time() - seconds, payload, response)
+        self.record(record)
+        return record
+
+    def record(self, record):
+        """
+        Adds a call to the statistics, and passes it to the hooks. A hook that
+        raises is logged and counted in hook_errors, and the next hooks still run.
+
+        Args:
+            record (CallRecord): The call.
+        """
+        key = (record.endpoint, record.fleet_key)
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = EndpointStats(record.endpoint, record.fleet_key, self.precision)
+            stats.record(record)
+
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception:
+                with self._lock:
+                    self.hook_errors += 1
+                _logger.exception("Instrumentation hook %r failed", hook)
+
+    def reset(self):
+        """
+        Forgets every recorded call. Hooks are kept.
+        """
+        with self._lock:
+            self.stats = {}
+
+    def todict(self):
+        """
+        Converts the Instrumentation object to a python dictionary.
+
+        Returns:
+            dict: The statistics of each endpoint and fleet key, as a list.
+        """
+        with self._lock:
+            return {'stats': [stats.todict() for stats in self.stats.values()]}
+
+    def prometheus(self, prefix="pyrai"):
+        """
+        Exports the statistics in the Prometheus text exposition format, with
+        endpoint and fleet_key labels: the latency as a summary with the
+        configured quantiles, the request and response bytes, the calls by
+        status code, and the errors by type.
+
+        Args:
+            prefix (str, optional): The prefix of the metric names. Defaults to "pyrai".
+
+        Returns:
+            str: The metrics, ready to be served to a Prometheus scraper.
+        """
+        with self._lock:
+            stats = sorted(self.stats.values(), key=lambda s: (s.endpoint, s.fleet_key))
+            lines = []
+
+            def family(name, kind, help):
+                lines.append("# HELP {}_{} {}".format(prefix, name, help))
+                lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+
+            def sample(name, labels, value):
+                lines.append("{}_{}{{{}}} {}".format(prefix, name,
+                    ",".join('{}="{}"'.format(k, _escape(v)) for k, v in labels), _number(value)))
+
+            family("call_duration_seconds", "summary", "Latency of API calls.")
+            for s in stats:
+                labels = [("endpoint", s.endpoint), ("fleet_key", s.fleet_key)]
+                for q in self.quantiles:
+                    sample("call_duration_seconds", labels + [("quantile", str(q))], s.latency.quantile(q))
+                sample("call_duration_seconds_sum", labels, s.latency.total)
+                sample("call_duration_seconds_count", labels, s.latency.count)
+
+            family("call_request_bytes_total", "counter", "Bytes sent in API calls.")
+            for s in stats:
+                sample("call_request_bytes_total", [("endpoint", s.endpoint), ("fleet_key", s.fleet_key)],
+                    s.request_bytes)
+
+            family("call_response_bytes_total", "counter", "Bytes received in API responses.")
+            for s in stats:
+                sample("call_response_bytes_total", [("endpoint", s.endpoint), ("fleet_key", s.fleet_key)],
+                    s.response_bytes)
+
+            family("calls_total", "counter", "API calls by HTTP status code.")
+            for s in stats:
+                for code, count in sorted(s.status_codes.items()):
+                    sample("calls_total", [("endpoint", s.endpoint), ("fleet_key", s.fleet_key),
+                        ("code", str(code))], count)
+
+            family("call_errors_total", "counter", "API calls that raised, by error type.")
+            for s in stats:
+                for error, count in sorted(s.errors.items()):
+                    sample("call_errors_total", [("endpoint", s.endpoint), ("fleet_key", s.fleet_key),
+                        ("error", error)], count)
+
+        return "\n".join(lines) + "\n"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value):
+    if value is None:
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
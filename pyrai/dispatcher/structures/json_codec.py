@@ -0,0 +1,79 @@
+import json
+
+class JSONCodec(object):
+    """
+    Class used to encode request bodies and decode responses. Connections
+    use JSONCodec.default(), which is orjson when it is installed and the
+    standard library json module otherwise. Any library with dumps and
+    loads functions can be plugged in, e.g.
+    JSONCodec("ujson", ujson.dumps, ujson.loads).
+
+    Attributes:
+        name (str): The name of the JSON library.
+        dumps (function): Encodes a python object to a str or bytes.
+        loads (function): Decodes a str or bytes to a python object.
+    """
+    def __init__(self, name, dumps, loads):
+        """
+        Initializes a JSONCodec object.
+
+        Args:
+            name (str): The name of the JSON library.
+            dumps (function): Encodes a python object to a str or bytes.
+            loads (function): Decodes a str or bytes to a python object.
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    @staticmethod
+    def stdlib():
+        """
+        Builds a codec using the standard library json module.
+
+        Returns:
+            JSONCodec: The json codec.
+        """
+        return JSONCodec("json", json.dumps, json.loads)
+
+    @staticmethod
+    def orjson():
+        """
+        Builds a codec using orjson.
+
+        Returns:
+            JSONCodec: The orjson codec.
+
+        Raises:
+            ImportError: If orjson is not installed.
+        """
+        import orjson
+        return JSONCodec("orjson", orjson.dumps, orjson.loads)
+
+    @staticmethod
+    def default():
+        """
+        Builds the fastest codec available.
+
+        Returns:
+            JSONCodec: The orjson codec if orjson is installed,
+                the json codec otherwise.
+        """
+        try:
+            return JSONCodec.orjson()
+        except ImportError:
+            return JSONCodec.stdlib()
+
+    def todict(self):
+        """
+        Converts a JSONCodec object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'name': self.name
+        }
+
+    def __str__(self):
+        return str(self.todict())
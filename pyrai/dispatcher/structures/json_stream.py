@@ -0,0 +1,150 @@
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+class JSONStream(object):
+    """
+    Class used to parse a JSON object incrementally, as its bytes arrive.
+    The elements of its array fields listed in sections are returned one
+    by one as soon as they are complete, and are not kept, so memory is
+    bounded by the largest element instead of the whole document. Other
+    fields are kept in fields. Elements are decoded with the standard
+    library json module, whatever the codec of the connection, since it
+    is the one that can decode part of a buffer.
+
+    Attributes:
+        sections (tuple[str]): The names of the array fields to stream.
+        fields (dict): The fields that are not streamed, decoded whole.
+        done (bool): True once the whole object has been parsed.
+    """
+    def __init__(self, sections):
+        """
+        Initializes a JSONStream object.
+
+        Args:
+            sections (iterable[str]): The names of the array fields to stream.
+        """
+        self.sections = tuple(sections)
+        self.fields = {}
+        self.done = False
+
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+
+    def feed(self, data):
+        """
+        Parses the next bytes of the document.
+
+        Args:
+            data (bytes): The next bytes.
+
+        Returns:
+            list[tuple]: The (section, element) pairs completed by data, in
+                document order.
+
+        Raises:
+            ValueError: If the document is not a JSON object.
+        """
+        self._buf = self._buf[self._pos:] + self._text.decode(data)
+        self._pos = 0
+        return self._parse()
+
+    def close(self):
+        """
+        Checks that the whole document has been parsed.
+
+        Returns:
+            dict: The fields that are not streamed.
+
+        Raises:
+            ValueError: If the document is incomplete or invalid.
+        """
+        self._buf = self._buf[self._pos:] + self._text.decode(b'', final=True)
+        self._pos = 0
+        self._parse()
+
+        if not self.done:
+            raise ValueError("Incomplete or invalid JSON document: {!r}".format(self._buf[:80]))
+        return self.fields
+
+    def _skip(self):
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _value(self):
+        # a value is only complete once the character after it has arrived,
+        # since e.g. 12 may be the beginning of 123
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            return False, None
+
+        pos = self._pos
+        self._pos = end
+        if self._skip() is None:
+            self._pos = pos
+            return False, None
+        return True, value
+
+    def _parse(self):
+        items = []
+
+        while not self.done:
+            c = self._skip()
+            if c is None:
+                break
+
+            if self._state == 'start':
+                if c != '{':
+                    raise ValueError("Expected a JSON object, got {!r}".format(c))
+                self._pos += 1
+                self._state = 'key'
+
+            elif self._state == 'key':
+                if c == '}':
+                    self._pos += 1
+                    self.done = True
+                elif c == ',':
+                    self._pos += 1
+                else:
+                    complete, key = self._value()
+                    if not complete:
+                        break
+                    if self._skip() != ':':
+                        raise ValueError("Expected ':' after {!r}".format(key))
+                    self._pos += 1
+                    self._key = key
+                    self._state = 'value'
+
+            elif self._state == 'value':
+                if c == '[' and self._key in self.sections:
+                    self._pos += 1
+                    self._state = 'array'
+                else:
+                    complete, value = self._value()
+                    if not complete:
+                        break
+                    self.fields[self._key] = value
+                    self._state = 'key'
+
+            elif self._state == 'array':
+                if c == ']':
+                    self._pos += 1
+                    self._state = 'key'
+                elif c == ',':
+                    self._pos += 1
+                else:
+                    complete, value = self._value()
+                    if not complete:
+                        break
+                    items.append((self._key, value))
+
+        return items
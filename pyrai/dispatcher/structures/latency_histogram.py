@@ -0,0 +1,136 @@
+import math
+from .defaults import Defaults
+
+class LatencyHistogram(object):
+    """
+    Class used to record a distribution of latencies in HDR-style
+    log-linear buckets. Latencies are kept in microseconds, in buckets
+    whose width doubles with each power of two, each split into
+    2^(precision-1) sub-buckets, so every quantile is reported within a
+    relative error of 1/2^(precision-1) with a few hundred counters,
+    however many latencies are recorded.
+
+    Attributes:
+        precision (int): The number of significant bits kept per latency.
+        count (int): The number of recorded latencies.
+        total (float): The sum of the recorded latencies, in seconds.
+        min (float): The smallest recorded latency, in seconds. None if empty.
+        max (float): The largest recorded latency, in seconds. None if empty.
+    """
+
+    def __init__(self, precision=Defaults.HISTOGRAM_PRECISION):
+        """
+        Initializes an empty LatencyHistogram object.
+
+        Args:
+            precision (int, optional): The number of significant bits kept per
+                latency. Defaults to Defaults.HISTOGRAM_PRECISION, i.e. a relative
+                error under 1%.
+        """
+        self.precision = precision
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._counts = {}
+
+    def record(self, seconds):
+        """
+        Records one latency.
+
+        Args:
+            seconds (float): The latency, in seconds.
+        """
+        index = self._index(max(int(seconds * 1e6), 0))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """
+        Returns the latency below which a fraction q of the recorded
+        latencies fall, as the upper bound of its bucket, capped at max.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The latency, in seconds. None if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+
+        rank = max(int(math.ceil(q * self.count)), 1)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._upper(index) / 1e6, self.max)
+        return self.max
+
+    def merge(self, other):
+        """
+        Adds the latencies recorded by another histogram of the same precision.
+
+        Args:
+            other (LatencyHistogram): The histogram to add.
+
+        Raises:
+            ValueError: If the precisions differ.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms of precision {} and {}".format(
+                self.precision, other.precision))
+
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def todict(self):
+        """
+        Converts the LatencyHistogram object to a python dictionary.
+
+        Returns:
+            dict: The count, sum, min, max and p50/p99/p999 latencies, in seconds.
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'p999': self.quantile(0.999)
+        }
+
+    def _index(self, value):
+        # values under 2^precision have their own bucket, larger ones keep
+        # their precision most significant bits
+        shift = value.bit_length() - self.precision
+        if shift <= 0:
+            return value
+        half = 1 << (self.precision - 1)
+        return shift * half + (value >> shift)
+
+    def _upper(self, index):
+        half = 1 << (self.precision - 1)
+        if index < 2 * half:
+            return index
+        shift = index // half - 1
+        mantissa = index - shift * half
+        return ((mantissa + 1) << shift) - 1
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
@@ -0,0 +1,51 @@
+from collections.abc import Sequence
+
+_UNDECODED = object()
+
+class LazyList(Sequence):
+    """
+    Class used to represent a read-only list whose items are decoded
+    from raw dictionaries on first access. Each item is decoded at most
+    once, and later accesses return the same object.
+
+    Attributes:
+        raw (list[dict]): The undecoded items.
+        decode (function): Converts one raw item to its object.
+    """
+    def __init__(self, raw, decode):
+        """
+        Initializes a LazyList object.
+
+        Args:
+            raw (list[dict]): The undecoded items.
+            decode (function): Converts one raw item to its object.
+        """
+        self.raw = raw
+        self.decode = decode
+        self._items = [_UNDECODED] * len(raw)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        item = self._items[index]
+        if item is _UNDECODED:
+            item = self._items[index] = self.decode(self.raw[index])
+        return item
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def decoded(self):
+        """
+        int: The number of items decoded so far.
+        """
+        return sum(1 for item in self._items if item is not _UNDECODED)
+
+    def __repr__(self):
+        return repr(list(self))
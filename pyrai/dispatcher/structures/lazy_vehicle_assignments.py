@@ -0,0 +1,113 @@
+from .vehicle_assignments import VehicleAssignments
+from .request import Request
+from .notification import Notification
+from .lazy_list import LazyList
+
+class LazyVehicleAssignments(VehicleAssignments):
+    """
+    Class used to represent Vehicle Assignments that are decoded on
+    demand. It keeps the raw response, and each vehicle, request and
+    notification is only decoded when it is first accessed, so reading
+    the notifications or a single vehicle does not pay for the rest.
+    It has the same attributes as VehicleAssignments.
+
+    Attributes:
+        fleet (Fleet): The fleet the vehicles and requests are part of.
+        raw (dict): The undecoded response.
+    """
+    def __init__(self, fleet, raw):
+        """
+        Initializes a LazyVehicleAssignments object.
+
+        Args:
+            fleet (Fleet): The fleet the vehicles and requests are part of.
+            raw (dict): A get_assignments or forward_simulate response, with 'vehs',
+                'reqs' and 'notifications' fields.
+        """
+        self.fleet = fleet
+        self.raw = raw
+        self._vehs = None
+        self._requests = None
+        self._notifications = None
+        self._veh_index = None
+        self._req_index = None
+
+    @staticmethod
+    def fromdict(fleet, d):
+        """
+        Wraps a get_assignments or forward_simulate response, without
+        decoding it.
+
+        Args:
+            fleet (Fleet): The fleet the vehicles and requests are part of.
+            d (dict): The response.
+
+        Returns:
+            LazyVehicleAssignments: The assignments described by d.
+        """
+        return LazyVehicleAssignments(fleet, d)
+
+    @property
+    def vehs(self):
+        """
+        LazyList[Vehicle]: The vehicles in the fleet.
+        """
+        if self._vehs is None:
+            fleet = self.fleet
+            self._vehs = LazyList(self.raw.get('vehs'), lambda d: fleet.vehicle_class.fromdict(fleet, d))
+        return self._vehs
+
+    @property
+    def requests(self):
+        """
+        LazyList[Request]: The requests in the fleet.
+        """
+        if self._requests is None:
+            fleet = self.fleet
+            self._requests = LazyList(self.raw.get('reqs'), lambda d: Request.fromdict(fleet, d))
+        return self._requests
+
+    @property
+    def notifications(self):
+        """
+        LazyList[Notification]: The notifications for the fleet.
+        """
+        if self._notifications is None:
+            self._notifications = LazyList(self.raw.get('notifications'), Notification.fromdict)
+        return self._notifications
+
+    def vehicle(self, veh_id):
+        """
+        Decodes a single vehicle.
+
+        Args:
+            veh_id (int): The vehicle ID.
+
+        Returns:
+            Vehicle: The vehicle with ID veh_id, None if it is not in the assignments.
+        """
+        if self._veh_index is None:
+            self._veh_index = {d.get('veh_id'): i for i, d in enumerate(self.raw.get('vehs'))}
+
+        i = self._veh_index.get(veh_id)
+        if i is None:
+            return None
+        return self.vehs[i]
+
+    def request(self, req_id):
+        """
+        Decodes a single request.
+
+        Args:
+            req_id (int): The request ID.
+
+        Returns:
+            Request: The request with ID req_id, None if it is not in the assignments.
+        """
+        if self._req_index is None:
+            self._req_index = {d.get('req_id'): i for i, d in enumerate(self.raw.get('reqs'))}
+
+        i = self._req_index.get(req_id)
+        if i is None:
+            return None
+        return self.requests[i]
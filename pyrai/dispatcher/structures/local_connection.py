@@ -0,0 +1,129 @@
+import time
+from .connection import observe_call
+from .defaults import Defaults
+from .local_simulator import LocalSimulator
+
+class LocalConnection(object):
+    """
+    Class used in place of a Connection to send the calls of simulation
+    fleets to a LocalSimulator in-process, instead of to the API. Calls
+    are built and decoded as usual, so fleets return the same objects,
+    but payloads are neither encoded nor sent. Pass it to Pyrai, or to
+    a Fleet, as its connection.
+
+    Attributes:
+        simulator (LocalSimulator): The simulator answering the calls.
+        instrumentation (Instrumentation): Records every call answered, without
+            request and response sizes since nothing is encoded. None to record
+            nothing.
+        tracer (Tracer): Timestamps the phases of every call answered. None to
+            trace nothing. See Fleet.trace.
+    """
+
+    def __init__(self, simulator=None, instrumentation=None):
+        """
+        Initializes a LocalConnection object.
+
+        Args:
+            simulator (LocalSimulator, optional): The simulator answering the calls.
+                If None, a LocalSimulator with default settings is created.
+                Defaults to None.
+            instrumentation (Instrumentation, optional): Records every call answered.
+                Defaults to None.
+        """
+        self.simulator = simulator if simulator is not None else LocalSimulator()
+        self.instrumentation = instrumentation
+        self.tracer = None
+
+    def send(self, build, *args, **kwargs):
+        """
+        Builds a Call and answers it with the simulator.
+
+        Args:
+            build (function): Returns the Call to send when called with
+                args and kwargs.
+
+        Returns:
+            The decoded response of the call.
+
+        Raises:
+            StatusError: If the simulator cannot answer the call.
+        """
+        if self.instrumentation is not None or self.tracer is not None:
+            return self._send_observed(build, args, kwargs, False)
+
+        call = build(*args, **kwargs)
+        return call.result(*self.simulator.handle(call.endpoint, call.payload))
+
+    def stream(self, build, *args, **kwargs):
+        """
+        Builds a Call, answers it with the simulator, and decodes the
+        elements of its stream_sections one by one. See Connection.stream.
+
+        Args:
+            build (function): Returns the Call to send when called with
+                args and kwargs.
+
+        Returns:
+            iterator: The decoded elements, in response order.
+
+        Raises:
+            StatusError: If the simulator cannot answer the call.
+        """
+        if self.instrumentation is not None or self.tracer is not None:
+            yield from self._send_observed(build, args, kwargs, True)
+            return
+
+        call = build(*args, **kwargs)
+        status_code, resp = self.simulator.handle(call.endpoint, call.payload)
+
+        if status_code != 200:
+            call.result(status_code, resp)
+        call.succeeded()
+
+        for section in call.stream_sections:
+            for elem in resp.get(section) or []:
+                yield call.decode((section, elem))
+
+    def _send_observed(self, build, args, kwargs, stream):
+        # answer, timing each phase for the instrumentation and tracer. Streamed
+        # elements are all decoded before being returned
+        instrumentation, tracer = self.instrumentation, self.tracer
+        clock = time.perf_counter
+        phases = []
+        call, status_code, resp, error = None, None, None, None
+        start = clock()
+        try:
+            call = build(*args, **kwargs)
+            t = clock()
+            phases.append(("build", start, t))
+
+            status_code, resp = self.simulator.handle(call.endpoint, call.payload)
+            phases.append(("simulate", t, clock()))
+
+            t = clock()
+            if stream and status_code == 200:
+                call.succeeded()
+                result = [call.decode((section, elem))
+                    for section in call.stream_sections for elem in resp.get(section) or []]
+            else:
+                result = call.result(status_code, resp)
+            phases.append(("model", t, clock()))
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            observe_call(instrumentation, tracer, call, start, phases, status_code, error=error, response=resp)
+
+    def prewarm(self, url, connections=Defaults.PREWARM_CONNECTIONS, timeout=Defaults.PREWARM_TIMEOUT):
+        """
+        Does nothing, since there are no connections to open.
+        """
+        pass
+
+    def close(self):
+        """
+        Does nothing, since there are no connections to close.
+        """
+        pass
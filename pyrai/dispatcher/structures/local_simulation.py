@@ -0,0 +1,545 @@
+import datetime
+from pytimeparse.timeparse import timeparse
+from .defaults import Defaults
+from .vehicle_event import VehicleEvent
+from pyrai.helpers import to_rfc3339
+
+WAITING, ASSIGNED, ONBOARD, DONE, DROPPED, CANCELED = range(6)
+PICKUP, DROPOFF = 0, 1
+EARTH_RADIUS = 6371000.0
+
+class LocalSimulation(object):
+    """
+    Class used to simulate a simulation fleet in-process, with the same
+    requests, vehicles, capacities and max_wait/max_delay windows as the
+    API, so that forward simulations do not need a round trip. Requests
+    are assigned with an insertion heuristic: each one is inserted where
+    it delays its vehicle's route the least, among all pickup and dropoff
+    positions of the routes of the nearest vehicles that can reach it in
+    time, without breaking the time windows of the route or the capacity
+    of the vehicle. The positions of all candidate vehicles are evaluated
+    at once with numpy. Vehicles drive in straight lines at speed, and
+    requests that cannot be assigned are retried every batch_window
+    seconds until they have waited max_wait. Routes are never locked, so
+    unlocked_window and close_pickup_window are ignored.
+
+    Times are seconds since the epoch. numpy is an optional dependency,
+    installed with pyrai[numpy].
+
+    Attributes:
+        params (dict): The fleet parameters, as sent by set_params.
+        speed (float): The speed of vehicles, in meters per second.
+        batch_window (float): The seconds between two assignments during
+            a forward simulation.
+        candidates (int): The number of nearest vehicles considered per request.
+        time (float): The current time of the simulation, None before it starts.
+        notifications (list[dict]): The notifications not returned yet.
+    """
+
+    def __init__(self, params, speed=Defaults.LOCAL_SPEED, batch_window=Defaults.LOCAL_BATCH_WINDOW,
+        candidates=Defaults.LOCAL_CANDIDATES):
+        """
+        Initializes a LocalSimulation object without vehicles or requests.
+
+        Args:
+            params (dict): The fleet parameters.
+            speed (float, optional): The speed of vehicles, in meters per second.
+                Defaults to Defaults.LOCAL_SPEED.
+            batch_window (float, optional): The seconds between two assignments during
+                a forward simulation. Defaults to Defaults.LOCAL_BATCH_WINDOW.
+            candidates (int, optional): The number of nearest vehicles considered per
+                request. Defaults to Defaults.LOCAL_CANDIDATES.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("LocalSimulation requires numpy, install it with: pip install pyrai[numpy]")
+
+        self._np = np
+        self.params = {}
+        self.speed = speed
+        self.batch_window = batch_window
+        self.candidates = candidates
+        self.time = None
+        self.notifications = []
+        self.set_params(params)
+
+        # vehicles, one row per vehicle ever added, and their routes, one column per stop
+        self._veh_ids = []
+        self._veh_index = {}
+        self.v_lat = np.zeros(0)
+        self.v_lng = np.zeros(0)
+        self.v_capacity = np.zeros(0, dtype=np.int64)
+        self.v_online = np.zeros(0, dtype=bool)
+        self.v_onboard = np.zeros(0, dtype=np.int64)
+        self.v_stops = np.zeros(0, dtype=np.int64)
+
+        self.s_lat = np.zeros((0, 0))
+        self.s_lng = np.zeros((0, 0))
+        self.s_arrival = np.zeros((0, 0))
+        self.s_deadline = np.zeros((0, 0))
+        self.s_delta = np.zeros((0, 0), dtype=np.int64)
+        self.s_req = np.zeros((0, 0), dtype=np.int64)
+        self.s_kind = np.zeros((0, 0), dtype=np.int8)
+        # slack[k]: how much the stops from k on can be delayed, load[k]: the load after node k,
+        # where node 0 is the vehicle and node k the stop k - 1
+        self.s_slack = np.zeros((0, 1))
+        self.s_load = np.zeros((0, 1), dtype=np.int64)
+
+        # requests, one row per request
+        self._req_ids = []
+        self._req_index = {}
+        self.r_pickup_lat = np.zeros(0)
+        self.r_pickup_lng = np.zeros(0)
+        self.r_dropoff_lat = np.zeros(0)
+        self.r_dropoff_lng = np.zeros(0)
+        self.r_load = np.zeros(0, dtype=np.int64)
+        self.r_time = np.zeros(0)
+        self.r_status = np.zeros(0, dtype=np.int8)
+        self.r_veh = np.zeros(0, dtype=np.int64)
+        self.r_pickup_deadline = np.zeros(0)
+        self.r_dropoff_deadline = np.zeros(0)
+
+    def set_params(self, params):
+        """
+        Updates the fleet parameters.
+
+        Args:
+            params (dict): The parameters to update.
+        """
+        self.params.update(params)
+        self.max_wait = timeparse(self.params.get('max_wait') or "0s") or 0
+        self.max_delay = timeparse(self.params.get('max_delay') or "0s") or 0
+
+    def make_vehicle_online(self, vid, lat, lng, capacity):
+        """
+        Adds the vehicle if it is new, and makes it online.
+        """
+        v = self._veh_index.get(vid)
+        if v is None:
+            v = self._veh_index[vid] = len(self._veh_ids)
+            self._veh_ids.append(vid)
+            self._grow_vehicles(v + 1)
+            self.v_onboard[v] = 0
+            self.v_stops[v] = 0
+        self.v_capacity[v] = capacity
+        self.v_online[v] = True
+        self._move(v, lat, lng)
+
+    def make_vehicle_offline(self, vid, lat, lng):
+        """
+        Makes the vehicle offline. It still serves its assigned requests.
+        """
+        v = self._vehicle(vid)
+        self.v_online[v] = False
+        self._move(v, lat, lng)
+
+    def update_vehicle(self, vid, lat, lng, event, req_id=None):
+        """
+        Updates the location of the vehicle, and completes its stop for
+        req_id if event is a pickup or a dropoff.
+
+        Returns:
+            dict: The vehicle, as returned by the API.
+        """
+        v = self._vehicle(vid)
+        r = self._req_index.get(req_id)
+        kind = {VehicleEvent.PICKUP: PICKUP, VehicleEvent.DROPOFF: DROPOFF}.get(event)
+
+        stops = self._stops(v)
+        if r is not None and kind is not None:
+            done = [s for s in stops if s[4] == r and s[5] == kind]
+            if done:
+                stops.remove(done[0])
+                self.v_onboard[v] += done[0][3]
+                self.r_status[r] = ONBOARD if kind == PICKUP else DONE
+
+        self.v_lat[v], self.v_lng[v] = lat, lng
+        self._route(v, stops)
+        return self.vehicle(vid)
+
+    def remove_vehicle(self, vid):
+        """
+        Removes the vehicle. Its requests not picked up yet wait again, and
+        those on board are dropped.
+
+        Returns:
+            list: The ids of the requests that wait again.
+        """
+        v = self._vehicle(vid)
+        del self._veh_index[vid]
+        unassigned = []
+        for r in dict.fromkeys(s[4] for s in self._stops(v)):
+            if self.r_status[r] == ASSIGNED:
+                self.r_status[r], self.r_veh[r] = WAITING, -1
+                unassigned.append(self._req_ids[r])
+            else:
+                self.r_status[r] = DROPPED
+        self.v_online[v] = False
+        self.v_stops[v] = 0
+        return unassigned
+
+    def add_request(self, rid, pickup_lat, pickup_lng, dropoff_lat, dropoff_lng, load, request_time):
+        """
+        Adds a waiting request, assigned from request_time on.
+        """
+        r = self._req_index.get(rid)
+        if r is None:
+            r = self._req_index[rid] = len(self._req_ids)
+            self._req_ids.append(rid)
+            self._grow_requests(r + 1)
+
+        direct = self._travel(pickup_lat, pickup_lng, dropoff_lat, dropoff_lng)
+        self.r_pickup_lat[r], self.r_pickup_lng[r] = pickup_lat, pickup_lng
+        self.r_dropoff_lat[r], self.r_dropoff_lng[r] = dropoff_lat, dropoff_lng
+        self.r_load[r] = load
+        self.r_time[r] = request_time
+        self.r_status[r] = WAITING
+        self.r_veh[r] = -1
+        self.r_pickup_deadline[r] = request_time + self.max_wait
+        self.r_dropoff_deadline[r] = request_time + self.max_wait + direct + self.max_delay
+
+    def cancel_request(self, rid):
+        """
+        Cancels the request, and removes it from the route of its vehicle.
+        """
+        r = self._request(rid)
+        if self.r_status[r] in (ASSIGNED, ONBOARD):
+            v = self.r_veh[r]
+            if self.r_status[r] == ONBOARD:
+                self.v_onboard[v] -= self.r_load[r]
+            self._route(v, [s for s in self._stops(v) if s[4] != r])
+        self.r_status[r] = CANCELED
+
+    def get_assignments(self, current_time):
+        """
+        Moves the simulation to current_time, and assigns the waiting requests.
+
+        Returns:
+            dict: The assignments, as returned by the API.
+        """
+        self._advance(current_time)
+        self._assign()
+        return self.assignments()
+
+    def forward_simulate(self, duration, current_time):
+        """
+        Moves the simulation to current_time, then simulates duration seconds,
+        assigning the waiting requests every batch_window seconds.
+
+        Returns:
+            dict: The assignments at the end of the simulation, as returned by the API.
+        """
+        self._advance(current_time)
+        self._assign()
+
+        end = self.time + duration
+        while self.time < end:
+            self._advance(min(self.time + self.batch_window, end))
+            self._assign()
+
+        return self.assignments()
+
+    def assignments(self):
+        """
+        Builds an assignments response, and forgets the returned notifications.
+
+        Returns:
+            dict: The vehicles, the active requests and the new notifications,
+                as returned by the API.
+        """
+        notifications, self.notifications = self.notifications, []
+        active = self._np.flatnonzero(self.r_status[:len(self._req_ids)] <= ONBOARD)
+        return {
+            'vehs': [self.vehicle(vid) for vid in self._veh_index],
+            'reqs': [self.request(self._req_ids[r]) for r in active],
+            'notifications': notifications
+        }
+
+    def vehicle(self, vid):
+        """
+        Converts a vehicle to the shape returned by the API.
+
+        Returns:
+            dict: The vehicle.
+        """
+        v = self._vehicle(vid)
+        n = self.v_stops[v]
+        reqs = self.s_req[v, :n].tolist()
+        return {
+            'veh_id': vid,
+            'location': {'lat': float(self.v_lat[v]), 'lng': float(self.v_lng[v])},
+            'assigned': bool(n),
+            'req_ids': [self._req_ids[r] for r in dict.fromkeys(reqs)],
+            'events': [{
+                'req_id': self._req_ids[r],
+                'location': {'lat': lat, 'lng': lng},
+                'time': _rfc3339(time),
+                'event': VehicleEvent.PICKUP if kind == PICKUP else VehicleEvent.DROPOFF
+            } for r, lat, lng, time, kind in zip(reqs, self.s_lat[v, :n].tolist(), self.s_lng[v, :n].tolist(),
+                self.s_arrival[v, :n].tolist(), self.s_kind[v, :n].tolist())]
+        }
+
+    def request(self, rid):
+        """
+        Converts a request to the shape returned by the API.
+
+        Returns:
+            dict: The request.
+        """
+        r = self._request(rid)
+        v = self.r_veh[r]
+        return {
+            'pickup': {'lat': float(self.r_pickup_lat[r]), 'lng': float(self.r_pickup_lng[r])},
+            'dropoff': {'lat': float(self.r_dropoff_lat[r]), 'lng': float(self.r_dropoff_lng[r])},
+            'request_time': _rfc3339(self.r_time[r]),
+            'req_id': rid,
+            'veh_id': self._veh_ids[v] if v >= 0 else -1,
+            'load': int(self.r_load[r]),
+            'assigned': bool(self.r_status[r] in (ASSIGNED, ONBOARD))
+        }
+
+    def _vehicle(self, vid):
+        v = self._veh_index.get(vid)
+        if v is None:
+            raise KeyError("vehicle {}".format(vid))
+        return v
+
+    def _request(self, rid):
+        r = self._req_index.get(rid)
+        if r is None:
+            raise KeyError("request {}".format(rid))
+        return r
+
+    def _advance(self, time):
+        # completes the stops reached before time, and moves vehicles along their routes
+        np = self._np
+        if self.time is None:
+            self.time = time
+            return
+        if time <= self.time:
+            return
+
+        nv, width = len(self._veh_ids), self.s_lat.shape[1]
+        if nv and width:
+            stops = self.v_stops[:nv]
+            arrival = self.s_arrival[:nv]
+            done = (np.arange(width) < stops[:, None]) & (arrival <= time)
+            k = done.sum(axis=1)
+            moved = k > 0
+            rows = np.arange(nv)
+            last = np.maximum(k - 1, 0)
+            since = np.where(moved, arrival[rows, last], self.time)
+
+            if moved.any():
+                reqs, kinds = self.s_req[:nv][done], self.s_kind[:nv][done]
+                self.r_status[reqs[kinds == PICKUP]] = ONBOARD
+                self.r_status[reqs[kinds == DROPOFF]] = DONE
+                self.v_onboard[:nv] += np.where(done, self.s_delta[:nv], 0).sum(axis=1)
+                self.v_lat[:nv] = np.where(moved, self.s_lat[rows, last], self.v_lat[:nv])
+                self.v_lng[:nv] = np.where(moved, self.s_lng[rows, last], self.v_lng[:nv])
+
+                # the remaining stops move to the front of the routes
+                shifted = np.minimum(k[:, None] + np.arange(width), width - 1)
+                for a in (self.s_lat, self.s_lng, self.s_arrival, self.s_deadline, self.s_delta, self.s_req, self.s_kind):
+                    a[:nv] = np.take_along_axis(a[:nv], shifted, axis=1)
+                self.v_stops[:nv] = stops - k
+
+            # vehicles still driving are somewhere between their last and next stops
+            driving = self.v_stops[:nv] > 0
+            leg = self.s_arrival[:nv, 0] - since
+            fraction = np.where(driving & (leg > 0), (time - since) / np.where(leg > 0, leg, 1), 0)
+            fraction = np.clip(fraction, 0, 1)
+            self.v_lat[:nv] += fraction * (self.s_lat[:nv, 0] - self.v_lat[:nv])
+            self.v_lng[:nv] += fraction * (self.s_lng[:nv, 0] - self.v_lng[:nv])
+            self._refresh(slice(0, nv))
+
+        self.time = time
+
+    def _assign(self):
+        np = self._np
+        nr = len(self._req_ids)
+        waiting = np.flatnonzero((self.r_status[:nr] == WAITING) & (self.r_time[:nr] <= self.time))
+
+        expired = waiting[self.r_pickup_deadline[waiting] < self.time]
+        for r in expired:
+            self.r_status[r] = DROPPED
+            self._notify(r, False)
+
+        waiting = waiting[self.r_pickup_deadline[waiting] >= self.time]
+        for r in waiting[np.argsort(self.r_time[waiting], kind='stable')]:
+            if self._insert(r):
+                self._notify(r, True)
+
+    def _insert(self, r):
+        # finds the cheapest feasible pickup and dropoff positions over the nearest vehicles
+        np = self._np
+        nv = len(self._veh_ids)
+        if not nv:
+            return False
+
+        now, load = self.time, self.r_load[r]
+        plat, plng = self.r_pickup_lat[r], self.r_pickup_lng[r]
+        dlat, dlng = self.r_dropoff_lat[r], self.r_dropoff_lng[r]
+        pickup_deadline, dropoff_deadline = self.r_pickup_deadline[r], self.r_dropoff_deadline[r]
+
+        reach = self._travel(self.v_lat[:nv], self.v_lng[:nv], plat, plng)
+        candidates = np.flatnonzero(self.v_online[:nv] & (self.v_capacity[:nv] >= load)
+            & (now + reach <= pickup_deadline))
+        if not len(candidates):
+            return False
+        if len(candidates) > self.candidates:
+            nearest = np.argpartition(reach[candidates], self.candidates)[:self.candidates]
+            candidates = candidates[nearest]
+
+        c = candidates
+        m = int(self.v_stops[c].max())
+        stops = self.v_stops[c][:, None]
+        nodes = np.arange(m + 1)
+        valid = nodes <= stops
+        has_next = nodes < stops
+
+        # node 0 is the vehicle, node k is stop k - 1, and the stop after node k is stop k
+        node_lat = np.concatenate([self.v_lat[c][:, None], self.s_lat[c, :m]], axis=1)
+        node_lng = np.concatenate([self.v_lng[c][:, None], self.s_lng[c, :m]], axis=1)
+        node_time = np.concatenate([np.full((len(c), 1), now), self.s_arrival[c, :m]], axis=1)
+        next_lat = np.concatenate([self.s_lat[c, :m], node_lat[:, -1:]], axis=1)
+        next_lng = np.concatenate([self.s_lng[c, :m], node_lng[:, -1:]], axis=1)
+        next_time = np.concatenate([self.s_arrival[c, :m], node_time[:, -1:]], axis=1)
+        slack = self.s_slack[c, :m + 1]
+        loads = self.s_load[c, :m + 1]
+        capacity = self.v_capacity[c][:, None]
+
+        leg = np.where(has_next, next_time - node_time, 0)
+        to_pickup = self._travel(node_lat, node_lng, plat, plng)
+        to_dropoff = self._travel(node_lat, node_lng, dlat, dlng)
+        from_pickup = np.where(has_next, self._travel(plat, plng, next_lat, next_lng), 0)
+        from_dropoff = np.where(has_next, self._travel(dlat, dlng, next_lat, next_lng), 0)
+        direct = self._travel(plat, plng, dlat, dlng)
+
+        pickup_time = node_time + to_pickup
+        pickup_detour = to_pickup + from_pickup - leg
+        dropoff_detour = to_dropoff + from_dropoff - leg
+        fits = valid & (pickup_time <= pickup_deadline) & (loads + load <= capacity)
+
+        # the dropoff right after the pickup, shape (vehicle, position)
+        both_detour = to_pickup + direct + from_dropoff - leg
+        together = np.where(fits & (pickup_time + direct <= dropoff_deadline) & (both_detour <= slack),
+            both_detour, np.inf)
+
+        # the dropoff after other stops, shape (vehicle, pickup position, dropoff position)
+        later = nodes[None, :] > nodes[:, None]
+        peak = np.maximum.accumulate(np.where(later | np.eye(m + 1, dtype=bool), loads[:, None, :], -1), axis=2)
+        delay = pickup_detour[:, :, None] + dropoff_detour[:, None, :]
+        apart = np.where((fits & (pickup_detour <= slack))[:, :, None] & later & valid[:, None, :]
+            & (node_time[:, None, :] + pickup_detour[:, :, None] + to_dropoff[:, None, :] <= dropoff_deadline)
+            & (delay <= slack[:, None, :]) & (peak + load <= capacity[:, :, None]),
+            delay, np.inf)
+
+        best_together = np.unravel_index(np.argmin(together), together.shape)
+        best_apart = np.unravel_index(np.argmin(apart), apart.shape)
+        if together[best_together] <= apart[best_apart]:
+            if not np.isfinite(together[best_together]):
+                return False
+            v, i, j = c[best_together[0]], best_together[1], best_together[1]
+        else:
+            v, i, j = c[best_apart[0]], best_apart[1], best_apart[2]
+
+        route = self._stops(v)
+        pickup = (plat, plng, pickup_deadline, load, r, PICKUP)
+        dropoff = (dlat, dlng, dropoff_deadline, -load, r, DROPOFF)
+        self._route(v, route[:i] + [pickup] + route[i:j] + [dropoff] + route[j:])
+        self.r_status[r], self.r_veh[r] = ASSIGNED, v
+        return True
+
+    def _stops(self, v):
+        n = self.v_stops[v]
+        return list(zip(self.s_lat[v, :n].tolist(), self.s_lng[v, :n].tolist(), self.s_deadline[v, :n].tolist(),
+            self.s_delta[v, :n].tolist(), self.s_req[v, :n].tolist(), self.s_kind[v, :n].tolist()))
+
+    def _route(self, v, stops):
+        # writes the route of vehicle v, driven from its location from now on
+        np = self._np
+        n = len(stops)
+        self._grow_stops(n)
+        self.v_stops[v] = n
+        if n:
+            lat, lng, deadline, delta, req, kind = (np.array(column) for column in zip(*stops))
+            legs = self._travel(np.concatenate([[self.v_lat[v]], lat[:-1]]),
+                np.concatenate([[self.v_lng[v]], lng[:-1]]), lat, lng)
+            self.s_lat[v, :n], self.s_lng[v, :n] = lat, lng
+            self.s_arrival[v, :n] = (self.time or 0) + np.cumsum(legs)
+            self.s_deadline[v, :n], self.s_delta[v, :n] = deadline, delta
+            self.s_req[v, :n], self.s_kind[v, :n] = req, kind
+        self._refresh(slice(v, v + 1))
+
+    def _move(self, v, lat, lng):
+        self.v_lat[v], self.v_lng[v] = lat, lng
+        self._route(v, self._stops(v))
+
+    def _refresh(self, rows):
+        np = self._np
+        width = self.s_lat.shape[1]
+        valid = np.arange(width) < self.v_stops[rows][:, None]
+
+        margin = np.where(valid, self.s_deadline[rows] - self.s_arrival[rows], np.inf)
+        self.s_slack[rows, :width] = np.minimum.accumulate(margin[:, ::-1], axis=1)[:, ::-1]
+        self.s_slack[rows, width] = np.inf
+
+        self.s_load[rows, 0] = self.v_onboard[rows]
+        self.s_load[rows, 1:] = self.v_onboard[rows][:, None] + np.cumsum(np.where(valid, self.s_delta[rows], 0), axis=1)
+
+    def _notify(self, r, assigned):
+        v = self.r_veh[r]
+        self.notifications.append({
+            'message': "Request {} {}".format(self._req_ids[r], "assigned" if assigned else "dropped"),
+            'data': {
+                'veh_id': self._veh_ids[v] if v >= 0 else -1,
+                'req_id': self._req_ids[r],
+                'waiting_duration': "{}s".format(int(self.time - self.r_time[r])),
+                'assigned': assigned
+            }
+        })
+
+    def _travel(self, lat1, lng1, lat2, lng2):
+        # straight line driving time, on an equirectangular projection
+        np = self._np
+        x = np.radians(lng2 - lng1) * np.cos(np.radians((lat1 + lat2) / 2))
+        y = np.radians(lat2 - lat1)
+        return EARTH_RADIUS * np.sqrt(x * x + y * y) / self.speed
+
+    def _grow_vehicles(self, size):
+        if size <= len(self.v_lat):
+            return
+        size = max(size, 2 * len(self.v_lat), 16)
+        for name in ('v_lat', 'v_lng', 'v_capacity', 'v_online', 'v_onboard', 'v_stops',
+            's_lat', 's_lng', 's_arrival', 's_deadline', 's_delta', 's_req', 's_kind', 's_slack', 's_load'):
+            setattr(self, name, _resize(self._np, getattr(self, name), size, 0))
+
+    def _grow_stops(self, width):
+        if width <= self.s_lat.shape[1]:
+            return
+        width = max(width, 2 * self.s_lat.shape[1], 4)
+        for name in ('s_lat', 's_lng', 's_arrival', 's_deadline', 's_delta', 's_req', 's_kind'):
+            setattr(self, name, _resize(self._np, getattr(self, name), width, 1))
+        for name in ('s_slack', 's_load'):
+            setattr(self, name, _resize(self._np, getattr(self, name), width + 1, 1))
+
+    def _grow_requests(self, size):
+        if size <= len(self.r_time):
+            return
+        size = max(size, 2 * len(self.r_time), 16)
+        for name in ('r_pickup_lat', 'r_pickup_lng', 'r_dropoff_lat', 'r_dropoff_lng', 'r_load', 'r_time',
+            'r_status', 'r_veh', 'r_pickup_deadline', 'r_dropoff_deadline'):
+            setattr(self, name, _resize(self._np, getattr(self, name), size, 0))
+
+def _resize(np, a, size, axis):
+    shape = list(a.shape)
+    shape[axis] = size - shape[axis]
+    return np.concatenate([a, np.zeros(shape, dtype=a.dtype)], axis=axis)
+
+def _rfc3339(time):
+    return to_rfc3339(datetime.datetime.fromtimestamp(time, datetime.timezone.utc))
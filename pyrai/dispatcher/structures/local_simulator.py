@@ -0,0 +1,146 @@
+import threading
+import uuid
+from pytimeparse.timeparse import timeparse
+from .defaults import Defaults
+from .endpoints import Endpoints
+from .local_simulation import LocalSimulation
+from pyrai.helpers import from_rfc3339
+
+class LocalSimulator(object):
+    """
+    Class used to answer the calls of simulation fleets in-process, with
+    one LocalSimulation per fleet. It takes the payloads built by the
+    fleet methods and returns responses of the same shape as the API's,
+    so that the same methods, and the same VehicleAssignments, work
+    without the API. Metrics and live fleets are not simulated.
+
+    Attributes:
+        speed (float): The speed of vehicles, in meters per second.
+        batch_window (float): The seconds between two assignments during
+            a forward simulation.
+        candidates (int): The number of nearest vehicles considered per request.
+        simulations (dict[str, LocalSimulation]): The simulations, by fleet key.
+    """
+
+    def __init__(self, speed=Defaults.LOCAL_SPEED, batch_window=Defaults.LOCAL_BATCH_WINDOW,
+        candidates=Defaults.LOCAL_CANDIDATES):
+        """
+        Initializes a LocalSimulator object without fleets.
+
+        Args:
+            speed (float, optional): The speed of vehicles, in meters per second.
+                Defaults to Defaults.LOCAL_SPEED.
+            batch_window (float, optional): The seconds between two assignments during
+                a forward simulation. Defaults to Defaults.LOCAL_BATCH_WINDOW.
+            candidates (int, optional): The number of nearest vehicles considered per
+                request. Defaults to Defaults.LOCAL_CANDIDATES.
+        """
+        self.speed = speed
+        self.batch_window = batch_window
+        self.candidates = candidates
+        self.simulations = {}
+
+        self._lock = threading.Lock()
+        self._routes = {
+            Endpoints.CREATE_SIM_FLEET: self._create_sim_fleet,
+            Endpoints.MAKE_VEHICLE_ONLINE: self._make_vehicle_online,
+            Endpoints.MAKE_VEHICLE_OFFLINE: self._make_vehicle_offline,
+            Endpoints.UPDATE_VEHICLE: self._update_vehicle,
+            Endpoints.REMOVE_VEHICLE: self._remove_vehicle,
+            Endpoints.GET_VEHICLE_INFO: self._get_vehicle_info,
+            Endpoints.ADD_REQUEST: self._add_request,
+            Endpoints.GET_REQUEST: self._get_request,
+            Endpoints.CANCEL_REQUEST: self._cancel_request,
+            Endpoints.COMPUTE_ASSIGNMENTS: self._get_assignments,
+            Endpoints.SET_PARAMS: self._set_params,
+            Endpoints.FORWARD_SIMULATE: self._forward_simulate
+        }
+
+    def handle(self, endpoint, payload):
+        """
+        Answers one call.
+
+        Args:
+            endpoint (Endpoints: str): The endpoint of the call.
+            payload (dict): The payload built by the fleet method.
+
+        Returns:
+            tuple: The HTTP status code, and the response.
+        """
+        route = self._routes.get(endpoint)
+        if route is None:
+            return 400, {'status': 400, 'error': "{} is not simulated locally".format(endpoint)}
+
+        with self._lock:
+            try:
+                return 200, route(payload)
+            except KeyError as e:
+                return 404, {'status': 404, 'error': "Unknown {}".format(e.args[0])}
+
+    def _create_sim_fleet(self, d):
+        fleet_key = str(uuid.uuid4())
+        self.simulations[fleet_key] = LocalSimulation(d.get('params') or {},
+            speed=self.speed, batch_window=self.batch_window, candidates=self.candidates)
+        return {'fleet_key': fleet_key}
+
+    def _make_vehicle_online(self, d):
+        location = d['location']
+        self._simulation(d).make_vehicle_online(d['id'], location['lat'], location['lng'], d['capacity'])
+        return _ok()
+
+    def _make_vehicle_offline(self, d):
+        location = d['location']
+        self._simulation(d).make_vehicle_offline(d['id'], location['lat'], location['lng'])
+        return _ok()
+
+    def _update_vehicle(self, d):
+        location = d['location']
+        return self._simulation(d).update_vehicle(d['id'], location['lat'], location['lng'],
+            d['event'], d.get('req_id'))
+
+    def _remove_vehicle(self, d):
+        req_ids = self._simulation(d).remove_vehicle(d['id'])
+        resp = _ok()
+        if req_ids:
+            resp['req_ids'] = req_ids
+        return resp
+
+    def _get_vehicle_info(self, d):
+        return self._simulation(d).vehicle(d['id'])
+
+    def _add_request(self, d):
+        pickup, dropoff = d['pickup'], d['dropoff']
+        self._simulation(d).add_request(d['id'], pickup['lat'], pickup['lng'], dropoff['lat'], dropoff['lng'],
+            d['load'], _seconds(d['request_time']))
+        return _ok()
+
+    def _get_request(self, d):
+        return self._simulation(d).request(d['id'])
+
+    def _cancel_request(self, d):
+        self._simulation(d).cancel_request(d['id'])
+        return _ok()
+
+    def _get_assignments(self, d):
+        return self._simulation(d).get_assignments(_seconds(d['current_time']))
+
+    def _set_params(self, d):
+        self._simulation(d).set_params(d['params'])
+        return _ok()
+
+    def _forward_simulate(self, d):
+        return self._simulation(d).forward_simulate(timeparse(d['sim_duration']), _seconds(d['current_time']))
+
+    def _simulation(self, d):
+        # POST payloads hold a user_key, GET payloads its fields
+        fleet_key = d.get('user_key', d).get('fleet_key')
+        simulation = self.simulations.get(fleet_key)
+        if simulation is None:
+            raise KeyError("fleet {}".format(fleet_key))
+        return simulation
+
+def _seconds(time):
+    return from_rfc3339(time).timestamp()
+
+def _ok():
+    return {'status': 0, 'error': ""}
@@ -7,6 +7,11 @@ class Location(object):
         lng (float): The longitude.
     """
 
+    __slots__ = ('lat', 'lng')
+
+    _interned = None
+    _interned_size = 0
+
     def __init__(self, lat, lng):
         """
         Initializes a location object
@@ -31,7 +36,37 @@ class Location(object):
             Location: A Location object with attributes set by
                 fields in the dictionary.
         """
-        return Location(d.get('lat'), d.get('lng'))
+        interned = Location._interned
+        if interned is None:
+            return Location(d.get('lat'), d.get('lng'))
+
+        key = (d.get('lat'), d.get('lng'))
+        location = interned.get(key)
+        if location is None:
+            if len(interned) >= Location._interned_size:
+                interned.clear()
+            location = interned[key] = Location(*key)
+        return location
+
+    @staticmethod
+    def intern_locations(size=65536):
+        """
+        Makes fromdict return the same Location object for identical
+        coordinates, e.g. the stops shared by many events, for up to size
+        distinct coordinates. Interned locations are shared between vehicles,
+        events and requests, so they must not be mutated. The interned
+        locations are forgotten when size is reached.
+
+        Args:
+            size (int, optional): The number of coordinates to intern. Set to 0 or None
+                to stop interning. Defaults to 65536.
+        """
+        if size:
+            Location._interned = {}
+            Location._interned_size = size
+        else:
+            Location._interned = None
+            Location._interned_size = 0
 
     def todict(self):
         """
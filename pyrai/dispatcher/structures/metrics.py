@@ -18,9 +18,25 @@ class Metrics:
     AVG_DELAY = "avg_delay"
     AVG_OCCUPANCY = "avg_occupancy"
     SERVICE_RATE = "service_rate"
-    QUERY = """
-    {{
-    live_fleets(
+    FIELDS = (
+        TIME,
+        PASSENGERS,
+        WAITING_REQUESTS,
+        ACTIVE_REQUESTS,
+        DROPPED_REQUESTS,
+        CANCELED_REQUESTS,
+        TOTAL_REQUESTS,
+        ASSIGNED_VEHICLES,
+        IDLE_VEHICLES,
+        REBALANCING_VEHICLES,
+        OFFLINE_VEHICLES,
+        AVG_WAIT,
+        AVG_DELAY,
+        AVG_OCCUPANCY,
+        SERVICE_RATE
+    )
+    FLEET_QUERY = """
+    {alias}: live_fleets(
         api_key: "{api_key}"
         fleet_key: "{fleet_key}"
     ) {{
@@ -28,22 +44,58 @@ class Metrics:
         start: "{start_time}"
         end: "{end_time}"
         ) {{
-            time
-            passengers
-            waiting_requests
-            active_requests
-            dropped_requests
-            canceled_requests
-            total_requests
-            assigned_vehicles
-            idle_vehicles
-            rebalancing_vehicles
-            offline_vehicles
-            avg_wait
-            avg_delay
-            avg_occupancy
-            service_rate
+            {fields}
             }}
         }}
-    }}
-    """
\ No newline at end of file
+    """
+
+    @staticmethod
+    def alias(i):
+        """
+        Names the result of the i-th fleet of a query built by Metrics.query.
+
+        Args:
+            i (int): The position of the fleet in the query.
+
+        Returns:
+            str: The GraphQL alias of the fleet.
+        """
+        return "fleet{}".format(i)
+
+    @staticmethod
+    def query(fleets, start_time, end_time, fields=None):
+        """
+        Builds a GraphQL query for the given metrics of one or more fleets,
+        so that a single round trip only downloads the requested fields.
+        The result of the i-th fleet is named Metrics.alias(i).
+
+        Args:
+            fleets (list[tuple[str]]): The (api_key, fleet_key) of each fleet.
+            start_time (str): The RFC3339 start time.
+            end_time (str): The RFC3339 end time.
+            fields (list[Metrics], optional): The metrics to query. Metrics.TIME is
+                always queried. If None, all metrics are queried. Defaults to None.
+
+        Returns:
+            str: The query.
+
+        Raises:
+            ValueError: If a field is not one of Metrics.FIELDS.
+        """
+        if fields is None:
+            fields = Metrics.FIELDS
+
+        unknown = [f for f in fields if f not in Metrics.FIELDS]
+        if unknown:
+            raise ValueError("Unknown metrics: {}".format(", ".join(unknown)))
+
+        selected = [f for f in Metrics.FIELDS if f == Metrics.TIME or f in fields]
+
+        return "{{{}}}".format("".join(Metrics.FLEET_QUERY.format(
+            alias = Metrics.alias(i),
+            api_key = api_key,
+            fleet_key = fleet_key,
+            start_time = start_time,
+            end_time = end_time,
+            fields = "\n            ".join(selected)
+        ) for i, (api_key, fleet_key) in enumerate(fleets)))
@@ -0,0 +1,193 @@
+import bisect
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .defaults import Defaults
+from .metrics import Metrics
+from pyrai.helpers import from_rfc3339
+
+class MetricsCache(object):
+    """
+    Class used to keep the metrics time series of a fleet in memory, so
+    repeated queries only download the part of the range that is not
+    cached yet. Missing ranges longer than window are split into windows
+    queried in parallel, and merged in time order. Since the latest
+    metrics of a running fleet may still be written, the range after the
+    last cached point is always queried again. Only the requested metrics
+    are queried. Asking for a metric that is not cached clears the cache,
+    which is then filled with the metrics of both requests.
+
+    Attributes:
+        fleet (Fleet): The fleet whose metrics are cached.
+        window (float): The longest range, in seconds, queried at once.
+        max_concurrency (int): The maximum number of queries in flight.
+        rows (list[dict]): The cached metrics, one dictionary of Metrics per
+            point, in time order.
+        fields (set[Metrics]): The cached metrics, None if all are cached.
+        queries (int): The number of queries sent.
+    """
+    def __init__(self, fleet, window=Defaults.METRICS_WINDOW, max_concurrency=Defaults.MAX_CONCURRENCY):
+        """
+        Initializes an empty MetricsCache object.
+
+        Args:
+            fleet (Fleet): The fleet whose metrics are cached.
+            window (float, optional): The longest range, in seconds, queried at once.
+                Defaults to Defaults.METRICS_WINDOW.
+            max_concurrency (int, optional): The maximum number of queries in flight.
+                Defaults to Defaults.MAX_CONCURRENCY.
+        """
+        self.fleet = fleet
+        self.window = window
+        self.max_concurrency = max_concurrency
+        self.rows = []
+        self.fields = set()
+        self.queries = 0
+
+        self._times = []
+        self._start = None
+        self._lock = threading.Lock()
+
+    def get(self, start_time, end_time, fields=None):
+        """
+        Gets the metrics between start_time and end_time, querying the
+        ranges that are not cached.
+
+        Args:
+            start_time (datetime.datetime): The start time.
+            end_time (datetime.datetime): The end time.
+            fields (list[Metrics], optional): The metrics needed, besides Metrics.TIME.
+                If None, all metrics are needed. Defaults to None.
+
+        Returns:
+            list[dict]: The metrics between start_time and end_time, one
+                dictionary of Metrics per point, in time order. Points may have
+                more metrics than fields.
+
+        Raises:
+            StatusError: If a query is unsuccessful.
+        """
+        start_time, end_time = _utc(start_time), _utc(end_time)
+
+        with self._lock:
+            self._require(fields)
+            rows = self._fetch(self._windows(self._missing(start_time, end_time)))
+            self._merge(rows, start_time)
+            return self._slice(start_time, end_time)
+
+    def clear(self):
+        """
+        Forgets the cached metrics.
+        """
+        with self._lock:
+            self._clear()
+            self.fields = set()
+
+    def _clear(self):
+        self.rows = []
+        self._times = []
+        self._start = None
+
+    def _require(self, fields):
+        # clears the cache if it lacks some of fields
+        if self.fields is not None and (fields is None or not self.fields.issuperset(fields)):
+            fields = None if fields is None else self.fields.union(fields)
+            self._clear()
+            self.fields = fields
+
+    def _slice(self, start_time, end_time):
+        lo = bisect.bisect_left(self._times, start_time)
+        hi = bisect.bisect_right(self._times, end_time)
+        return self.rows[lo:hi]
+
+    def _missing(self, start_time, end_time):
+        if self._start is None:
+            return [(start_time, end_time)]
+
+        missing = []
+        if start_time < self._start:
+            missing.append((start_time, self._start))
+
+        # everything after the last cached point may still change
+        last = self._times[-1] if self._times else self._start
+        if end_time > last:
+            missing.append((max(start_time, last), end_time))
+
+        return missing
+
+    def _windows(self, ranges):
+        # splits ranges into windows, and counts their queries
+        windows = []
+        step = datetime.timedelta(seconds=self.window)
+        for start, end in ranges:
+            while start < end:
+                windows.append((start, min(start + step, end)))
+                start += step
+
+        self.queries += len(windows)
+        return windows
+
+    def _fetch(self, windows):
+        if not windows:
+            return []
+
+        # imported here, since the fleet methods import this module
+        from pyrai.dispatcher.methods.fleet.get_metrics import get_metrics_call
+        fields = None if self.fields is None else sorted(self.fields)
+        send = lambda w: self.fleet.connection.send(get_metrics_call, self.fleet, w[0], w[1], fields)
+
+        if len(windows) == 1:
+            return send(windows[0])
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(windows))) as executor:
+            return [row for rows in executor.map(send, windows) for row in rows]
+
+    def _merge(self, rows, start_time):
+        if self._start is None or start_time < self._start:
+            self._start = start_time
+
+        if not rows:
+            return
+
+        # windows share their boundaries, so a point may be returned twice
+        new = {}
+        for row in rows:
+            new[from_rfc3339(row[Metrics.TIME])] = row
+        times = sorted(new)
+
+        # the usual refresh replaces the last cached point and adds later ones
+        if not self._times or times[0] >= self._times[-1]:
+            if self._times and times[0] == self._times[-1]:
+                self._times.pop()
+                self.rows.pop()
+            self._times.extend(times)
+            self.rows.extend(new[time] for time in times)
+            return
+
+        merged = dict(zip(self._times, self.rows))
+        merged.update(new)
+
+        self._times = sorted(merged)
+        self.rows = [merged[time] for time in self._times]
+
+    def todict(self):
+        """
+        Converts the MetricsCache object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'start': self._start.isoformat() if self._start is not None else None,
+            'end': self._times[-1].isoformat() if self._times else None,
+            'points': len(self.rows),
+            'fields': sorted(self.fields) if self.fields is not None else None,
+            'queries': self.queries
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+def _utc(time):
+    # naive times are local, as in to_rfc3339
+    return time.astimezone(datetime.timezone.utc)
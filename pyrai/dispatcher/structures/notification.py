@@ -8,6 +8,9 @@ class Notification(object):
         message (str): The notification message.
         data (NotificationData): the notification data.
     """
+
+    __slots__ = ('message', 'data')
+
     def __init__(self, message, data):
         """
         Initializes a Notification object.
@@ -8,6 +8,9 @@ class NotificationData(object):
         waiting_duration (str): The waiting duration.
         assigned (bool): True if assigned, false if not.
     """
+
+    __slots__ = ('veh_id', 'req_id', 'waiting_duration', 'assigned')
+
     def __init__(self, veh_id, req_id, waiting_duration, assigned):
         """
         Initializes a NotificationData object.
@@ -3,9 +3,10 @@ from .fleet import Fleet
 from .endpoints import Endpoints
 from .status_error import StatusError
 from .fleet_params import FleetParams
-import requests
-import json
-import urllib.parse
+from .connection import Connection
+from .call import Call
+from .metrics import Metrics
+from pyrai.helpers import to_rfc3339, from_rfc3339
 
 
 class Pyrai(object):
@@ -16,19 +17,45 @@ class Pyrai(object):
         api_key (str): The API key. Defaults to None.
         base_url (str): The url of the API service. Defaults to 
             "https://api.routable.ai/"
+        connection (Connection): The pooled connection shared by every fleet
+            created from this object.
+        prewarm (int): The number of connections opened when a fleet is created.
+        fleet_class (type): The class of the fleets created by this object.
     """
 
-    def __init__(self, url=Defaults.BASE_URL, api_key=None):
+    fleet_class = Fleet
+
+    def __init__(self, url=Defaults.BASE_URL, api_key=None,
+        pool_size=Defaults.POOL_SIZE, keep_alive=True,
+        prewarm=Defaults.PREWARM_CONNECTIONS, codec=None, connection=None, instrumentation=None):
         """
         Initializes new Pyrai Object
 
         Args:
             url (str, optional): The base url for API calls. Defaults to Defaults.BASE_URL.
             api_key (str, optional): The API key. Defaults to None.
+            pool_size (int, optional): The maximum number of pooled connections.
+                Defaults to Defaults.POOL_SIZE.
+            keep_alive (bool, optional): Reuse connections between calls. Defaults to True.
+            prewarm (int, optional): The number of connections opened when a fleet
+                is created. Set to 0 to disable. Defaults to Defaults.PREWARM_CONNECTIONS.
+            codec (JSONCodec, optional): The codec encoding payloads and decoding
+                responses. If None, JSONCodec.default() is used. Defaults to None.
+            connection (Connection, optional): The connection used for API calls, e.g.
+                a LocalConnection to simulate fleets in-process. If None, a Connection
+                is opened with pool_size, keep_alive and codec. Defaults to None.
+            instrumentation (Instrumentation, optional): Records the calls sent by the
+                connection. If None, nothing is recorded. Defaults to None.
         """ 
 
         self.api_key = api_key
         self.base_url = url
+        self.prewarm = prewarm
+        if connection is None:
+            connection = Connection(pool_size=pool_size, keep_alive=keep_alive, codec=codec)
+        if instrumentation is not None:
+            connection.instrumentation = instrumentation
+        self.connection = connection
 
     from pyrai.helpers import build_url
 
@@ -48,12 +75,37 @@ class Pyrai(object):
     def __str__(self):
         return str(self.todict())
 
+    def close(self):
+        """
+        Closes the pooled connections shared with the fleets created
+        from this object.
+        """
+        self.connection.close()
+
     def __create_fleet(
         self, endpoint,
         max_wait="3m", max_delay="6m",
-        unlocked_window="2m", close_pickup_window="1s"
+        unlocked_window="2m", close_pickup_window="1s", clock=None
+    ):
+        fleet = self.connection.send(
+            self._create_fleet_call, endpoint,
+            max_wait=max_wait,
+            max_delay=max_delay,
+            unlocked_window=unlocked_window,
+            close_pickup_window=close_pickup_window,
+            clock=clock,
+        )
+
+        if self.prewarm > 0:
+            self.connection.prewarm(self.base_url, self.prewarm)
+
+        return fleet
+
+    def _create_fleet_call(
+        self, endpoint,
+        max_wait="3m", max_delay="6m",
+        unlocked_window="2m", close_pickup_window="1s", clock=None
     ):
-        url = self.build_url(endpoint)
         params = FleetParams(
             max_wait=max_wait,
             max_delay=max_delay,
@@ -62,17 +114,16 @@ class Pyrai(object):
         )
 
         payload = {"api_key": self.api_key, "params": params.todict()}
-        r = requests.post(url, data=json.dumps(payload))
-        resp = r.json()
 
-        if r.status_code == 200:
-            return Fleet(api_key=self.api_key, fleet_key=resp.get('fleet_key'), params=params, base_url=self.base_url)
-        else:
-            raise StatusError(resp=resp)
+        def decode(resp):
+            return self.fleet_class(api_key=self.api_key, fleet_key=resp.get('fleet_key'), params=params,
+                base_url=self.base_url, connection=self.connection, clock=clock)
+
+        return Call("POST", endpoint, self.build_url(endpoint), payload, decode)
 
     def create_sim_fleet(
         self, max_wait="3m", max_delay="6m",
-        unlocked_window="2m", close_pickup_window="1s"
+        unlocked_window="2m", close_pickup_window="1s", clock=None
     ):
         """
         Creates a new simulation fleet.
@@ -82,6 +133,9 @@ class Pyrai(object):
             max_delay (str, optional): The max delay time. Defaults to "6m".
             unlocked_window (str, optional): The unlocked window time. Defaults to "2m".
             close_pickup_window (str, optional): The close pickup window time. Defaults to "1s".
+            clock (WallClock, optional): The clock giving the time of the fleet's calls
+                made without one, e.g. a VirtualClock to simulate faster than real
+                time. If None, a WallClock. Defaults to None.
 
         Returns:
             Fleet: The newly created fleet, if successful.
@@ -96,11 +150,12 @@ class Pyrai(object):
             max_delay=max_delay,
             unlocked_window=unlocked_window,
             close_pickup_window=close_pickup_window,
+            clock=clock,
         )
     
     def create_live_fleet(
         self, max_wait="3m", max_delay="6m",
-        unlocked_window="2m", close_pickup_window="1s"
+        unlocked_window="2m", close_pickup_window="1s", clock=None
     ):        
         """
         Creates a new live fleet.
@@ -110,6 +165,8 @@ class Pyrai(object):
             max_delay (str, optional): The max delay time. Defaults to "6m".
             unlocked_window (str, optional): The unlocked window time. Defaults to "2m".
             close_pickup_window (str, optional): The close pickup window time. Defaults to "1s".
+            clock (WallClock, optional): The clock giving the time of the fleet's calls
+                made without one. If None, a WallClock. Defaults to None.
 
         Returns:
             Fleet: The newly created fleet, if successful.
@@ -124,4 +181,54 @@ class Pyrai(object):
             max_delay=max_delay,
             unlocked_window=unlocked_window,
             close_pickup_window=close_pickup_window,
-        )
\ No newline at end of file
+            clock=clock,
+        )
+
+    def get_metrics(self, fleets, metrics=None, start_time=None, end_time=None):
+        """
+        Gets the time series metrics of many fleets, e.g. every fleet of a
+        parameter sweep, in a single API call.
+
+        Args:
+            fleets (list[Fleet]): The fleets.
+            metrics (list[Metrics], optional): The metrics to query, besides Metrics.TIME.
+                If None, all metrics are queried. Defaults to None.
+            start_time (datetime.datetime or str, optional): The start time. Set to the
+                earliest creation time of the fleets if not set. Defaults to None.
+            end_time (datetime.datetime or str, optional): The end time. Set to the latest
+                API call time of the fleets if not set. Defaults to None.
+
+        Returns:
+            dict[str, list[dict]]: The metrics of each fleet, by fleet key, one dictionary
+                of Metrics per point, in time order.
+
+        Raises:
+            StatusError: If the API call does not return a 200 response.
+            ValueError: If a metric is not one of Metrics.FIELDS.
+        """
+        if not fleets:
+            return {}
+
+        return self.connection.send(self._get_metrics_call, fleets, metrics, start_time, end_time)
+
+    def _get_metrics_call(self, fleets, metrics=None, start_time=None, end_time=None):
+        if start_time is None:
+            start_time = min(fleet.start_time for fleet in fleets)
+
+        if end_time is None:
+            end_time = max(fleet.end_time for fleet in fleets)
+
+        if isinstance(start_time, str):
+            start_time = from_rfc3339(start_time)
+
+        if isinstance(end_time, str):
+            end_time = from_rfc3339(end_time)
+
+        query = Metrics.query([(fleet.api_key, fleet.fleet_key) for fleet in fleets],
+            to_rfc3339(start_time), to_rfc3339(end_time), metrics)
+
+        def decode(resp):
+            data = resp['data']
+            return {fleet.fleet_key: data[Metrics.alias(i)][0]['metrics'] for i, fleet in enumerate(fleets)}
+
+        return Call("POST", Endpoints.GRAPHQL, self.build_url(Endpoints.GRAPHQL), {"query": query}, decode)
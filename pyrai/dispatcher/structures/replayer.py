@@ -0,0 +1,182 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from .bulk_error import BulkError
+from .bulk_result import BulkResult
+from .defaults import Defaults
+from .endpoints import Endpoints
+from .location import Location
+from pyrai.helpers import from_rfc3339
+
+def _location(d):
+    return Location(d['lat'], d['lng'])
+
+def _time(s):
+    return from_rfc3339(s) if s is not None else None
+
+# the fleet method replaying each endpoint, and the key of the calls whose
+# order is kept. Calls without a key wait for every call before them
+_REPLAYS = {
+    Endpoints.MAKE_VEHICLE_ONLINE: (lambda fleet, d: fleet.make_vehicle_online(
+        d['id'], _location(d['location']), d['capacity']), 'vehicle'),
+    Endpoints.MAKE_VEHICLE_OFFLINE: (lambda fleet, d: fleet.make_vehicle_offline(
+        d['id'], _location(d['location'])), 'vehicle'),
+    Endpoints.UPDATE_VEHICLE: (lambda fleet, d: fleet.update_vehicle(
+        d['id'], _location(d['location']), d['event'], d.get('direction', Defaults.DEFAULT_DIRECTION),
+        _time(d.get('event_time')), d.get('req_id')), 'vehicle'),
+    Endpoints.REMOVE_VEHICLE: (lambda fleet, d: fleet.remove_vehicle(
+        d['id'], _location(d['location'])), 'vehicle'),
+    Endpoints.GET_VEHICLE_INFO: (lambda fleet, d: fleet.get_vehicle_info(d['id']), 'vehicle'),
+    Endpoints.ADD_REQUEST: (lambda fleet, d: fleet.add_request(
+        d['id'], _location(d['pickup']), _location(d['dropoff']), d['load'],
+        _time(d.get('request_time'))), 'request'),
+    Endpoints.CANCEL_REQUEST: (lambda fleet, d: fleet.cancel_request(
+        d['id'], _time(d.get('event_time'))), 'request'),
+    Endpoints.GET_REQUEST: (lambda fleet, d: fleet.get_request(d['id']), 'request'),
+    Endpoints.COMPUTE_ASSIGNMENTS: (lambda fleet, d: fleet.get_assignments(
+        _time(d.get('current_time'))), None),
+    Endpoints.FORWARD_SIMULATE: (lambda fleet, d: fleet.forward_simulate(
+        d['sim_duration'], _time(d.get('current_time'))), None),
+    Endpoints.SET_PARAMS: (lambda fleet, d: fleet.set_params(**d['params']), None)
+}
+
+_READS = (Endpoints.GET_VEHICLE_INFO, Endpoints.GET_REQUEST)
+
+class Replayer(object):
+    """
+    Class used to replay a traffic log against a fleet, through the same
+    Fleet methods that made the recorded calls, e.g. against a simulation
+    fleet or a fleet of the stub dispatcher of pyrai.testing.
+
+    Calls are sent at the pace they were recorded, divided by speed, or
+    as fast as possible. Calls of different vehicles, or requests, are
+    sent concurrently, while the calls of a vehicle, or of a request,
+    are sent one after another, in log order. get_assignments,
+    forward_simulate and set_params wait for every call before them, and
+    calls after them wait for them. Calls that create fleets or query
+    metrics are skipped. Failed calls are reported instead of raised.
+
+    Attributes:
+        fleet (Fleet): The fleet the calls are replayed on.
+        speed (float): The replay speed, e.g. 10 for 10x. None to replay as
+            fast as possible.
+        max_concurrency (int): The maximum number of calls in flight.
+        fleet_key (str): If set, only the calls recorded for this fleet are replayed.
+        reads (bool): True if get_vehicle_info and get_request are replayed.
+        skipped (int): The number of entries skipped by the last run.
+        max_lag (float): The largest delay of a call behind its schedule during
+            the last run, in seconds.
+    """
+
+    def __init__(self, fleet, speed=1, max_concurrency=Defaults.MAX_CONCURRENCY,
+        fleet_key=None, reads=True):
+        """
+        Initializes a Replayer object.
+
+        Args:
+            fleet (Fleet): The fleet the calls are replayed on.
+            speed (float, optional): The replay speed, e.g. 10 for 10x. None to
+                replay as fast as possible. Defaults to 1.
+            max_concurrency (int, optional): The maximum number of calls in flight.
+                This should not exceed the pool size of the fleet's connection.
+                Defaults to Defaults.MAX_CONCURRENCY.
+            fleet_key (str, optional): If set, only the calls recorded for this fleet
+                are replayed. Defaults to None.
+            reads (bool, optional): Replay get_vehicle_info and get_request.
+                Defaults to True.
+        """
+        self.fleet = fleet
+        self.speed = speed
+        self.max_concurrency = max_concurrency
+        self.fleet_key = fleet_key
+        self.reads = reads
+        self.skipped = 0
+        self.max_lag = 0.0
+
+    def run(self, entries):
+        """
+        Replays entries, and returns once every call has completed.
+
+        Args:
+            entries (iterable[dict]): The entries, e.g. a TrafficLog.
+
+        Returns:
+            BulkResult: The number of calls replayed, the failed calls, with the
+                index of their entry, and the elapsed time.
+        """
+        self.skipped = 0
+        self.max_lag = 0.0
+        errors = []
+        latest = {}
+        lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.max_concurrency * 2)
+        count = 0
+        origin = None
+        start = time.perf_counter()
+
+        def send(index, entry, replay, previous=None):
+            if previous is not None:
+                wait([previous])
+            try:
+                replay(self.fleet, entry['payload'])
+            except Exception as e:
+                with lock:
+                    errors.append(BulkError(index, entry, e))
+
+        def release(key, future):
+            slots.release()
+            with lock:
+                if latest.get(key) is future:
+                    del latest[key]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for index, entry in enumerate(entries):
+                replay, kind = self._replay_of(entry)
+                if replay is None:
+                    continue
+
+                if origin is None:
+                    origin = entry['time']
+                self._pace(start, entry['time'] - origin)
+                count += 1
+
+                if kind is None:
+                    with lock:
+                        pending = list(latest.values())
+                    wait(pending)
+                    send(index, entry, replay)
+                    continue
+
+                key = (kind, entry['payload']['id'])
+                slots.acquire()
+                with lock:
+                    future = executor.submit(send, index, entry, replay, latest.get(key))
+                    latest[key] = future
+                future.add_done_callback(lambda f, key=key: release(key, f))
+
+        return BulkResult(count, errors, time.perf_counter() - start)
+
+    def _replay_of(self, entry):
+        # the fleet method replaying entry and its ordering key kind, or
+        # (None, None) if the entry is skipped
+        endpoint = entry.get('endpoint')
+        if endpoint not in _REPLAYS or (not self.reads and endpoint in _READS) \
+            or (self.fleet_key is not None and entry.get('fleet_key') != self.fleet_key):
+            self.skipped += 1
+            return None, None
+        return _REPLAYS[endpoint]
+
+    def _delay(self, start, offset):
+        # the seconds until the call recorded offset seconds after the first one is due
+        if not self.speed:
+            return 0
+        delay = start + offset / self.speed - time.perf_counter()
+        if delay <= 0:
+            self.max_lag = max(self.max_lag, -delay)
+        return delay
+
+    def _pace(self, start, offset):
+        # waits until the call recorded offset seconds after the first one is due
+        delay = self._delay(start, offset)
+        if delay > 0:
+            time.sleep(delay)
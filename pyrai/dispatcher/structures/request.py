@@ -1,7 +1,6 @@
 import datetime
-from pyrai.helpers import to_rfc3339
+from pyrai.helpers import to_rfc3339, from_rfc3339
 from pyrai.dispatcher.structures.location import Location
-from dateutil.parser import isoparse
 
 class Request(object):
     """
@@ -18,6 +17,9 @@ class Request(object):
         load (int): The load (number of passengers) in this request.
         assigned (boolean): True if assigned, false if not.
     """
+
+    __slots__ = ('fleet', 'pickup', 'dropoff', 'request_time', 'req_id', 'veh_id', 'load', 'assigned')
+
     def __init__(self, fleet, pickup, dropoff, request_time, req_id, veh_id, load, assigned):
         """
         Initializes a new Request Object.
@@ -59,7 +61,7 @@ class Request(object):
             fleet,
             Location.fromdict(d.get('pickup')),
             Location.fromdict(d.get('dropoff')),
-            isoparse(d.get('request_time')),
+            from_rfc3339(d.get('request_time')),
             d.get('req_id'),
             d.get('veh_id'),
             d.get('load'),
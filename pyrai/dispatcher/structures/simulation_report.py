@@ -0,0 +1,81 @@
+class SimulationReport(object):
+    """
+    Class used to report the outcome of a SimulationRunner run.
+
+    Attributes:
+        steps (list[dict]): For each step, its start 'time', its 'seconds' of
+            simulated time, the 'requests' injected for it, the 'vehicles' of its
+            assignments and their 'assigned' requests made before its end, and the
+            'wall' seconds it took.
+        snapshots (list[tuple]): The (time, VehicleAssignments) at the end of the
+            kept steps. With pipeline, they may include requests of the next step.
+        metrics (list[dict]): The fleet metrics over the simulated time, if queried.
+        errors (list[BulkError]): The trips that could not be injected.
+        simulated_seconds (float): The simulated time, in seconds.
+        wall_seconds (float): The wall-clock duration of the run, in seconds.
+    """
+
+    def __init__(self, steps, snapshots, metrics, errors, simulated_seconds, wall_seconds):
+        """
+        Initializes a SimulationReport object.
+
+        Args:
+            steps (list[dict]): The steps.
+            snapshots (list[tuple]): The (time, VehicleAssignments) of the kept steps.
+            metrics (list[dict]): The fleet metrics, or None.
+            errors (list[BulkError]): The trips that could not be injected.
+            simulated_seconds (float): The simulated time, in seconds.
+            wall_seconds (float): The wall-clock duration of the run, in seconds.
+        """
+        self.steps = steps
+        self.snapshots = snapshots
+        self.metrics = metrics
+        self.errors = errors
+        self.simulated_seconds = simulated_seconds
+        self.wall_seconds = wall_seconds
+
+    @property
+    def requests(self):
+        """
+        int: The number of requests injected.
+        """
+        return sum(step['requests'] for step in self.steps)
+
+    @property
+    def speedup(self):
+        """
+        float: The simulated time per wall-clock time, e.g. 60 for a simulated
+        hour per wall minute.
+        """
+        if self.wall_seconds > 0:
+            return self.simulated_seconds / self.wall_seconds
+        return 0.0
+
+    @property
+    def sim_hours_per_wall_minute(self):
+        """
+        float: The simulated hours per wall-clock minute.
+        """
+        return self.speedup / 60
+
+    def todict(self):
+        """
+        Converts a SimulationReport object to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self, without snapshots and metrics.
+        """
+        return {
+            'steps': len(self.steps),
+            'requests': self.requests,
+            'failed': len(self.errors),
+            'simulated_seconds': self.simulated_seconds,
+            'wall_seconds': self.wall_seconds,
+            'sim_hours_per_wall_minute': self.sim_hours_per_wall_minute
+        }
+
+    def __str__(self):
+        return str(self.todict())
+
+    def __repr__(self):
+        return str(self.todict())
@@ -0,0 +1,246 @@
+import collections
+import datetime
+import itertools
+import numbers
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pytimeparse.timeparse import timeparse
+from .defaults import Defaults
+from .simulation_report import SimulationReport
+
+class SimulationRunner(object):
+    """
+    Class used to drive a simulation fleet through a stream of trips, in
+    steps: the requests of each step are added, then the fleet is
+    forward simulated over the step. The requests of the next step are
+    added while the current step is simulated and its response decoded,
+    instead of after it, so that the network and the dispatcher are not
+    idle in between. The dispatcher may then receive some requests of the
+    next step before the forward simulation of the current one, so its
+    assignments, snapshot and on_step call may include them. The
+    'assigned' count of a step only counts the requests made before the
+    end of the step.
+
+    Steps follow a schedule, or adapt to demand: with target_requests,
+    each step spans the time of the next target_requests trips, within
+    min_step and max_step, so busy hours are simulated in short steps
+    and quiet ones in long steps.
+
+    Example:
+        runner = SimulationRunner(fleet, "trips.csv", start_time=start, target_requests=500)
+        report = runner.run()
+        print(report.sim_hours_per_wall_minute)
+
+    Attributes:
+        fleet (Fleet): The simulation fleet.
+        start_time (datetime.datetime): The start of the simulation. If None, the
+            request time of the first trip, or the time of the fleet's clock.
+        end_time (datetime.datetime): The end of the simulation. If None, the
+            simulation ends with the step of the last trip.
+        step (float or str or iterable): The seconds, or duration string, of every
+            step, or a schedule of them, whose last step is repeated.
+        target_requests (int): If set, the number of requests each step is sized for.
+        min_step (float): The shortest adaptive step, in seconds.
+        max_step (float): The longest adaptive step, in seconds.
+        pipeline (bool): True if the next requests are added during each step.
+        snapshot_every (int): Keep the assignments of one step out of snapshot_every.
+            None to keep none.
+        metrics (bool): True if the fleet metrics are queried after the run.
+        max_in_flight (int): The maximum number of requests added concurrently.
+        on_step (function): Called with the step dict and its assignments after
+            each step.
+    """
+
+    def __init__(self, fleet, trips, start_time=None, end_time=None, step=Defaults.SIMULATION_STEP,
+        target_requests=None, min_step=Defaults.SIMULATION_MIN_STEP, max_step=Defaults.SIMULATION_MAX_STEP,
+        pipeline=True, snapshot_every=1, metrics=False, max_in_flight=Defaults.MAX_CONCURRENCY, on_step=None):
+        """
+        Initializes a SimulationRunner object.
+
+        Args:
+            fleet (Fleet): The simulation fleet.
+            trips (iterable or str): The trips, sorted by request time, in any format
+                accepted by Fleet.add_requests: an iterable of trip dicts, or the path
+                of a .csv or .jsonl file. Trips without a request time are requested
+                at the start of their step.
+            start_time (datetime.datetime, optional): The start of the simulation. If
+                None, the request time of the first trip, or the time of the fleet's
+                clock if it has none. Defaults to None.
+            end_time (datetime.datetime, optional): The end of the simulation. If None,
+                the simulation ends with the step of the last trip. Defaults to None.
+            step (float or str or iterable, optional): The seconds, or duration string
+                such as "5m", of every step, or a schedule of them, whose last step is
+                repeated. Ignored if target_requests is set. Defaults to
+                Defaults.SIMULATION_STEP.
+            target_requests (int, optional): Size each step for this many requests.
+                Defaults to None.
+            min_step (float, optional): The shortest adaptive step, in seconds.
+                Defaults to Defaults.SIMULATION_MIN_STEP.
+            max_step (float, optional): The longest adaptive step, in seconds.
+                Defaults to Defaults.SIMULATION_MAX_STEP.
+            pipeline (bool, optional): Add the next requests during each step. If
+                False, they are added after it. Defaults to True.
+            snapshot_every (int, optional): Keep the assignments of one step out of
+                snapshot_every. None to keep none. Defaults to 1.
+            metrics (bool, optional): Query the fleet metrics after the run.
+                Defaults to False.
+            max_in_flight (int, optional): The maximum number of requests added
+                concurrently. Defaults to Defaults.MAX_CONCURRENCY.
+            on_step (function, optional): Called with the step dict and its
+                assignments after each step. Defaults to None.
+        """
+        self.fleet = fleet
+        self.trips = trips
+        self.start_time = start_time
+        self.end_time = end_time
+        self.step = step
+        self.target_requests = target_requests
+        self.min_step = min_step
+        self.max_step = max_step
+        self.pipeline = pipeline
+        self.snapshot_every = snapshot_every
+        self.metrics = metrics
+        self.max_in_flight = max_in_flight
+        self.on_step = on_step
+
+    def run(self):
+        """
+        Runs the simulation.
+
+        Returns:
+            SimulationReport: The steps, snapshots, metrics and injection errors, and
+                the simulated hours per wall-clock minute.
+
+        Raises:
+            StatusError: If a forward simulation, or the metrics query, fails.
+            ValueError: If the step schedule is empty.
+        """
+        from pyrai.dispatcher.methods.fleet.add_requests import read_trips, trip_kwargs
+
+        self._source = (trip_kwargs(trip) for trip in read_trips(self.trips))
+        self._ahead = collections.deque()
+        self._exhausted = False
+        self._schedule = self._steps()
+        self._errors = []
+
+        current_time = self.start_time
+        if current_time is None:
+            if self._peek(1) and self._ahead[0]['request_time'] is not None:
+                current_time = self._ahead[0]['request_time']
+            else:
+                current_time = self.fleet.clock.now()
+
+        steps, snapshots = [], []
+        wall_start = time.perf_counter()
+        step = self._next_step(current_time)
+        requests = self._inject(current_time, step)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                if step <= 0:
+                    break
+
+                step_start = time.perf_counter()
+                forward = executor.submit(self.fleet.forward_simulate, "{}s".format(step), current_time)
+
+                next_time = current_time + datetime.timedelta(seconds=step)
+                next_step = self._next_step(next_time)
+                if self.pipeline:
+                    next_requests = self._inject(next_time, next_step)
+                    assignments = forward.result()
+                else:
+                    assignments = forward.result()
+                    next_requests = self._inject(next_time, next_step)
+
+                # leaves out the requests of the next step added during the simulation
+                step_end = _utc(next_time)
+                record = {
+                    'time': current_time,
+                    'seconds': step,
+                    'requests': requests,
+                    'vehicles': len(assignments.vehs),
+                    'assigned': sum(1 for r in assignments.requests
+                        if r.assigned and _utc(r.request_time) < step_end),
+                    'wall': time.perf_counter() - step_start
+                }
+                steps.append(record)
+                if self.snapshot_every and (len(steps) - 1) % self.snapshot_every == 0:
+                    snapshots.append((next_time, assignments))
+                if self.on_step is not None:
+                    self.on_step(record, assignments)
+
+                current_time, step, requests = next_time, next_step, next_requests
+                if self.end_time is None and requests == 0 and self._exhausted and not self._ahead:
+                    break
+
+        wall_seconds = time.perf_counter() - wall_start
+        simulated_seconds = sum(s['seconds'] for s in steps)
+
+        metrics = None
+        if self.metrics and steps:
+            metrics = self.fleet.get_metrics(steps[0]['time'], current_time)
+
+        return SimulationReport(steps, snapshots, metrics, self._errors, simulated_seconds, wall_seconds)
+
+    def _steps(self):
+        # the step schedule, in seconds, repeating its last step
+        step = self.step
+        if isinstance(step, (numbers.Number, str)):
+            step = [step]
+
+        last = None
+        for s in step:
+            last = timeparse(s) if isinstance(s, str) else s
+            yield last
+        if last is None:
+            raise ValueError("The step schedule is empty")
+        for s in itertools.repeat(last):
+            yield s
+
+    def _next_step(self, start):
+        # the length of the step starting at start, in seconds, up to end_time
+        if self.target_requests is None:
+            step = next(self._schedule)
+        elif self._peek(self.target_requests) < self.target_requests:
+            step = self.max_step
+        else:
+            last = self._ahead[self.target_requests - 1]['request_time']
+            # up to the second of the last of them, included
+            span = (last - start).total_seconds() + 1 if last is not None else 0
+            step = max(self.min_step, min(self.max_step, span))
+
+        if self.end_time is not None:
+            step = min(step, (self.end_time - start).total_seconds())
+        return int(step)
+
+    def _peek(self, n):
+        # reads trips ahead until n are buffered, and returns how many are
+        while len(self._ahead) < n and not self._exhausted:
+            trip = next(self._source, None)
+            if trip is None:
+                self._exhausted = True
+            else:
+                self._ahead.append(trip)
+        return len(self._ahead)
+
+    def _inject(self, start, step):
+        # adds the requests of the trips due before start + step
+        end = start + datetime.timedelta(seconds=step)
+        window = []
+        while self._peek(1):
+            trip = self._ahead[0]
+            if trip['request_time'] is not None and trip['request_time'] >= end:
+                break
+            self._ahead.popleft()
+            if trip['request_time'] is None:
+                trip['request_time'] = start
+            window.append(trip)
+
+        if window:
+            result = self.fleet.add_requests(window, self.max_in_flight)
+            self._errors.extend(result.errors)
+        return len(window)
+
+def _utc(time):
+    # naive times are local, as in to_rfc3339
+    return time.astimezone(datetime.timezone.utc)
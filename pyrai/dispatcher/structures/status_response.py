@@ -24,6 +24,19 @@ class StatusResponse(object):
             self.status = status
             self.error = error
 
+    @staticmethod
+    def fromdict(d):
+        """
+        Converts a python dictionary to a StatusResponse object.
+
+        Args:
+            d (dict): The dictionary to convert.
+
+        Returns:
+            StatusResponse: A StatusResponse with the attributes set by the values in d.
+        """
+        return StatusResponse(resp=d)
+
     def todict(self):
         """
         Converts StatusResponse object to a python dictionary.
@@ -0,0 +1,154 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+class Tracer(object):
+    """
+    Class used to timestamp the phases of API calls, and write them as
+    Chrome trace-event JSON, readable in chrome://tracing or Perfetto.
+    Each call is a span named after its endpoint, made of the phases:
+
+        build: building the payload, e.g. Location.todict and to_rfc3339.
+        encode: encoding the payload to JSON.
+        network: sending the request and waiting for the whole response.
+        decode: decoding the JSON response.
+        model: building the returned objects, e.g. Vehicle.fromdict.
+
+    Streamed calls record network, decode and model phases per chunk,
+    except on an AsyncConnection, where only the phases until the
+    response headers are recorded. Calls answered by a LocalConnection
+    have a simulate phase instead of encode, network and decode. Spans
+    of the caller's own code, e.g. a whole dispatch tick, can be added
+    with span. Calls sent from different threads, or asyncio tasks, are
+    shown on different rows.
+
+    Attributes:
+        events (list[dict]): The recorded trace events.
+    """
+
+    def __init__(self):
+        """
+        Initializes a Tracer object without events.
+        """
+        self.events = []
+        self._totals = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end, category="phase", tid=None, args=None):
+        """
+        Records a complete event.
+
+        Args:
+            name (str): The name of the event.
+            start (float): The start of the event, from time.perf_counter.
+            end (float): The end of the event, from time.perf_counter.
+            category (str, optional): The category of the event. Defaults to "phase".
+            tid (int, optional): The row of the event. If None, the current thread.
+                Defaults to None.
+            args (dict, optional): Values shown with the event. Defaults to None.
+        """
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': "X",
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': self._pid,
+            'tid': tid if tid is not None else threading.get_ident()
+        }
+        if args:
+            event['args'] = args
+
+        with self._lock:
+            self.events.append(event)
+
+    def record_call(self, call, start, end, phases, status_code=None, error=None, tid=None):
+        """
+        Records a call and its phases.
+
+        Args:
+            call (Call): The call, or None if it could not be built.
+            start (float): The start of the call, from time.perf_counter.
+            end (float): The end of the call, from time.perf_counter.
+            phases (list[tuple]): The (name, start, end) of each phase.
+            status_code (int, optional): The HTTP status code. Defaults to None.
+            error (Exception, optional): The error raised by the call. Defaults to None.
+            tid (int, optional): The row of the events. If None, the current thread.
+                Defaults to None.
+        """
+        endpoint = call.endpoint if call is not None else "call"
+        args = {'status_code': status_code}
+        if call is not None:
+            args['method'] = call.method
+            if call.fleet_key:
+                args['fleet_key'] = call.fleet_key
+        if error is not None:
+            args['error'] = "{}: {}".format(type(error).__name__, error)
+
+        self.record(endpoint, start, end, "call", tid, args)
+        for name, phase_start, phase_end in phases:
+            self.record(name, phase_start, phase_end, "phase", tid)
+
+        with self._lock:
+            totals = self._totals.setdefault(endpoint, {})
+            totals['total'] = totals.get('total', 0) + end - start
+            for name, phase_start, phase_end in phases:
+                totals[name] = totals.get(name, 0) + phase_end - phase_start
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """
+        Records the time spent in a with block, e.g. a dispatch tick.
+
+        Args:
+            name (str): The name of the span.
+            **args: Values shown with the span.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), "span", args=args)
+
+    def summary(self):
+        """
+        Sums the time spent in each phase, by endpoint.
+
+        Returns:
+            dict[str, dict[str, float]]: The seconds spent in each phase, and in
+                whole calls under 'total', by endpoint.
+        """
+        with self._lock:
+            return {endpoint: dict(totals) for endpoint, totals in self._totals.items()}
+
+    def todict(self):
+        """
+        Converts the Tracer object to a python dictionary.
+
+        Returns:
+            dict: The trace, in the Chrome trace-event format.
+        """
+        with self._lock:
+            return {'traceEvents': list(self.events), 'displayTimeUnit': "ms"}
+
+    def dump(self, path):
+        """
+        Writes the trace to a file, in the Chrome trace-event format.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.todict(), f)
+
+    def clear(self):
+        """
+        Forgets every recorded event.
+        """
+        with self._lock:
+            self.events = []
+            self._totals = {}
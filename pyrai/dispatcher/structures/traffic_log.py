@@ -0,0 +1,72 @@
+import mmap
+from .json_codec import JSONCodec
+from .traffic_recorder import TrafficRecorder
+
+class TrafficLog(object):
+    """
+    Class used to read a traffic log written by a TrafficRecorder. The
+    file is memory-mapped, and entries are decoded one by one as they
+    are iterated, so logs larger than memory can be replayed.
+
+    Attributes:
+        path (str): The path of the log.
+    """
+
+    def __init__(self, path, codec=None):
+        """
+        Opens a log for reading.
+
+        Args:
+            path (str): The path of the log.
+            codec (JSONCodec, optional): The codec decoding entries. If None,
+                JSONCodec.default() is used. Defaults to None.
+
+        Raises:
+            ValueError: If the file is not a traffic log.
+        """
+        self.path = path
+        self._codec = codec if codec is not None else JSONCodec.default()
+        self._file = open(path, "rb")
+        self._map = None
+
+        header = TrafficRecorder.HEADER
+        if self._file.read(len(header)) != header:
+            self._file.close()
+            raise ValueError("{} is not a traffic log".format(path))
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __iter__(self):
+        """
+        Decodes the entries, in the order they were written. Entries appended
+        after the log was opened are not read.
+
+        Returns:
+            iterator[dict]: The entries.
+        """
+        frame = TrafficRecorder.FRAME
+        data = self._map
+        offset, size = len(TrafficRecorder.HEADER), len(data)
+
+        while offset + frame.size <= size:
+            length, = frame.unpack_from(data, offset)
+            start = offset + frame.size
+            if start + length > size:
+                # the last frame was cut short while being written
+                break
+            yield self._codec.loads(data[start:start + length])
+            offset = start + length
+
+    def close(self):
+        """
+        Unmaps and closes the log.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
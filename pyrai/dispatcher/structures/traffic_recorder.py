@@ -0,0 +1,131 @@
+import os
+import re
+import struct
+import threading
+from .json_codec import JSONCodec
+
+class TrafficRecorder(object):
+    """
+    Class used to append the API calls seen by an Instrumentation to a
+    traffic log, to be read with TrafficLog and replayed with
+    Fleet.replay. It is an Instrumentation hook:
+
+        recorder = TrafficRecorder("day.log")
+        rai = Pyrai(api_key=API_KEY, instrumentation=Instrumentation(hooks=[recorder]))
+
+    The log starts with a header line, followed by one frame per call: a
+    4-byte little-endian length and the JSON entry of the call, with its
+    wall-clock time, endpoint, method, fleet_key, payload, status_code,
+    latency in seconds, and optionally its response. Keys are removed
+    from payloads, and blanked in the text of GraphQL queries, so logs
+    can be shared. Frames are only appended, and
+    a frame cut short by a crash is ignored when reading.
+
+    Attributes:
+        path (str): The path of the log.
+        responses (bool): True if responses are written.
+        count (int): The number of calls written by this recorder.
+    """
+
+    HEADER = b"PYRAI-TRAFFIC 1\n"
+    FRAME = struct.Struct("<I")
+
+    def __init__(self, path, responses=False, codec=None):
+        """
+        Opens a log for appending, creating it if needed.
+
+        Args:
+            path (str): The path of the log.
+            responses (bool, optional): Also write the response of each call,
+                which makes logs much larger. Defaults to False.
+            codec (JSONCodec, optional): The codec encoding entries. If None,
+                JSONCodec.default() is used. Defaults to None.
+
+        Raises:
+            ValueError: If the file exists and is not a traffic log.
+        """
+        self.path = path
+        self.responses = responses
+        self.count = 0
+        self._codec = codec if codec is not None else JSONCodec.default()
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+
+        if self._file.tell() == 0:
+            self._file.write(self.HEADER)
+        else:
+            with open(path, "rb") as f:
+                if f.read(len(self.HEADER)) != self.HEADER:
+                    self._file.close()
+                    raise ValueError("{} is not a traffic log".format(path))
+
+    def __call__(self, record):
+        """
+        Appends a call to the log.
+
+        Args:
+            record (CallRecord): The call, as passed to Instrumentation hooks.
+        """
+        entry = {
+            'time': record.time,
+            'endpoint': record.endpoint,
+            'method': record.method,
+            'fleet_key': record.fleet_key,
+            'payload': _without_keys(record.payload),
+            'status_code': record.status_code,
+            'seconds': record.seconds
+        }
+        if self.responses:
+            entry['response'] = record.response
+        self.write(entry)
+
+    def write(self, entry):
+        """
+        Appends an entry to the log.
+
+        Args:
+            entry (dict): The entry, with at least 'time', 'endpoint' and 'payload'.
+        """
+        data = self._codec.dumps(entry)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        with self._lock:
+            self._file.write(self.FRAME.pack(len(data)))
+            self._file.write(data)
+            self.count += 1
+
+    def flush(self):
+        """
+        Writes the buffered entries to disk.
+        """
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """
+        Flushes and closes the log.
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_QUERY_KEYS = re.compile(r'\b(api_key|fleet_key)(\s*:\s*)"[^"]*"')
+
+def _without_keys(payload):
+    if not isinstance(payload, dict):
+        return payload
+    payload = {k: v for k, v in payload.items() if k not in ('user_key', 'api_key', 'fleet_key')}
+
+    # metrics queries carry the keys in their text
+    query = payload.get('query')
+    if isinstance(query, str):
+        payload['query'] = _QUERY_KEYS.sub(r'\1\2""', query)
+    return payload
@@ -0,0 +1,251 @@
+import threading
+import time
+from collections import OrderedDict
+from .bulk_error import BulkError
+from .bulk_result import BulkResult
+from .defaults import Defaults
+from .vehicle_event import VehicleEvent
+from pyrai.dispatcher.methods.fleet.update_vehicle import update_vehicle_call
+
+class UpdateBuffer(object):
+    """
+    Class used to coalesce vehicle location updates before they are sent.
+    Location-only updates (VehicleEvent.PROGRESS and VehicleEvent.UNASSIGNED)
+    are held, and a newer one for the same vehicle replaces the held one.
+    Held updates are sent together every window seconds, and whenever the
+    fleet computes assignments. Pickup and dropoff updates are sent
+    immediately, after the held update of the same vehicle. Held updates
+    keep the time they were received at, not the time they are sent at.
+    The updates of a vehicle are sent in the order they were received: a
+    send waits for the sends of the same vehicle still in flight, but not
+    for those of other vehicles.
+
+    Attributes:
+        fleet (Fleet): The fleet whose updates are buffered.
+        window (float): Seconds between automatic flushes. None if the buffer
+            is only flushed by the fleet or by calling flush.
+        max_concurrency (int): The maximum number of updates in flight during a flush.
+        received (int): The number of updates received.
+        coalesced (int): The number of updates replaced by a newer update,
+            i.e. the number of API calls saved.
+        sent (int): The number of updates sent successfully to the API.
+        failed (int): The number of updates the API rejected, or that could not be sent.
+        passed_through (int): The number of pickup and dropoff updates sent immediately.
+        last_result (BulkResult): The result of the latest flush, or of the latest
+            held update sent before a pickup or dropoff. None before either.
+    """
+    LOCATION_EVENTS = (VehicleEvent.PROGRESS, VehicleEvent.UNASSIGNED)
+    # set when a send finishes, threading.Event or asyncio.Event
+    _Event = threading.Event
+
+    def __init__(self, fleet, window=Defaults.UPDATE_BUFFER_WINDOW, max_concurrency=Defaults.MAX_CONCURRENCY):
+        """
+        Initializes an UpdateBuffer object, and starts flushing it every window seconds.
+
+        Args:
+            fleet (Fleet): The fleet whose updates are buffered.
+            window (float, optional): Seconds between automatic flushes. If None,
+                updates are only flushed by the fleet or by calling flush.
+                Defaults to Defaults.UPDATE_BUFFER_WINDOW.
+            max_concurrency (int, optional): The maximum number of updates in flight
+                during a flush. Defaults to Defaults.MAX_CONCURRENCY.
+        """
+        self.fleet = fleet
+        self.window = window
+        self.max_concurrency = max_concurrency
+        self.received = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.failed = 0
+        self.passed_through = 0
+        self.last_result = None
+
+        self._pending = OrderedDict()
+        # the latest send of each vehicle still in flight
+        self._in_flight = {}
+        self._pending_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        if window is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.window):
+            self.flush()
+
+    def add(self, update):
+        """
+        Buffers or sends an update. Location updates without an event_time are
+        timestamped with the time of the fleet's clock before they are held.
+
+        A held update of the same vehicle is sent before a pickup or dropoff
+        update. If it fails, its failure is reported in last_result instead of
+        being raised, and the pickup or dropoff update is still sent.
+
+        Args:
+            update (dict): The keyword arguments of Fleet.update_vehicle.
+
+        Returns:
+            Vehicle: The updated vehicle, for pickup and dropoff updates.
+                None for buffered location updates.
+
+        Raises:
+            StatusError: If a pickup or dropoff update is unsuccessful.
+        """
+        if self._hold(update):
+            return None
+
+        held, previous, sending = self._take(update.get('vid'))
+        try:
+            for done in previous:
+                done.wait()
+
+            if held is not None:
+                start = time.perf_counter()
+                try:
+                    result, error = self.fleet.connection.send(update_vehicle_call, self.fleet, **held), None
+                except Exception as e:
+                    result, error = None, e
+                self._held_sent(held, start, result, error)
+
+            try:
+                vehicle = self.fleet.connection.send(update_vehicle_call, self.fleet, **update)
+            except Exception:
+                self._count(0, 1)
+                raise
+            self._count(1, 0, passed_through=True)
+            return vehicle
+        finally:
+            self._release(sending)
+
+    def flush(self):
+        """
+        Sends all held updates.
+
+        Returns:
+            BulkResult: The result of sending the held updates, None if
+                no update was held.
+        """
+        updates, previous, sending = self._take_all()
+        try:
+            if not updates:
+                return None
+
+            for done in previous:
+                done.wait()
+            return self._flushed(self.fleet.update_vehicles(updates, max_concurrency=self.max_concurrency))
+        finally:
+            self._release(sending)
+
+    def _hold(self, update):
+        # holds a location update, returns False for the updates sent immediately
+        if update.get('event') not in self.LOCATION_EVENTS:
+            return False
+        if update.get('event_time') is None:
+            update = dict(update, event_time=self.fleet.clock.now())
+
+        vid = update.get('vid')
+        with self._pending_lock:
+            self.received += 1
+            if vid in self._pending:
+                self.coalesced += 1
+            self._pending[vid] = update
+        return True
+
+    def _take(self, vid):
+        """
+        Takes the held update of a vehicle, before sending one of its pickup
+        or dropoff updates.
+
+        Returns:
+            tuple: The held update, None if there is none, the set of events of
+                the sends of the same vehicle still in flight, which must be waited
+                for first, and the value to pass to _release once sent.
+        """
+        with self._pending_lock:
+            self.received += 1
+            held = self._pending.pop(vid, None)
+            previous, sending = self._sending([vid])
+        return held, previous, sending
+
+    def _take_all(self):
+        """
+        Takes every held update, before flushing them.
+
+        Returns:
+            tuple: The list of held updates, and the events and value of _take.
+        """
+        with self._pending_lock:
+            updates = list(self._pending.values())
+            vids = list(self._pending)
+            self._pending.clear()
+            previous, sending = self._sending(vids)
+        return updates, previous, sending
+
+    def _sending(self, vids):
+        # called with _pending_lock held
+        done = self._Event()
+        previous = {self._in_flight[v] for v in vids if v in self._in_flight}
+        for v in vids:
+            self._in_flight[v] = done
+        return previous, (vids, done)
+
+    def _release(self, sending):
+        vids, done = sending
+        done.set()
+        with self._pending_lock:
+            for v in vids:
+                if self._in_flight.get(v) is done:
+                    del self._in_flight[v]
+
+    def _held_sent(self, held, start, result, error):
+        errors = [BulkError(0, held, error)] if error is not None else []
+        self._count(1 - len(errors), len(errors))
+        self.last_result = BulkResult(1, errors, time.perf_counter() - start, [result])
+
+    def _flushed(self, result):
+        self.last_result = result
+        self._count(result.succeeded, result.failed)
+        return result
+
+    def close(self):
+        """
+        Stops the automatic flushes and sends all held updates.
+
+        Returns:
+            BulkResult: The result of sending the held updates, None if
+                no update was held.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.flush()
+
+    def _count(self, sent, failed, passed_through=False):
+        with self._pending_lock:
+            self.sent += sent
+            self.failed += failed
+            if passed_through:
+                self.passed_through += sent
+
+    def todict(self):
+        """
+        Converts the UpdateBuffer counters to a python dictionary.
+
+        Returns:
+            dict: A dictionary representation of self.
+        """
+        return {
+            'window': self.window,
+            'received': self.received,
+            'coalesced': self.coalesced,
+            'sent': self.sent,
+            'failed': self.failed,
+            'passed_through': self.passed_through,
+            'pending': len(self._pending)
+        }
+
+    def __str__(self):
+        return str(self.todict())
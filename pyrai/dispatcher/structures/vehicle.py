@@ -16,6 +16,9 @@ class Vehicle(object):
         events (list[Event]): list of events this vehicle is assigned to.
 
     """
+
+    __slots__ = ('fleet', 'veh_id', 'location', 'assigned', 'req_ids', 'events')
+
     def __init__(self, fleet, veh_id, location, assigned, req_ids, events):
         """
         Initializes a vehicle object
@@ -36,8 +39,8 @@ class Vehicle(object):
         self.req_ids = req_ids
         self.events = events
     
-    @staticmethod
-    def fromdict(fleet, d):
+    @classmethod
+    def fromdict(cls, fleet, d):
         """
         Converts a python dictionary into a Vehicle object.
 
@@ -49,7 +52,7 @@ class Vehicle(object):
             Vehicle: A vehicle object with the parameters the dictionary specifes.
         """
 
-        return Vehicle(
+        return cls(
             fleet,
             d.get('veh_id'),
             Location.fromdict(d.get('location')),
@@ -129,6 +132,8 @@ class Vehicle(object):
         event_time=None):
         """
         Updates the vehicle. Note that this mutates the vehicle, so nothing is returned.
+        If the update is held by the fleet's update buffer, only the location is
+        updated until the buffer is flushed.
 
         Args:
             location (Location, optional): The vehicle location, set to self.location
@@ -141,7 +146,7 @@ class Vehicle(object):
                 progress should be set when the vehicle is moving to service a request, 
                 either picking up or dropping off. The vehicle should be marked as 
                 unassigned when it is is not assigned to any requests.
-            event_time (datetime.datetime, optional): Time at which the vehicle update has occurred. Set to datetime.datetime.now() if not provided. Defaults to None.
+            event_time (datetime.datetime, optional): Time at which the vehicle update has occurred. Set to the time of the fleet's clock if not provided. Defaults to None.
             req_id (int, optional): The unique ID of request the vehicle is servicing. 
                 If the vehicle is unassigned, this may be omitted. Defaults to None.
 
@@ -164,6 +169,10 @@ class Vehicle(object):
             event=event
         )
 
+        if updated_veh is None:
+            self.location = location
+            return
+
         self.location = updated_veh.location
         self.assigned = updated_veh.assigned
         self.req_ids = updated_veh.req_ids
@@ -1,3 +1,6 @@
+from .request import Request
+from .notification import Notification
+
 class VehicleAssignments(object):
     """
     Class used to represent Vehicle Assignments.
@@ -22,6 +25,25 @@ class VehicleAssignments(object):
         self.requests = requests
         self.notifications = notifications
 
+    @staticmethod
+    def fromdict(fleet, d):
+        """
+        Converts a get_assignments or forward_simulate response into a
+        VehicleAssignments object.
+
+        Args:
+            fleet (Fleet): The fleet the vehicles and requests are part of.
+            d (dict): The response, with 'vehs', 'reqs' and 'notifications' fields.
+
+        Returns:
+            VehicleAssignments: The assignments described by d.
+        """
+        return VehicleAssignments(
+            vehs=[fleet.vehicle_class.fromdict(fleet, veh) for veh in d.get('vehs')],
+            requests=[Request.fromdict(fleet, req) for req in d.get('reqs')],
+            notifications=[Notification.fromdict(notif) for notif in d.get('notifications')],
+        )
+
     def todict(self):
         """
         Converts VehicleAssignments object to python dictionary.
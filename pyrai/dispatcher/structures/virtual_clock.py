@@ -0,0 +1,84 @@
+import datetime
+import threading
+from pytimeparse.timeparse import timeparse
+
+class VirtualClock(object):
+    """
+    Class used to give a fleet a simulated time, independent of the wall
+    clock. The time only moves when it is set or advanced, or when a call
+    of the fleet moves it forward: forward_simulate advances it to the end
+    of the simulation, and get_assignments to its current time. A loop of
+    fleet.forward_simulate("5m") thus simulates consecutive periods as
+    fast as the dispatcher computes them, with consistent timestamps.
+
+    Example:
+        fleet = rai.create_sim_fleet(clock=VirtualClock(datetime.datetime(2020, 7, 1, 8)))
+
+    Attributes:
+        time (datetime.datetime): The current time.
+    """
+
+    def __init__(self, time=None):
+        """
+        Initializes a VirtualClock object.
+
+        Args:
+            time (datetime.datetime, optional): The start time. If None, the current
+                wall-clock time. Defaults to None.
+        """
+        self.time = _local(time) if time is not None else datetime.datetime.now()
+        self._lock = threading.Lock()
+
+    def now(self):
+        """
+        Returns the current time.
+
+        Returns:
+            datetime.datetime: The naive local time of the clock.
+        """
+        return self.time
+
+    def set(self, time):
+        """
+        Sets the current time, forward or backward.
+
+        Args:
+            time (datetime.datetime): The new time.
+        """
+        with self._lock:
+            self.time = _local(time)
+
+    def advance(self, duration):
+        """
+        Moves the current time forward.
+
+        Args:
+            duration (datetime.timedelta or float or str): The duration, as a
+                timedelta, in seconds, or as a string such as "5m".
+        """
+        if isinstance(duration, str):
+            duration = timeparse(duration)
+        if not isinstance(duration, datetime.timedelta):
+            duration = datetime.timedelta(seconds=duration)
+
+        with self._lock:
+            self.time += duration
+
+    def advance_to(self, time):
+        """
+        Moves the current time forward to time, if time is later. Safe to call
+        from several threads at once.
+
+        Args:
+            time (datetime.datetime): The time.
+        """
+        time = _local(time)
+        with self._lock:
+            if time > self.time:
+                self.time = time
+
+def _local(time):
+    # fleets keep naive local times, as datetime.datetime.now() returns
+    if time.tzinfo is not None:
+        return time.astimezone().replace(tzinfo=None)
+    return time
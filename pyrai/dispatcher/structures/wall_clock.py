@@ -0,0 +1,28 @@
+import datetime
+
+class WallClock(object):
+    """
+    Class used to give fleets the current wall-clock time. It is the clock
+    of fleets created without one. Fleets read the time of their calls
+    from their clock, so any object with the same now and advance_to
+    methods can be plugged in, e.g. a VirtualClock or FastForwardClock.
+    """
+
+    def now(self):
+        """
+        Returns the current time.
+
+        Returns:
+            datetime.datetime: The naive local time, as datetime.datetime.now().
+        """
+        return datetime.datetime.now()
+
+    def advance_to(self, time):
+        """
+        Called by the fleet with the time a call moved it to, e.g. the end of
+        a forward simulation. Wall-clock time cannot be moved, so this does nothing.
+
+        Args:
+            time (datetime.datetime): The time.
+        """
+        pass
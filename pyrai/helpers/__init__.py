@@ -1,3 +1,9 @@
-from .helpers import to_rfc3339, build_url
+from .helpers import to_rfc3339, from_rfc3339, memoize_rfc3339, build_url
+from .downsample import downsample, lttb, minmax
 __all__ = ["to_rfc3339",
-"build_url"]
\ No newline at end of file
+"from_rfc3339",
+"memoize_rfc3339",
+"build_url",
+"downsample",
+"lttb",
+"minmax"]
\ No newline at end of file
@@ -0,0 +1,129 @@
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Downsampling requires numpy, install it with: pip install pyrai[numpy]")
+    return numpy
+
+def lttb(x, y, max_points):
+    """
+    Selects the points of a series that best preserve its shape with the
+    Largest-Triangle-Three-Buckets algorithm. The first and last points
+    are always kept, and one point is kept per bucket of the others: the
+    one forming the largest triangle with the previous kept point and the
+    average of the next bucket.
+
+    Args:
+        x (array-like[float]): The x values, in increasing order.
+        y (array-like[float]): The y values. NaN values are never selected,
+            unless a whole bucket is NaN.
+        max_points (int): The number of points to keep, at least 3.
+
+    Returns:
+        numpy.ndarray[int]: The indices of the kept points, in increasing order.
+            All indices if there are at most max_points points.
+
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    np = _numpy()
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    # max_points - 2 buckets over the points between the first and the last,
+    # followed by a bucket holding the last point
+    edges = np.append(np.linspace(1, n - 1, max_points - 1).astype(np.int64), n)
+
+    sum_x = np.concatenate([[0.0], np.cumsum(x)])
+    sum_y = np.concatenate([[0.0], np.cumsum(np.nan_to_num(y))])
+    counts = np.concatenate([[0], np.cumsum(~np.isnan(y))])
+
+    # the average of every bucket at once, each used as the third vertex of the previous one
+    lo, hi = edges[:-1], edges[1:]
+    avg_x = (sum_x[hi] - sum_x[lo]) / (hi - lo)
+    avg_y = (sum_y[hi] - sum_y[lo]) / np.maximum(counts[hi] - counts[lo], 1)
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[i + 1]) * (ys - y[a]) - (x[a] - xs) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        selected[i + 1] = a
+
+    return selected
+
+def minmax(x, y, max_points):
+    """
+    Selects the points of a series by keeping the minimum and the maximum
+    of each of max_points / 2 equal buckets, so spikes are never lost.
+    The first and last points are always kept.
+
+    Args:
+        x (array-like[float]): The x values, in increasing order. Only their number is used.
+        y (array-like[float]): The y values.
+        max_points (int): The number of points to keep, at least 2.
+
+    Returns:
+        numpy.ndarray[int]: The indices of the kept points, in increasing order.
+            All indices if there are at most max_points points.
+
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    np = _numpy()
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if n <= max_points or max_points < 2:
+        return np.arange(n)
+
+    buckets = max(max_points // 2, 1)
+    size = -(-n // buckets)
+
+    # one row per bucket, padded so that padding is never a minimum or maximum
+    low = np.full(buckets * size, np.inf)
+    high = np.full(buckets * size, -np.inf)
+    valid = ~np.isnan(y)
+    low[:n] = np.where(valid, y, np.inf)
+    high[:n] = np.where(valid, y, -np.inf)
+
+    offsets = np.arange(buckets) * size
+    mins = offsets + np.argmin(low.reshape(buckets, size), axis=1)
+    maxs = offsets + np.argmax(high.reshape(buckets, size), axis=1)
+
+    selected = np.unique(np.concatenate([[0, n - 1], mins, maxs]))
+    return selected[selected < n]
+
+def downsample(x, y, max_points, method="lttb"):
+    """
+    Selects at most about max_points points of a series, preserving its shape.
+
+    Args:
+        x (array-like[float]): The x values, in increasing order.
+        y (array-like[float]): The y values.
+        max_points (int): The number of points to keep.
+        method (str, optional): "lttb" for Largest-Triangle-Three-Buckets, or
+            "minmax" for the minimum and maximum of each bucket. Defaults to "lttb".
+
+    Returns:
+        numpy.ndarray[int]: The indices of the kept points, in increasing order.
+
+    Raises:
+        ValueError: If method is unknown.
+        ImportError: If numpy is not installed.
+    """
+    if method == "lttb":
+        return lttb(x, y, max_points)
+    elif method == "minmax":
+        return minmax(x, y, max_points)
+    else:
+        raise ValueError("Unknown downsampling method {}, expected lttb or minmax".format(method))
@@ -1,5 +1,15 @@
 import datetime
+import re
 import urllib.parse
+from dateutil import tz
+from dateutil.parser import isoparse
+
+# the format of the times sent by the API, e.g. 2020-07-01T12:00:00.123456Z
+_RFC3339 = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d{1,9}))?Z\Z', re.ASCII)
+_UTC = (datetime.timezone.utc, tz.UTC)
+
+_memo = None
+_memo_size = 0
 
 def to_rfc3339(dt):
     """
@@ -11,17 +21,86 @@ def to_rfc3339(dt):
     Returns:
         string: An RFC3339 representation of dt.
     """
+    if dt.tzinfo in _UTC:
+        return dt.replace(tzinfo=None).isoformat() + "Z"
     return dt.astimezone(datetime.timezone.utc).isoformat()[:-6] + "Z"
 
+def from_rfc3339(s):
+    """
+    Converts an RFC3339 string sent by the API to a datetime object. Times
+    in UTC with a Z suffix are parsed directly, anything else is parsed by
+    dateutil.parser.isoparse, so the result is always the same as isoparse.
+    See memoize_rfc3339 to reuse the datetimes of repeated strings.
+
+    Args:
+        s (string): An RFC3339 string.
+
+    Returns:
+        datetime.datetime: The timezone aware datetime represented by s.
+
+    Raises:
+        ValueError: If s is not an ISO-8601 string.
+    """
+    memo = _memo
+    if memo is not None:
+        dt = memo.get(s)
+        if dt is not None:
+            return dt
+
+    dt = _parse_rfc3339(s)
+
+    if memo is not None:
+        if len(memo) >= _memo_size:
+            memo.clear()
+        memo[s] = dt
+
+    return dt
+
+def _parse_rfc3339(s):
+    m = _RFC3339.match(s)
+    if m is None:
+        return isoparse(s)
+
+    year, month, day, hour, minute, second, fraction = m.groups()
+    # isoparse keeps microseconds and truncates finer fractions
+    microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+
+    try:
+        return datetime.datetime(int(year), int(month), int(day),
+            int(hour), int(minute), int(second), microsecond, tz.UTC)
+    except ValueError:
+        # e.g. 24:00:00, which isoparse accepts
+        return isoparse(s)
+
+def memoize_rfc3339(size=4096):
+    """
+    Makes from_rfc3339 remember the datetimes of up to size strings, so
+    times repeated across a response (e.g. the current time of every
+    vehicle) are parsed once. Datetimes are immutable, so they are safely
+    shared. The memo is emptied when it is full.
+
+    Args:
+        size (int, optional): The number of strings to remember. Set to 0 or None
+            to stop memoizing. Defaults to 4096.
+    """
+    global _memo, _memo_size
+
+    if size:
+        _memo = {}
+        _memo_size = size
+    else:
+        _memo = None
+        _memo_size = 0
+
 def build_url(self, endpoint):
     """
     Builds a URL given an endpoint
 
     Args:
-        endpoint (Endpoint: str): The endpoint to build the URL for 
+        endpoint (Endpoint: str): The endpoint to build the URL for
 
     Returns:
         str: The URL to access the given API endpoint
     """
 
-    return urllib.parse.urljoin(self.base_url, endpoint)
\ No newline at end of file
+    return urllib.parse.urljoin(self.base_url, endpoint)
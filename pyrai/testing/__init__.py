@@ -0,0 +1,5 @@
+from .stub_dispatcher import StubDispatcher
+from .stub_fleet import StubFleet
+from .stub_adapter import StubAdapter
+from .stub_server import StubServer
+__all__ = ["StubDispatcher", "StubFleet", "StubAdapter", "StubServer"]
@@ -0,0 +1,35 @@
+"""
+Runs a StubDispatcher as a local HTTP server.
+
+Usage:
+    python -m pyrai.testing [--port PORT] [--vehicles N] [--latency SECONDS] [--error-rate P]
+"""
+import argparse
+from .stub_dispatcher import StubDispatcher
+from .stub_server import StubServer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--api-key", action="append", help="an accepted API key, any key if not set")
+    parser.add_argument("--vehicles", type=int, default=0, help="vehicles added to every new fleet")
+    parser.add_argument("--requests", type=int, default=0, help="requests added to every new fleet")
+    parser.add_argument("--latency", type=float, default=0, help="seconds waited before every response")
+    parser.add_argument("--error-rate", type=float, default=0, help="probability of an injected error")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    dispatcher = StubDispatcher(api_keys=args.api_key, vehicles=args.vehicles, requests=args.requests,
+        latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    server = StubServer(dispatcher, args.host, args.port)
+    print("Serving the stub dispatcher API on {}".format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import io
+import json
+import urllib.parse
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+class StubAdapter(BaseAdapter):
+    """
+    Class used to answer the calls of a requests session with a
+    StubDispatcher, in-process. The payloads and responses are still
+    encoded and decoded, so the client does the same work as over HTTP,
+    without sockets. Installed on a Connection by StubDispatcher.install.
+
+    Attributes:
+        dispatcher (StubDispatcher): The dispatcher answering the calls.
+    """
+
+    def __init__(self, dispatcher):
+        """
+        Initializes a StubAdapter object.
+
+        Args:
+            dispatcher (StubDispatcher): The dispatcher answering the calls.
+        """
+        super(StubAdapter, self).__init__()
+        self.dispatcher = dispatcher
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """
+        Answers a prepared request.
+
+        Args:
+            request (requests.PreparedRequest): The request.
+
+        Returns:
+            requests.Response: The response of the dispatcher.
+        """
+        url = urllib.parse.urlsplit(request.url)
+        if request.method == "GET":
+            payload = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+        else:
+            payload = json.loads(request.body) if request.body else None
+
+        status_code, resp = self.dispatcher.handle(request.method, url.path, payload)
+        body = json.dumps(resp).encode() if resp is not None else b""
+
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = "OK" if status_code == 200 else "Error"
+        response.headers = CaseInsensitiveDict({
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body))
+        })
+        response.raw = io.BytesIO(body)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        """
+        Does nothing, since no connections are open.
+        """
+        pass
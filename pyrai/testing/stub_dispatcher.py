@@ -0,0 +1,336 @@
+import collections
+import datetime
+import random
+import re
+import threading
+import time
+import uuid
+from pytimeparse.timeparse import timeparse
+from pyrai.dispatcher.structures.defaults import Defaults
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.dispatcher.structures.metrics import Metrics
+from pyrai.helpers import from_rfc3339
+from .stub_adapter import StubAdapter
+from .stub_fleet import StubFleet
+from .stub_server import StubServer
+
+class StubDispatcher(object):
+    """
+    Class used to stand in for the dispatcher API in tests and benchmarks,
+    without network access. It implements every route of Endpoints, with
+    responses of the same shape as the API's, and can add latency, inject
+    errors and populate new fleets with many vehicles and requests. Calls
+    reach it either in-process, through a StubAdapter installed on a
+    Connection, or over HTTP, through a StubServer.
+
+    Attributes:
+        api_keys (set[str]): The accepted API keys, None if any key is accepted.
+        vehicles (int): The number of vehicles added to every new fleet.
+        requests (int): The number of waiting requests added to every new fleet.
+        capacity (int): The capacity of the added vehicles.
+        bounds (tuple[tuple[float]]): The ((lat, lng), (lat, lng)) corners of the
+            box the locations of the added vehicles and requests are drawn from.
+        latency (float or function): The seconds waited before every response, or
+            a function of the endpoint returning them.
+        error_rate (float or dict): The probability of answering with an injected
+            error, or a dictionary of probabilities by endpoint.
+        metrics_interval (float): The seconds between two metrics points.
+        fleets (dict[str, StubFleet]): The fleets, by fleet key.
+        calls (collections.Counter): The number of calls, by endpoint.
+    """
+
+    URL = "http://pyrai-stub"
+    BOUNDS = ((42.30, -71.15), (42.40, -71.00))
+    ERROR_STATUS = 503
+
+    def __init__(self, api_keys=None, vehicles=0, requests=0, capacity=Defaults.DEFAULT_CAPACITY,
+        bounds=BOUNDS, latency=0, error_rate=0, metrics_interval=60, seed=None):
+        """
+        Initializes a StubDispatcher object without fleets.
+
+        Args:
+            api_keys (list[str], optional): The accepted API keys. If None, any key
+                is accepted. Defaults to None.
+            vehicles (int, optional): The number of vehicles added to every new fleet.
+                Defaults to 0.
+            requests (int, optional): The number of waiting requests added to every
+                new fleet. Defaults to 0.
+            capacity (int, optional): The capacity of the added vehicles.
+                Defaults to Defaults.DEFAULT_CAPACITY.
+            bounds (tuple[tuple[float]], optional): The corners of the box the added
+                locations are drawn from. Defaults to StubDispatcher.BOUNDS.
+            latency (float or function, optional): The seconds waited before every
+                response, or a function of the endpoint returning them. Defaults to 0.
+            error_rate (float or dict, optional): The probability of an injected error,
+                or a dictionary of probabilities by endpoint. Defaults to 0.
+            metrics_interval (float, optional): The seconds between two metrics points.
+                Defaults to 60.
+            seed (int, optional): The seed of the generated fleet keys, locations and
+                errors. Defaults to None.
+        """
+        self.api_keys = set(api_keys) if api_keys is not None else None
+        self.vehicles = vehicles
+        self.requests = requests
+        self.capacity = capacity
+        self.bounds = bounds
+        self.latency = latency
+        self.error_rate = error_rate
+        self.metrics_interval = metrics_interval
+        self.fleets = {}
+        self.calls = collections.Counter()
+
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._routes = {
+            ("POST", Endpoints.CREATE_SIM_FLEET): lambda d: self._create_fleet(d, True),
+            ("POST", Endpoints.CREATE_LIVE_FLEET): lambda d: self._create_fleet(d, False),
+            ("POST", Endpoints.MAKE_VEHICLE_ONLINE): self._make_vehicle_online,
+            ("POST", Endpoints.MAKE_VEHICLE_OFFLINE): self._make_vehicle_offline,
+            ("POST", Endpoints.UPDATE_VEHICLE): self._update_vehicle,
+            ("POST", Endpoints.REMOVE_VEHICLE): self._remove_vehicle,
+            ("GET", Endpoints.GET_VEHICLE_INFO): self._get_vehicle_info,
+            ("POST", Endpoints.ADD_REQUEST): self._add_request,
+            ("GET", Endpoints.GET_REQUEST): self._get_request,
+            ("POST", Endpoints.CANCEL_REQUEST): self._cancel_request,
+            ("GET", Endpoints.COMPUTE_ASSIGNMENTS): self._get_assignments,
+            ("POST", Endpoints.SET_PARAMS): self._set_params,
+            ("POST", Endpoints.FORWARD_SIMULATE): self._forward_simulate,
+            ("POST", Endpoints.GRAPHQL): self._graphql
+        }
+
+    def handle(self, method, endpoint, payload=None):
+        """
+        Answers one call.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (Endpoints: str): The path of the call.
+            payload (dict, optional): The JSON body of a POST, or the query parameters
+                of a GET. Defaults to None.
+
+        Returns:
+            tuple: The HTTP status code, and the JSON response, None for HEAD calls.
+        """
+        if method == "HEAD":
+            # answered like the API, after the latency, e.g. to test prewarming
+            latency = self.latency(endpoint) if callable(self.latency) else self.latency
+            if latency:
+                time.sleep(latency)
+            return 200, None
+
+        with self._lock:
+            self.calls[endpoint] += 1
+            error_rate = self.error_rate
+            if isinstance(error_rate, dict):
+                error_rate = error_rate.get(endpoint, 0)
+            failed = error_rate > 0 and self._random.random() < error_rate
+
+        latency = self.latency(endpoint) if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        if failed:
+            return self.ERROR_STATUS, {'status': self.ERROR_STATUS, 'error': "Injected error"}
+
+        route = self._routes.get((method, endpoint))
+        if route is None:
+            return 404, {'status': 404, 'error': "Unknown endpoint {} {}".format(method, endpoint)}
+
+        with self._lock:
+            try:
+                return 200, route(payload or {})
+            except _StubError as e:
+                return e.code, {'status': e.code, 'error': e.error}
+
+    def install(self, connection, url=URL):
+        """
+        Answers the calls of connection to url in-process.
+
+        Args:
+            connection (Connection): The connection whose calls are answered.
+            url (str, optional): The base URL of the answered calls, given to the
+                Pyrai or Fleet objects. Defaults to StubDispatcher.URL.
+
+        Returns:
+            str: url.
+        """
+        connection.session.mount(url, StubAdapter(self))
+        return url
+
+    def serve(self, host="127.0.0.1", port=0):
+        """
+        Answers HTTP calls on a local server, in a background thread.
+
+        Args:
+            host (str, optional): The interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. If 0, a free port is
+                picked. Defaults to 0.
+
+        Returns:
+            StubServer: The running server, whose url is the base URL of the API.
+        """
+        return StubServer(self, host, port).start()
+
+    def _create_fleet(self, d, sim):
+        api_key = d.get('api_key')
+        self._check_key(api_key)
+
+        fleet_key = str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+        now = datetime.datetime.now(datetime.timezone.utc)
+        fleet = self.fleets[fleet_key] = StubFleet(api_key, fleet_key, dict(d.get('params') or {}), sim, now)
+
+        for vid in range(self.vehicles):
+            fleet.make_vehicle_online(vid, self._location(), self.capacity)
+        # simulation fleets start at the first current time they are given
+        for rid in range(self.requests):
+            fleet.add_request(rid, self._location(), self._location(), 1, None if sim else now)
+        fleet.snapshot()
+
+        return {'fleet_key': fleet_key}
+
+    def _make_vehicle_online(self, d):
+        fleet = self._fleet(d)
+        fleet.make_vehicle_online(d.get('id'), _location(d.get('location')), d.get('capacity'))
+        return _ok()
+
+    def _make_vehicle_offline(self, d):
+        fleet = self._fleet(d)
+        fleet.make_vehicle_offline(self._vehicle(fleet, d.get('id')), _location(d.get('location')))
+        return _ok()
+
+    def _update_vehicle(self, d):
+        fleet = self._fleet(d)
+        vid = self._vehicle(fleet, d.get('id'))
+        veh = fleet.update_vehicle(vid, _location(d.get('location')), d.get('event'), d.get('req_id'))
+        return veh
+
+    def _remove_vehicle(self, d):
+        fleet = self._fleet(d)
+        req_ids = fleet.remove_vehicle(self._vehicle(fleet, d.get('id')))
+        resp = _ok()
+        if req_ids:
+            resp['req_ids'] = req_ids
+        return resp
+
+    def _get_vehicle_info(self, d):
+        fleet = self._fleet(d)
+        return fleet.vehicle(self._vehicle(fleet, d.get('id')))
+
+    def _add_request(self, d):
+        fleet = self._fleet(d)
+        request_time = _time(d.get('request_time'))
+        fleet.add_request(d.get('id'), _location(d.get('pickup')), _location(d.get('dropoff')),
+            d.get('load'), request_time)
+        return _ok()
+
+    def _get_request(self, d):
+        fleet = self._fleet(d)
+        return fleet.request(self._request(fleet, d.get('id')))
+
+    def _cancel_request(self, d):
+        fleet = self._fleet(d)
+        fleet.cancel_request(self._request(fleet, d.get('id')))
+        return _ok()
+
+    def _get_assignments(self, d):
+        fleet = self._fleet(d)
+        fleet.tick(_time(d.get('current_time')))
+        fleet.assign()
+        fleet.snapshot()
+        return fleet.assignments()
+
+    def _set_params(self, d):
+        fleet = self._fleet(d)
+        fleet.params.update(d.get('params') or {})
+        return _ok()
+
+    def _forward_simulate(self, d):
+        fleet = self._fleet(d)
+        if not fleet.sim:
+            raise _StubError(400, "Only simulation fleets can be forward simulated")
+
+        duration = timeparse(d.get('sim_duration') or "")
+        if duration is None:
+            raise _StubError(400, "Invalid duration {}".format(d.get('sim_duration')))
+
+        current_time = _time(d.get('current_time'))
+        if current_time is None:
+            raise _StubError(400, "Missing current_time")
+        fleet.tick(current_time)
+        fleet.assign()
+        fleet.forward(current_time + datetime.timedelta(seconds=duration))
+        fleet.snapshot()
+        return fleet.assignments()
+
+    def _graphql(self, d):
+        data = {}
+        for match in _FLEET_QUERY.finditer(d.get('query') or ""):
+            alias, api_key, fleet_key, start_time, end_time, fields = match.groups()
+            fleet = self._fleet({'user_key': {'api_key': api_key, 'fleet_key': fleet_key}})
+            fields = [f for f in fields.split() if f in Metrics.FIELDS]
+            metrics = fleet.metrics(from_rfc3339(start_time), from_rfc3339(end_time), self.metrics_interval, fields)
+            data[alias or "live_fleets"] = [{'metrics': metrics}]
+
+        if not data:
+            raise _StubError(400, "Invalid query")
+        return {'data': data}
+
+    def _check_key(self, api_key):
+        if self.api_keys is not None and api_key not in self.api_keys:
+            raise _StubError(401, "Invalid API key")
+
+    def _fleet(self, d):
+        # POST calls send a user_key, GET calls send its fields as parameters
+        user_key = d.get('user_key') or d
+        self._check_key(user_key.get('api_key'))
+        fleet = self.fleets.get(user_key.get('fleet_key'))
+        if fleet is None or fleet.api_key != user_key.get('api_key'):
+            raise _StubError(404, "Unknown fleet {}".format(user_key.get('fleet_key')))
+        return fleet
+
+    def _vehicle(self, fleet, vid):
+        vid = _id(vid)
+        if vid not in fleet.vehicles:
+            raise _StubError(404, "Unknown vehicle {}".format(vid))
+        return vid
+
+    def _request(self, fleet, rid):
+        rid = _id(rid)
+        if rid not in fleet.requests:
+            raise _StubError(404, "Unknown request {}".format(rid))
+        return rid
+
+    def _location(self):
+        (lat0, lng0), (lat1, lng1) = self.bounds
+        return (self._random.uniform(lat0, lat1), self._random.uniform(lng0, lng1))
+
+class _StubError(Exception):
+
+    def __init__(self, code, error):
+        self.code = code
+        self.error = error
+
+_FLEET_QUERY = re.compile(r'(?:(\w+)\s*:\s*)?live_fleets\s*\(\s*api_key:\s*"([^"]*)"\s*fleet_key:\s*"([^"]*)"\s*\)'
+    r'\s*\{\s*metrics\s*\(\s*start:\s*"([^"]*)"\s*end:\s*"([^"]*)"\s*\)\s*\{([^}]*)\}')
+
+def _ok():
+    return {'status': 0, 'error': ""}
+
+def _id(i):
+    # GET parameters arrive as strings
+    if isinstance(i, str) and i.lstrip("-").isdigit():
+        return int(i)
+    return i
+
+def _location(d):
+    if not isinstance(d, dict):
+        raise _StubError(400, "Invalid location {}".format(d))
+    return (d.get('lat'), d.get('lng'))
+
+def _time(s):
+    if s is None:
+        return None
+    try:
+        return from_rfc3339(s)
+    except ValueError:
+        raise _StubError(400, "Invalid time {}".format(s))
@@ -0,0 +1,348 @@
+import bisect
+import datetime
+import math
+from pytimeparse.timeparse import timeparse
+from pyrai.dispatcher.structures.metrics import Metrics
+from pyrai.dispatcher.structures.vehicle_event import VehicleEvent
+from pyrai.helpers import to_rfc3339
+
+WAITING = "waiting"
+ASSIGNED = "assigned"
+ONBOARD = "onboard"
+DONE = "done"
+DROPPED = "dropped"
+CANCELED = "canceled"
+
+class StubFleet(object):
+    """
+    Class used to keep the state of one fleet of a StubDispatcher. Requests
+    are assigned first-fit to the online vehicles with enough spare capacity,
+    and vehicles drive in straight lines at SPEED, so responses have the
+    shape of the API's without its routing. Requests waiting longer than the
+    fleet's max_wait are dropped.
+
+    Attributes:
+        api_key (str): The API key that created the fleet.
+        fleet_key (str): The fleet key.
+        params (dict): The fleet parameters, as sent by set_params.
+        sim (bool): True for simulation fleets, which can be forward simulated.
+        time (datetime.datetime): The latest current time given by get_assignments
+            or forward_simulate. Simulation fleets start at the first one, which
+            becomes the request time of the requests added without one.
+        vehicles (dict): The vehicles, by id.
+        requests (dict): The requests, by id.
+        notifications (list[dict]): The notifications not returned yet.
+    """
+
+    SPEED = 30 / 3.6
+
+    def __init__(self, api_key, fleet_key, params, sim, time):
+        """
+        Initializes an empty StubFleet object.
+
+        Args:
+            api_key (str): The API key that created the fleet.
+            fleet_key (str): The fleet key.
+            params (dict): The fleet parameters.
+            sim (bool): True for simulation fleets.
+            time (datetime.datetime): The creation time.
+        """
+        self.api_key = api_key
+        self.fleet_key = fleet_key
+        self.params = params
+        self.sim = sim
+        self.time = time
+        self.vehicles = {}
+        self.requests = {}
+        self.notifications = []
+
+        self._started = False
+        self._cursor = 0
+        self._snapshot_times = []
+        self._snapshots = []
+        self.snapshot()
+
+    def tick(self, time):
+        """
+        Moves the fleet time forward to time, if it is later.
+        """
+        if time is None:
+            return
+
+        if self.sim and not self._started:
+            # simulated time is unrelated to the wall clock the fleet was created at
+            for req in self.requests.values():
+                if req['request_time'] is None:
+                    req['request_time'] = time
+            self._snapshot_times, self._snapshots = [], []
+            self.time = time
+        elif time > self.time:
+            self.time = time
+        self._started = True
+
+    def make_vehicle_online(self, vid, location, capacity):
+        """
+        Adds the vehicle if it is new, and makes it online.
+        """
+        veh = self.vehicles.get(vid)
+        if veh is None:
+            veh = self.vehicles[vid] = {'location': location, 'capacity': capacity,
+                'online': True, 'req_ids': [], 'events': []}
+        veh['location'] = location
+        veh['capacity'] = capacity
+        veh['online'] = True
+
+    def make_vehicle_offline(self, vid, location):
+        """
+        Makes the vehicle offline. Its assigned requests keep their vehicle.
+        """
+        veh = self.vehicles[vid]
+        veh['location'] = location
+        veh['online'] = False
+
+    def update_vehicle(self, vid, location, event, req_id=None):
+        """
+        Updates the location of the vehicle, and completes its next pickup
+        or dropoff of req_id if event is one.
+
+        Returns:
+            dict: The vehicle, as returned by the API.
+        """
+        veh = self.vehicles[vid]
+        veh['location'] = location
+        if event in (VehicleEvent.PICKUP, VehicleEvent.DROPOFF) and req_id is not None:
+            for e in veh['events']:
+                if e['req_id'] == req_id and e['event'] == event:
+                    self._complete(vid, veh, e, self.time)
+                    break
+        return self.vehicle(vid)
+
+    def remove_vehicle(self, vid):
+        """
+        Removes the vehicle, and makes its requests not picked up yet wait again.
+
+        Returns:
+            list[int]: The ids of the requests that wait again.
+        """
+        veh = self.vehicles.pop(vid)
+        unassigned = []
+        for rid in veh['req_ids']:
+            req = self.requests[rid]
+            if req['status'] == ASSIGNED:
+                req['status'], req['veh_id'] = WAITING, -1
+                unassigned.append(rid)
+        return unassigned
+
+    def add_request(self, rid, pickup, dropoff, load, request_time):
+        """
+        Adds a waiting request. A request_time of None is set when the
+        simulation starts.
+        """
+        self.requests[rid] = {'pickup': pickup, 'dropoff': dropoff, 'load': load,
+            'request_time': request_time, 'veh_id': -1, 'status': WAITING, 'pickup_time': None}
+
+    def cancel_request(self, rid):
+        """
+        Cancels the request, and removes it from its vehicle.
+        """
+        req = self.requests[rid]
+        if req['status'] in (ASSIGNED, ONBOARD):
+            veh = self.vehicles.get(req['veh_id'])
+            if veh is not None:
+                veh['events'] = [e for e in veh['events'] if e['req_id'] != rid]
+                veh['req_ids'].remove(rid)
+        req['status'] = CANCELED
+
+    def assign(self):
+        """
+        Drops the requests waiting longer than max_wait, and assigns the
+        others to the first online vehicles with enough spare capacity.
+        """
+        max_wait = timeparse(self.params.get('max_wait') or "0s") or 0
+        online = [vid for vid, veh in self.vehicles.items() if veh['online']]
+
+        for rid, req in self.requests.items():
+            if req['status'] != WAITING:
+                continue
+
+            waited = (self.time - req['request_time']).total_seconds()
+            if waited > max_wait:
+                req['status'] = DROPPED
+                self._notify(rid, req, waited, False)
+                continue
+
+            for _ in range(len(online)):
+                vid = online[self._cursor % len(online)]
+                self._cursor += 1
+                veh = self.vehicles[vid]
+                load = sum(self.requests[r]['load'] for r in veh['req_ids'])
+                if load + req['load'] <= veh['capacity']:
+                    self._insert(vid, veh, rid, req)
+                    self._notify(rid, req, waited, True)
+                    break
+
+    def forward(self, end):
+        """
+        Completes every event planned before end, and moves the fleet time to end.
+        """
+        self.tick(end)
+        for vid, veh in self.vehicles.items():
+            while veh['events'] and veh['events'][0]['time'] <= end:
+                self._complete(vid, veh, veh['events'][0], veh['events'][0]['time'])
+
+    def assignments(self):
+        """
+        Builds an assignments response, and forgets the returned notifications.
+
+        Returns:
+            dict: The vehicles, the active requests and the new notifications,
+                as returned by the API.
+        """
+        notifications, self.notifications = self.notifications, []
+        return {
+            'vehs': [self.vehicle(vid) for vid in self.vehicles],
+            'reqs': [self.request(rid) for rid, req in self.requests.items()
+                if req['status'] in (WAITING, ASSIGNED, ONBOARD)],
+            'notifications': notifications
+        }
+
+    def vehicle(self, vid):
+        """
+        Converts a vehicle to the shape returned by the API.
+
+        Returns:
+            dict: The vehicle, as returned by the API.
+        """
+        veh = self.vehicles[vid]
+        return {
+            'veh_id': vid,
+            'location': _location(veh['location']),
+            'assigned': bool(veh['events']),
+            'req_ids': list(veh['req_ids']),
+            'events': [{
+                'req_id': e['req_id'],
+                'location': _location(e['location']),
+                'time': to_rfc3339(e['time']),
+                'event': e['event']
+            } for e in veh['events']]
+        }
+
+    def request(self, rid):
+        """
+        Converts a request to the shape returned by the API.
+
+        Returns:
+            dict: The request, as returned by the API.
+        """
+        req = self.requests[rid]
+        return {
+            'pickup': _location(req['pickup']),
+            'dropoff': _location(req['dropoff']),
+            'request_time': to_rfc3339(req['request_time'] or self.time),
+            'req_id': rid,
+            'veh_id': req['veh_id'],
+            'load': req['load'],
+            'assigned': req['status'] in (ASSIGNED, ONBOARD)
+        }
+
+    def snapshot(self):
+        """
+        Records the metrics of the fleet at its current time. Since the time
+        only moves with get_assignments and forward_simulate, snapshots are
+        only needed after them.
+        """
+        statuses = [req['status'] for req in self.requests.values()]
+        online = [veh for veh in self.vehicles.values() if veh['online']]
+        passengers = sum(req['load'] for req in self.requests.values() if req['status'] == ONBOARD)
+        waits = [(req['pickup_time'] - req['request_time']).total_seconds()
+            for req in self.requests.values() if req['pickup_time'] is not None]
+        done, dropped = statuses.count(DONE), statuses.count(DROPPED)
+
+        row = {
+            Metrics.PASSENGERS: passengers,
+            Metrics.WAITING_REQUESTS: statuses.count(WAITING),
+            Metrics.ACTIVE_REQUESTS: statuses.count(ASSIGNED) + statuses.count(ONBOARD),
+            Metrics.DROPPED_REQUESTS: dropped,
+            Metrics.CANCELED_REQUESTS: statuses.count(CANCELED),
+            Metrics.TOTAL_REQUESTS: len(statuses),
+            Metrics.ASSIGNED_VEHICLES: sum(1 for veh in online if veh['events']),
+            Metrics.IDLE_VEHICLES: sum(1 for veh in online if not veh['events']),
+            Metrics.REBALANCING_VEHICLES: 0,
+            Metrics.OFFLINE_VEHICLES: len(self.vehicles) - len(online),
+            Metrics.AVG_WAIT: sum(waits) / len(waits) if waits else 0.0,
+            Metrics.AVG_DELAY: 0.0,
+            Metrics.AVG_OCCUPANCY: passengers / len(online) if online else 0.0,
+            Metrics.SERVICE_RATE: done / (done + dropped) if done + dropped else 1.0
+        }
+
+        i = bisect.bisect_right(self._snapshot_times, self.time)
+        if i and self._snapshot_times[i - 1] == self.time:
+            self._snapshots[i - 1] = row
+        else:
+            self._snapshot_times.insert(i, self.time)
+            self._snapshots.insert(i, row)
+
+    def metrics(self, start_time, end_time, interval, fields):
+        """
+        Samples the recorded metrics every interval seconds.
+
+        Args:
+            start_time (datetime.datetime): The start time.
+            end_time (datetime.datetime): The end time.
+            interval (float): The seconds between points.
+            fields (list[Metrics]): The metrics of each point.
+
+        Returns:
+            list[dict]: The metrics, one dictionary per point, as returned by the API.
+        """
+        rows = []
+        time = start_time
+        step = datetime.timedelta(seconds=interval)
+        while time <= end_time:
+            i = bisect.bisect_right(self._snapshot_times, time)
+            snapshot = self._snapshots[i - 1] if i else self._snapshots[0] if self._snapshots else {}
+            rows.append({f: to_rfc3339(time) if f == Metrics.TIME else snapshot.get(f, 0) for f in fields})
+            time += step
+        return rows
+
+    def _insert(self, vid, veh, rid, req):
+        if veh['events']:
+            last = veh['events'][-1]
+            time, location = last['time'], last['location']
+        else:
+            time, location = self.time, veh['location']
+
+        pickup_time = max(time + _travel(location, req['pickup']), req['request_time'])
+        dropoff_time = pickup_time + _travel(req['pickup'], req['dropoff'])
+        veh['events'].append({'req_id': rid, 'location': req['pickup'],
+            'time': pickup_time, 'event': VehicleEvent.PICKUP})
+        veh['events'].append({'req_id': rid, 'location': req['dropoff'],
+            'time': dropoff_time, 'event': VehicleEvent.DROPOFF})
+        veh['req_ids'].append(rid)
+        req['status'], req['veh_id'] = ASSIGNED, vid
+
+    def _complete(self, vid, veh, event, time):
+        veh['events'].remove(event)
+        veh['location'] = event['location']
+        req = self.requests[event['req_id']]
+        if event['event'] == VehicleEvent.PICKUP:
+            req['status'], req['pickup_time'] = ONBOARD, time
+        else:
+            req['status'] = DONE
+            veh['req_ids'].remove(event['req_id'])
+
+    def _notify(self, rid, req, waited, assigned):
+        self.notifications.append({
+            'message': "Request {} {}".format(rid, "assigned" if assigned else "dropped"),
+            'data': {'veh_id': req['veh_id'], 'req_id': rid,
+                'waiting_duration': "{}s".format(int(waited)), 'assigned': assigned}
+        })
+
+def _location(location):
+    return {'lat': location[0], 'lng': location[1]}
+
+def _travel(a, b):
+    # straight line distance on a sphere
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return datetime.timedelta(seconds=2 * 6371000 * math.asin(math.sqrt(h)) / StubFleet.SPEED)
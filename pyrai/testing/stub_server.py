@@ -0,0 +1,117 @@
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+class StubServer(object):
+    """
+    Class used to answer HTTP calls with a StubDispatcher on a local
+    server, so that any client, including AsyncConnection and other
+    processes, can use it. Connections are kept alive, as by the API.
+
+    Attributes:
+        dispatcher (StubDispatcher): The dispatcher answering the calls.
+        host (str): The interface the server listens on.
+        port (int): The port the server listens on.
+        url (str): The base URL of the API served.
+    """
+
+    def __init__(self, dispatcher, host="127.0.0.1", port=0):
+        """
+        Initializes a StubServer object, listening but not serving yet.
+
+        Args:
+            dispatcher (StubDispatcher): The dispatcher answering the calls.
+            host (str, optional): The interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. If 0, a free port is
+                picked. Defaults to 0.
+        """
+        self.dispatcher = dispatcher
+        self._server = _HTTPServer((host, port), _Handler)
+        self._server.dispatcher = dispatcher
+        self._thread = None
+        self.host, self.port = self._server.server_address[:2]
+        self.url = "http://{}:{}".format(self.host, self.port)
+
+    @property
+    def connections(self):
+        """
+        int: The number of connections accepted so far.
+        """
+        return self._server.connections
+
+    def start(self):
+        """
+        Serves calls in a background thread.
+
+        Returns:
+            StubServer: self.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Serves calls in the current thread, until stop is called.
+        """
+        self._server.serve_forever()
+
+    def stop(self):
+        """
+        Stops serving calls, and closes the server.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        if self._thread is None:
+            self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+class _HTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        # called by the serving thread only, so no lock is needed
+        self.connections += 1
+        super().process_request(request, client_address)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_HEAD(self):
+        self._reply(*self.server.dispatcher.handle("HEAD", urllib.parse.urlsplit(self.path).path))
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        payload = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+        self._reply(*self.server.dispatcher.handle("GET", url.path, payload))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return self._reply(400, {'status': 400, 'error': "Invalid JSON"})
+        self._reply(*self.server.dispatcher.handle("POST", urllib.parse.urlsplit(self.path).path, payload))
+
+    def _reply(self, status_code, resp):
+        body = json.dumps(resp).encode() if resp is not None else b""
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
@@ -23,12 +23,17 @@ setuptools.setup(
     url="https://github.com/routable-ai/pyrai",
     packages=setuptools.find_packages(),
     install_requires=[
-          "ipython",
-          "plotly",
           "python-dateutil",
           "pytimeparse",
           "requests"
       ],
+    extras_require={
+          "async": ["aiohttp"],
+          "fast": ["orjson"],
+          "numpy": ["numpy"],
+          "plot": ["plotly"],
+          "notebook": ["ipython", "plotly"]
+      },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
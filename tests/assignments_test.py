@@ -0,0 +1,123 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.dispatcher.methods.fleet.get_assignments import get_assignments_call
+from pyrai.testing import StubDispatcher
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TestAssignments(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        self.stub.install(rai.connection)
+        self.codec = rai.connection.codec
+
+        self.fleet = rai.create_sim_fleet(clock=pyrai.VirtualClock(self.time))
+        for vid in range(3):
+            self.fleet.make_vehicle_online(vid, pyrai.Location(42.36, -71.05 + vid / 100), 1)
+        # one more request than seats, so that one stays unassigned
+        for rid in range(4):
+            self.fleet.add_request(rid, pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.06 + rid / 100),
+                1, self.time)
+
+    def response(self):
+        # one get_assignments response, as decoded from the wire
+        call = get_assignments_call(self.fleet, self.time)
+        status, resp = self.stub.handle(call.method, call.endpoint, call.payload)
+        self.assertEqual(status, 200)
+        return self.codec.loads(self.codec.dumps(resp))
+
+    def assertTimesEqual(self, seconds, times):
+        # to the microsecond of the datetimes
+        self.assertEqual(len(seconds), len(times))
+        for s, t in zip(seconds, times):
+            self.assertAlmostEqual(s, t.timestamp(), delta=1e-6)
+
+    def assertColumnsEqual(self, columnar, assignments):
+        vehs, events, requests = columnar.vehs, columnar.events, columnar.requests
+
+        self.assertEqual(list(vehs['veh_id']), [v.veh_id for v in assignments.vehs])
+        self.assertEqual(list(vehs['lat']), [v.location.lat for v in assignments.vehs])
+        self.assertEqual(list(vehs['lng']), [v.location.lng for v in assignments.vehs])
+        self.assertEqual(list(vehs['assigned']), [v.assigned for v in assignments.vehs])
+        self.assertEqual(list(vehs['req_count']), [len(v.req_ids) for v in assignments.vehs])
+        self.assertEqual(list(vehs['event_count']), [len(v.events) for v in assignments.vehs])
+
+        flat = [(v.veh_id, e) for v in assignments.vehs for e in v.events]
+        self.assertEqual(list(events['veh_id']), [veh_id for veh_id, _ in flat])
+        self.assertEqual(list(events['req_id']), [e.req_id for _, e in flat])
+        self.assertEqual(list(events['event']), [e.event for _, e in flat])
+        self.assertEqual(list(events['lat']), [e.location.lat for _, e in flat])
+        self.assertEqual(list(events['lng']), [e.location.lng for _, e in flat])
+        self.assertTimesEqual(events['time'], [e.time for _, e in flat])
+
+        reqs = assignments.requests
+        self.assertEqual(list(requests['req_id']), [r.req_id for r in reqs])
+        self.assertEqual(list(requests['veh_id']), [r.veh_id for r in reqs])
+        self.assertEqual(list(requests['pickup_lat']), [r.pickup.lat for r in reqs])
+        self.assertEqual(list(requests['dropoff_lng']), [r.dropoff.lng for r in reqs])
+        self.assertTimesEqual(requests['request_time'], [r.request_time for r in reqs])
+        self.assertEqual(list(requests['load']), [r.load for r in reqs])
+        self.assertEqual(list(requests['assigned']), [r.assigned for r in reqs])
+
+        self.assertEqual([n.todict() for n in columnar.notifications],
+            [n.todict() for n in assignments.notifications])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_columnar(self):
+        d = self.response()
+        columnar = pyrai.ColumnarAssignments.fromdict(d)
+        assignments = pyrai.VehicleAssignments.fromdict(self.fleet, d)
+
+        self.assertEqual(columnar.todict(), {'vehs': 3, 'events': 6, 'requests': 4, 'notifications': 3})
+        self.assertEqual(list(columnar.requests['assigned']), [True, True, True, False])
+        self.assertColumnsEqual(columnar, assignments)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_columnar_keeps_state(self):
+        self.fleet.get_assignments(self.time, columnar=True)
+        self.assertIsNone(self.fleet.state.assignments)
+        self.assertEqual(pyrai.ColumnarAssignments({}, {}, {}).notifications, [])
+
+    def test_lazy(self):
+        d = self.response()
+        lazy = pyrai.LazyVehicleAssignments.fromdict(self.fleet, d)
+        assignments = pyrai.VehicleAssignments.fromdict(self.fleet, d)
+
+        # a single vehicle or request is decoded alone
+        self.assertEqual(lazy.vehicle(1).todict(), assignments.vehs[1].todict())
+        self.assertEqual(lazy.request(3).todict(), assignments.requests[3].todict())
+        self.assertEqual((lazy.vehs.decoded, lazy.requests.decoded), (1, 1))
+        self.assertIsNone(lazy.vehicle(3))
+        self.assertIsNone(lazy.request(4))
+
+        self.assertEqual(lazy.todict(), assignments.todict())
+        self.assertIs(lazy.vehicle(1), lazy.vehs[1])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_decoders_agree(self):
+        d = self.response()
+        assignments = pyrai.VehicleAssignments.fromdict(self.fleet, d)
+        lazy = pyrai.LazyVehicleAssignments.fromdict(self.fleet, d)
+        columnar = pyrai.ColumnarAssignments.fromdict(d)
+
+        self.assertEqual(lazy.todict(), assignments.todict())
+        self.assertColumnsEqual(columnar, assignments)
+        self.assertColumnsEqual(columnar, lazy)
+
+    def test_lazy_keeps_state(self):
+        assignments = self.fleet.get_assignments(self.time, lazy=True)
+        self.assertIsInstance(assignments, pyrai.LazyVehicleAssignments)
+        self.assertIsNone(self.fleet.state.assignments)
+        with self.assertRaises(ValueError):
+            self.fleet.get_assignments(self.time, columnar=True, lazy=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import unittest
+import asyncio
+import datetime
+import threading
+import time
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsync(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+    location = pyrai.Location(42.36, -71.05)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0, latency=self.latency)
+        self.server = self.stub.serve()
+        self.delay = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def latency(self, endpoint):
+        # waits here instead of returning the latency, to count the calls in flight
+        if self.delay:
+            with self.lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+            time.sleep(self.delay)
+            with self.lock:
+                self.in_flight -= 1
+        return 0
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_update_vehicles(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+                for vid in range(10):
+                    await fleet.make_vehicle_online(vid, self.location, 4)
+
+                self.delay = 0.02
+                updates = [{'vid': i % 10, 'location': self.location, 'event': pyrai.VehicleEvent.UNASSIGNED}
+                    for i in range(30)]
+                result = await fleet.update_vehicles(updates, max_concurrency=4)
+
+                self.assertEqual((result.count, result.failed), (30, 0))
+                self.assertEqual([v.veh_id for v in result.results], [i % 10 for i in range(30)])
+                self.assertEqual(self.stub.calls[Endpoints.UPDATE_VEHICLE], 30)
+                self.assertTrue(1 < self.peak <= 4)
+
+        run(main())
+
+    def test_add_requests(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+                trips = ({'rid': i, 'pickup': self.location.todict(), 'dropoff': self.location.todict(),
+                    'load': 1, 'request_time': self.time} for i in range(30))
+
+                self.delay = 0.02
+                self.stub.error_rate = {Endpoints.ADD_REQUEST: 0.5}
+                result = await fleet.add_requests(trips, max_in_flight=4)
+
+                self.assertEqual(result.count, 30)
+                self.assertEqual(self.stub.calls[Endpoints.ADD_REQUEST], 30)
+                self.assertTrue(0 < result.failed < 30)
+                self.assertTrue(all(isinstance(e.error, pyrai.StatusError) for e in result.errors))
+                self.assertTrue(1 < self.peak <= 4)
+
+        run(main())
+
+    def test_add_requests_source_error(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+
+                def trips():
+                    for i in range(6):
+                        yield {'rid': i, 'pickup': self.location.todict(), 'dropoff': self.location.todict(),
+                            'load': 1, 'request_time': self.time}
+                    raise ValueError("bad trip")
+
+                # the requests already sent are done when the error is raised
+                self.delay = 0.05
+                with self.assertRaises(ValueError):
+                    await fleet.add_requests(trips(), max_in_flight=4)
+                self.assertEqual(self.in_flight, 0)
+                self.assertEqual(self.stub.calls[Endpoints.ADD_REQUEST], 6)
+
+        run(main())
+
+    def test_update_buffer(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+                await fleet.make_vehicle_online(1, self.location, 4)
+                buffer = await fleet.enable_update_buffer(window=None)
+
+                for _ in range(3):
+                    self.assertIsNone(await fleet.update_vehicle(1, self.location, pyrai.VehicleEvent.UNASSIGNED))
+                self.assertEqual(self.stub.calls[Endpoints.UPDATE_VEHICLE], 0)
+
+                await fleet.get_assignments(self.time)
+                self.assertEqual(self.stub.calls[Endpoints.UPDATE_VEHICLE], 1)
+                self.assertEqual((buffer.received, buffer.coalesced, buffer.sent), (3, 2, 1))
+                self.assertIsNone(await fleet.disable_update_buffer())
+
+        run(main())
+
+    def test_vehicle_update_buffered(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+                await fleet.make_vehicle_online(1, self.location, 4)
+                vehicle = await fleet.get_vehicle_info(1)
+                buffer = await fleet.enable_update_buffer(window=None)
+
+                moved = pyrai.Location(42.37, -71.06)
+                self.assertIsNone(await vehicle.update(pyrai.VehicleEvent.UNASSIGNED, location=moved))
+                self.assertIs(vehicle.location, moved)
+                self.assertEqual(self.stub.calls[Endpoints.UPDATE_VEHICLE], 0)
+
+                await buffer.flush()
+                self.assertEqual(self.stub.calls[Endpoints.UPDATE_VEHICLE], 1)
+                await fleet.disable_update_buffer()
+
+        run(main())
+
+    def test_metrics_cache(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+                await fleet.forward_simulate("1h", self.time)
+                end = self.time + datetime.timedelta(hours=1)
+
+                metrics = await fleet.get_metrics(self.time, end, [pyrai.Metrics.TOTAL_REQUESTS])
+                self.assertEqual(len(metrics), 61)
+                self.assertEqual(await fleet.get_metrics(self.time, end, [pyrai.Metrics.TOTAL_REQUESTS]), metrics)
+                self.assertEqual(self.stub.calls[Endpoints.GRAPHQL], 1)
+
+                # plotting cached metrics does not query them again
+                figure = await fleet.plot_metrics([pyrai.Metrics.TOTAL_REQUESTS], self.time, end)
+                self.assertEqual(len(figure.data[0].x), 61)
+                self.assertEqual(self.stub.calls[Endpoints.GRAPHQL], 1)
+
+        run(main())
+
+    def test_replay(self):
+        async def main():
+            async with pyrai.AsyncPyrai(url=self.server.url, api_key="api_key") as rai:
+                fleet = await rai.create_sim_fleet()
+                trip = {'pickup': self.location.todict(), 'dropoff': self.location.todict(), 'load': 1}
+                entries = [{'endpoint': Endpoints.ADD_REQUEST, 'time': 0, 'payload': dict(trip, id=i)}
+                    for i in range(10)]
+                entries += [{'endpoint': Endpoints.CANCEL_REQUEST, 'time': 0, 'payload': {'id': i}}
+                    for i in range(10)]
+                entries.append({'endpoint': Endpoints.GRAPHQL, 'time': 0, 'payload': {}})
+
+                result = await fleet.replay(entries, speed=None)
+                # each cancellation waits for its request to be added
+                self.assertEqual((result.count, result.failed), (20, 0))
+                self.assertEqual(self.stub.calls[Endpoints.GRAPHQL], 0)
+                self.assertEqual(self.stub.calls[Endpoints.CANCEL_REQUEST], 10)
+
+        run(main())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import datetime
+import json
+import os
+import tempfile
+import pyrai
+from pyrai.helpers import to_rfc3339
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.dispatcher.methods.fleet.add_requests import read_trips
+from pyrai.dispatcher.methods.fleet.update_vehicles import vehicle_chains
+from pyrai.testing import StubDispatcher
+
+class TestBulk(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0)
+        self.sent = []
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key",
+            instrumentation=pyrai.Instrumentation(hooks=[self.sent.append]))
+        self.stub.install(rai.connection)
+
+        self.fleet = rai.create_sim_fleet(clock=pyrai.VirtualClock(self.time))
+        for vid in range(4):
+            self.fleet.make_vehicle_online(vid, pyrai.Location(42.36, -71.05), 4)
+        del self.sent[:]
+
+    def updates(self, n):
+        # the longitude of each update is its position among the updates of its vehicle
+        return [{'vid': i % 4, 'location': pyrai.Location(42.36, -71.05 + (i // 4) / 1000),
+            'event': pyrai.VehicleEvent.UNASSIGNED} for i in range(n)]
+
+    def test_vehicle_chains(self):
+        updates = [{'vid': 2}, {'vid': 1}, {'vid': 2}, {'vid': 3}, {'vid': 1}, {'vid': 2}]
+        self.assertEqual(vehicle_chains(updates), [[0, 2, 5], [1, 4], [3]])
+        self.assertEqual(vehicle_chains([]), [])
+
+    def test_update_vehicles_order(self):
+        # slow enough for the vehicles to interleave
+        self.stub.latency = 0.005
+        result = self.fleet.update_vehicles(self.updates(40), max_concurrency=4)
+
+        self.assertEqual((result.count, result.failed), (40, 0))
+        self.assertEqual([v.veh_id for v in result.results], [i % 4 for i in range(40)])
+        for vid in range(4):
+            sent = [round((r.payload['location']['lng'] + 71.05) * 1000) for r in self.sent
+                if r.endpoint == Endpoints.UPDATE_VEHICLE and r.payload['id'] == vid]
+            self.assertEqual(sent, list(range(10)))
+
+    def test_update_vehicles_errors(self):
+        self.stub.error_rate = {Endpoints.UPDATE_VEHICLE: 0.5}
+        result = self.fleet.update_vehicles(self.updates(40), max_concurrency=4)
+
+        self.assertEqual(result.count, 40)
+        self.assertTrue(0 < result.failed < 40)
+        self.assertEqual(result.succeeded + result.failed, 40)
+        self.assertEqual([e.index for e in result.errors], sorted(e.index for e in result.errors))
+        for e in result.errors:
+            self.assertIsInstance(e.error, pyrai.StatusError)
+            self.assertIsNone(result.results[e.index])
+            self.assertEqual(e.item['vid'], e.index % 4)
+        self.assertEqual(sum(1 for v in result.results if v is not None), result.succeeded)
+
+    def test_add_requests_backpressure(self):
+        self.stub.latency = 0.005
+        in_flight = []
+
+        def trips():
+            for i in range(40):
+                # the trips read and not yet answered
+                in_flight.append(i - sum(1 for r in self.sent if r.endpoint == Endpoints.ADD_REQUEST))
+                yield {'rid': i, 'pickup': {'lat': 42.36, 'lng': -71.05}, 'dropoff': {'lat': 42.37, 'lng': -71.06},
+                    'load': 1, 'request_time': self.time}
+
+        result = self.fleet.add_requests(trips(), max_in_flight=4)
+
+        self.assertEqual((result.count, result.failed), (40, 0))
+        self.assertEqual(self.stub.calls[Endpoints.ADD_REQUEST], 40)
+        self.assertEqual(max(in_flight), 4)
+
+    def test_add_requests_errors(self):
+        self.stub.error_rate = {Endpoints.ADD_REQUEST: 0.5}
+        trips = [{'rid': i, 'pickup_lat': 42.36, 'pickup_lng': -71.05, 'dropoff_lat': 42.37,
+            'dropoff_lng': -71.06, 'load': 1} for i in range(20)]
+        trips.append({'rid': 20, 'load': 1})
+        result = self.fleet.add_requests(trips, max_in_flight=4)
+
+        self.assertEqual(result.count, 21)
+        self.assertTrue(0 < result.failed < 21)
+        self.assertEqual(self.stub.calls[Endpoints.ADD_REQUEST], 20)
+        self.assertIsInstance(result.errors[-1].error, KeyError)
+        self.assertEqual(result.errors[-1].index, 20)
+
+    def test_read_trips(self):
+        with tempfile.TemporaryDirectory() as d:
+            csv_path = os.path.join(d, "trips.csv")
+            with open(csv_path, "w") as f:
+                f.write("rid,pickup_lat,pickup_lng,dropoff_lat,dropoff_lng,load,request_time\n")
+                f.write("1,42.36,-71.05,42.37,-71.06,2,2020-07-01T12:00:00Z\n")
+                f.write("2,42.36,-71.05,42.37,-71.06,1,\n")
+
+            jsonl_path = os.path.join(d, "trips.jsonl")
+            with open(jsonl_path, "w") as f:
+                f.write(json.dumps({'rid': 3, 'pickup': {'lat': 42.36, 'lng': -71.05},
+                    'dropoff': {'lat': 42.37, 'lng': -71.06}, 'load': 1, 'request_time': "2020-07-01T12:01:00Z"}))
+                f.write("\n\n")
+
+            self.assertEqual(len(list(read_trips(csv_path))), 2)
+            self.assertEqual(len(list(read_trips(jsonl_path))), 1)
+            self.assertEqual(self.fleet.add_requests(csv_path).failed, 0)
+            self.assertEqual(self.fleet.add_requests(jsonl_path).failed, 0)
+
+            with self.assertRaises(ValueError):
+                read_trips(os.path.join(d, "trips.txt"))
+
+        sent = {r.payload['id']: r.payload for r in self.sent if r.endpoint == Endpoints.ADD_REQUEST}
+        self.assertEqual(sorted(sent), [1, 2, 3])
+        self.assertEqual((sent[1]['load'], sent[1]['request_time']), (2, "2020-07-01T12:00:00Z"))
+        self.assertEqual(sent[1]['dropoff'], {'lat': 42.37, 'lng': -71.06})
+        # trips without a request time are requested at the time of the fleet's clock
+        self.assertEqual(sent[2]['request_time'], to_rfc3339(self.time))
+        self.assertEqual(sent[3]['request_time'], "2020-07-01T12:01:00Z")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestClock(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+
+    def setUp(self):
+        self.rai = pyrai.Pyrai(api_key="k", connection=pyrai.LocalConnection())
+
+    def test_virtual_clock(self):
+        clock = pyrai.VirtualClock(self.time)
+        fleet = self.rai.create_sim_fleet(clock=clock)
+        self.assertEqual((fleet.start_time, fleet.end_time), (self.time, self.time))
+
+        fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+        fleet.forward_simulate("5m")
+        fleet.forward_simulate("5m")
+        self.assertEqual(clock.now(), self.time + datetime.timedelta(minutes=10))
+
+        fleet.add_request(1, pyrai.Location(42.361, -71.051), pyrai.Location(42.37, -71.06), 1)
+        request = fleet.get_request(1)
+        self.assertEqual(request.request_time, (self.time + datetime.timedelta(minutes=10)).astimezone())
+
+        clock.advance("1m")
+        fleet.get_assignments()
+        self.assertEqual(fleet.start_time, self.time)
+        self.assertEqual(fleet.end_time, self.time + datetime.timedelta(minutes=11))
+
+        # explicit times move the clock forward, never back
+        fleet.get_assignments(self.time + datetime.timedelta(minutes=20))
+        fleet.get_assignments(self.time)
+        self.assertEqual(clock.now(), self.time + datetime.timedelta(minutes=20))
+
+    def test_fast_forward_clock(self):
+        clock = pyrai.FastForwardClock(3600, self.time)
+        later = clock.now()
+        self.assertGreaterEqual(later, self.time)
+
+        clock.advance_to(self.time + datetime.timedelta(days=1))
+        self.assertGreaterEqual(clock.now(), self.time + datetime.timedelta(days=1))
+
+    def test_set_clock(self):
+        fleet = self.rai.create_sim_fleet()
+        self.assertIsInstance(fleet.clock, pyrai.WallClock)
+
+        fleet.clock = pyrai.VirtualClock(self.time)
+        self.assertEqual((fleet.start_time, fleet.end_time), (self.time, self.time))
+
+    def test_failed_calls_keep_the_clock(self):
+        stub = StubDispatcher(seed=0, error_rate={Endpoints.FORWARD_SIMULATE: 1, Endpoints.COMPUTE_ASSIGNMENTS: 1})
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        stub.install(rai.connection)
+        clock = pyrai.VirtualClock(self.time)
+        fleet = rai.create_sim_fleet(clock=clock)
+
+        with self.assertRaises(pyrai.StatusError):
+            fleet.forward_simulate("5m")
+        with self.assertRaises(pyrai.StatusError):
+            list(fleet.stream_forward_simulate("5m"))
+        with self.assertRaises(pyrai.StatusError):
+            fleet.get_assignments(self.time + datetime.timedelta(minutes=1))
+        self.assertEqual(clock.now(), self.time)
+
+        stub.error_rate = 0
+        fleet.forward_simulate("5m")
+        self.assertEqual(clock.now(), self.time + datetime.timedelta(minutes=5))
+
+    def test_streamed_forward_simulate(self):
+        stub = StubDispatcher(seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        stub.install(rai.connection)
+
+        for r in (self.rai, rai):
+            clock = pyrai.VirtualClock(self.time)
+            advanced = []
+            advance_to = clock.advance_to
+            clock.advance_to = lambda time: advanced.append(time) or advance_to(time)
+            fleet = r.create_sim_fleet(clock=clock)
+            fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+            fleet.make_vehicle_online(2, pyrai.Location(42.37, -71.06), 4)
+
+            # once per response, however many elements it has
+            self.assertGreater(len(list(fleet.stream_forward_simulate("5m"))), 1)
+            self.assertEqual(len(advanced), 1)
+            self.assertEqual(clock.now(), self.time + datetime.timedelta(minutes=5))
+
+            # and even when it has none
+            empty = r.create_sim_fleet(clock=clock)
+            self.assertEqual(list(empty.stream_forward_simulate("5m")), [])
+            self.assertEqual(clock.now(), self.time + datetime.timedelta(minutes=10))
+
+    def test_live_fleet_clock(self):
+        stub = StubDispatcher(seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        stub.install(rai.connection)
+        clock = pyrai.VirtualClock(self.time)
+        fleet = rai.create_live_fleet(clock=clock)
+        self.assertIs(fleet.clock, clock)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import threading
+import pyrai
+from pyrai.testing import StubDispatcher
+
+class TestConnection(unittest.TestCase):
+
+    location = pyrai.Location(42.36, -71.05)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0, latency=self.latency)
+        self.server = self.stub.serve()
+        self.heads = None
+
+    def latency(self, endpoint):
+        # HEAD calls wait for each other, so that prewarming threads cannot share a connection
+        if endpoint in ("", "/") and self.heads is not None:
+            self.heads.wait()
+        return 0
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_shared_connection(self):
+        rai = pyrai.Pyrai(url=self.server.url, api_key="api_key", prewarm=0)
+        fleets = [rai.create_sim_fleet() for _ in range(3)]
+        self.assertTrue(all(fleet.connection is rai.connection for fleet in fleets))
+
+        for i, fleet in enumerate(fleets):
+            fleet.make_vehicle_online(i, self.location, 4)
+        self.assertEqual(self.server.connections, 1)
+        rai.close()
+
+    def test_prewarm(self):
+        self.heads = threading.Barrier(4, timeout=5)
+        rai = pyrai.Pyrai(url=self.server.url, api_key="api_key", pool_size=4, prewarm=8)
+        rai.create_sim_fleet()
+        self.assertEqual(self.server.connections, 4)
+
+        self.heads = threading.Barrier(2, timeout=5)
+        rai = pyrai.Pyrai(url=self.server.url, api_key="api_key", pool_size=4, prewarm=2)
+        rai.create_sim_fleet()
+        self.assertEqual(self.server.connections, 6)
+
+    def test_no_keep_alive(self):
+        rai = pyrai.Pyrai(url=self.server.url, api_key="api_key", keep_alive=False, prewarm=8)
+        fleet = rai.create_sim_fleet()
+        for i in range(3):
+            fleet.make_vehicle_online(i, self.location, 4)
+
+        # no prewarming, and a new connection for every call
+        self.assertEqual(self.server.connections, 4)
+
+if __name__ == '__main__':
+    unittest.main()
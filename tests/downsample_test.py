@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from pyrai.helpers import downsample
+
+class TestDownsample(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(10000, dtype=float)
+        self.y = np.sin(self.x / 500)
+        self.y[1234] = 10
+        self.y[5678] = -10
+
+    def test_short_series(self):
+        for method in ("lttb", "minmax"):
+            self.assertEqual(list(downsample([0, 1, 2], [1, 2, 3], 10, method)), [0, 1, 2])
+
+    def test_budget_and_spikes(self):
+        for method in ("lttb", "minmax"):
+            indices = downsample(self.x, self.y, 200, method)
+            self.assertLessEqual(len(indices), 202, method)
+            self.assertEqual(indices[0], 0, method)
+            self.assertEqual(indices[-1], len(self.x) - 1, method)
+            self.assertTrue(np.all(np.diff(indices) > 0), method)
+            self.assertIn(1234, indices, method)
+            self.assertIn(5678, indices, method)
+
+    def test_nan(self):
+        self.y[:5000] = np.nan
+        for method in ("lttb", "minmax"):
+            indices = downsample(self.x, self.y, 200, method)
+            self.assertIn(5678, indices, method)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            downsample(self.x, self.y, 200, "random")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.testing import StubDispatcher
+
+class TestFleetState(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+    pickup = pyrai.Location(42.36, -71.05)
+    dropoff = pyrai.Location(42.37, -71.06)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        self.stub.install(rai.connection)
+
+        self.fleet = rai.create_sim_fleet(clock=pyrai.VirtualClock(self.time))
+        for vid in range(3):
+            self.fleet.make_vehicle_online(vid, self.pickup, 4)
+        for rid in (1, 2):
+            self.fleet.add_request(rid, self.pickup, self.dropoff, 1, self.time)
+
+    def test_empty(self):
+        state = pyrai.FleetState()
+        self.assertIsNone(state.vehicle(0))
+        self.assertIsNone(state.vehicle_for_request(1))
+        self.assertIsNone(state.events_for_request(1))
+        self.assertEqual(state.idle_vehicles(), [])
+        self.assertTrue(state.diff.empty)
+
+    def test_indexes(self):
+        assignments = self.fleet.get_assignments(self.time)
+        state = self.fleet.state
+
+        self.assertIs(state.assignments, assignments)
+        self.assertEqual(state.todict(), {'vehs': 3, 'requests': 2, 'assigned': 2, 'idle': 1})
+        for veh in assignments.vehs:
+            self.assertIs(state.vehicle(veh.veh_id), veh)
+        for req in assignments.requests:
+            self.assertIs(state.request(req.req_id), req)
+        self.assertIsNone(state.vehicle(3))
+        self.assertIsNone(state.request(3))
+
+        self.assertEqual(sorted(v.veh_id for v in state.assigned_vehicles()), sorted(state.assigned))
+        self.assertEqual([v.veh_id for v in state.idle_vehicles()], list(state.idle))
+        self.assertFalse(state.assigned & state.idle)
+
+        for rid in (1, 2):
+            veh = state.vehicle_for_request(rid)
+            self.assertIn(rid, veh.req_ids)
+            pickup, dropoff = state.events_for_request(rid)
+            self.assertEqual((pickup.event, dropoff.event), (pyrai.VehicleEvent.PICKUP, pyrai.VehicleEvent.DROPOFF))
+            self.assertEqual((pickup.req_id, dropoff.req_id), (rid, rid))
+            self.assertIn(pickup, veh.events)
+
+    def test_picked_up(self):
+        self.fleet.get_assignments(self.time)
+        _, dropoff = self.fleet.state.events_for_request(1)
+
+        # the pickups are done within the minute, the dropoffs are not
+        self.fleet.forward_simulate("1m", self.time)
+        pickup, later = self.fleet.state.events_for_request(1)
+        self.assertIsNone(pickup)
+        self.assertEqual(later.time, dropoff.time)
+        self.assertIs(self.fleet.state.vehicle_for_request(1), self.fleet.state.vehicle(0))
+
+    def test_diff(self):
+        self.fleet.get_assignments(self.time)
+        diff = self.fleet.state.diff
+        self.assertEqual(sorted(v.veh_id for v in diff.added), [0, 1, 2])
+        self.assertEqual((diff.changed, diff.removed, diff.assigned), ([], [], [1, 2]))
+        self.assertEqual(len(diff.notifications), 2)
+
+        # one new request changes one vehicle
+        self.fleet.add_request(3, self.pickup, self.dropoff, 1, self.time)
+        self.fleet.get_assignments(self.time)
+        diff = self.fleet.state.diff
+        self.assertEqual(len(diff.changed), 1)
+        self.assertEqual(diff.changed[0].req_ids, [3])
+        self.assertEqual((diff.added, diff.removed, diff.assigned, diff.unassigned), ([], [], [3], []))
+        self.assertEqual([n.data.req_id for n in diff.notifications], [3])
+
+        # nothing changed
+        self.fleet.get_assignments(self.time)
+        self.assertTrue(self.fleet.state.diff.empty)
+
+        # the requests are done, and a vehicle is removed
+        self.fleet.forward_simulate("1h", self.time)
+        self.fleet.remove_vehicle(2, self.dropoff)
+        self.fleet.get_assignments(self.time + datetime.timedelta(hours=1))
+        diff = self.fleet.state.diff
+        self.assertEqual((diff.removed, diff.assigned, diff.unassigned), ([2], [], []))
+        self.assertEqual(self.fleet.state.todict(), {'vehs': 2, 'requests': 0, 'assigned': 0, 'idle': 2})
+
+    def test_repeated_notifications(self):
+        assignments = self.fleet.get_assignments(self.time)
+        self.assertEqual(len(assignments.notifications), 2)
+
+        # the same notification in two successive responses is reported twice
+        state = self.fleet.state
+        state.update(assignments)
+        self.assertEqual([n.todict() for n in state.diff.notifications],
+            [n.todict() for n in assignments.notifications])
+        self.assertFalse(state.diff.empty)
+
+    def test_diff_defaults(self):
+        diff = pyrai.AssignmentDiff()
+        diff.assigned.append(1)
+        self.assertEqual(pyrai.AssignmentDiff().assigned, [])
+        self.assertTrue(pyrai.AssignmentDiff().empty)
+
+if __name__ == '__main__':
+    unittest.main()
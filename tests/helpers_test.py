@@ -0,0 +1,53 @@
+import unittest
+import datetime
+from dateutil.parser import isoparse
+from pyrai.helpers import to_rfc3339, from_rfc3339, memoize_rfc3339
+
+class TestRFC3339(unittest.TestCase):
+
+    times = [
+        "2020-07-01T12:00:00Z",
+        "2020-07-01T12:00:00.5Z",
+        "2020-07-01T12:00:00.123456Z",
+        "2020-07-01T12:00:00.123456789Z",
+        "2020-07-01T12:00:00+02:00",
+        "2020-07-01T24:00:00Z",
+        "2020-07-01 12:00:00Z"
+    ]
+
+    def test_matches_isoparse(self):
+        for s in self.times:
+            expected = isoparse(s)
+            actual = from_rfc3339(s)
+            self.assertEqual(actual, expected, s)
+            self.assertEqual(type(actual.tzinfo), type(expected.tzinfo), s)
+            self.assertEqual(actual.utcoffset(), expected.utcoffset(), s)
+
+    def test_invalid(self):
+        for s in ["2020-13-01T12:00:00Z", "not a time"]:
+            with self.assertRaises(ValueError):
+                from_rfc3339(s)
+
+    def test_round_trip(self):
+        for dt in [
+            datetime.datetime(2020, 7, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2020, 7, 1, 12, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+            datetime.datetime.now()
+        ]:
+            s = to_rfc3339(dt)
+            self.assertTrue(s.endswith("Z"))
+            self.assertEqual(from_rfc3339(s), dt.astimezone(datetime.timezone.utc))
+
+    def test_memoize(self):
+        memoize_rfc3339(2)
+        try:
+            first = from_rfc3339(self.times[0])
+            self.assertIs(from_rfc3339(self.times[0]), first)
+            for s in self.times:
+                self.assertEqual(from_rfc3339(s), isoparse(s))
+        finally:
+            memoize_rfc3339(None)
+        self.assertIsNot(from_rfc3339(self.times[0]), first)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+import unittest
+
+class TestImport(unittest.TestCase):
+
+    def test_visualization_not_loaded(self):
+        # a fresh interpreter, since other tests may have loaded them already
+        code = "import sys, pyrai; print(' '.join(m for m in ('plotly', 'IPython') if m in sys.modules))"
+        out = subprocess.run([sys.executable, "-c", code],
+            stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+        self.assertEqual(out.split(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import datetime
+import os
+import tempfile
+import random
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestInstrumentation(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+    def test_histogram_quantiles(self):
+        rng = random.Random(0)
+        latencies = sorted(rng.expovariate(20) for _ in range(10000))
+        histogram = pyrai.LatencyHistogram()
+        for latency in latencies:
+            histogram.record(latency)
+
+        self.assertEqual(histogram.count, len(latencies))
+        self.assertEqual(histogram.max, latencies[-1])
+        for q in (0.5, 0.99, 0.999):
+            expected = latencies[int(q * len(latencies)) - 1]
+            self.assertAlmostEqual(histogram.quantile(q) / expected, 1, delta=0.01)
+
+    def test_records_calls(self):
+        instrumentation = pyrai.Instrumentation()
+        records = []
+        instrumentation.add_hook(records.append)
+
+        stub = StubDispatcher(seed=0, error_rate={Endpoints.ADD_REQUEST: 1})
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key", instrumentation=instrumentation)
+        stub.install(rai.connection)
+        fleet = rai.create_sim_fleet()
+
+        location = pyrai.Location(42.36, -71.05)
+        fleet.make_vehicle_online(1, location, 4)
+        with self.assertRaises(pyrai.StatusError):
+            fleet.add_request(1, location, location, 1, self.time)
+        fleet.get_assignments(self.time)
+
+        self.assertEqual([r.endpoint for r in records], [Endpoints.CREATE_SIM_FLEET,
+            Endpoints.MAKE_VEHICLE_ONLINE, Endpoints.ADD_REQUEST, Endpoints.COMPUTE_ASSIGNMENTS])
+        self.assertEqual(records[-1].fleet_key, fleet.fleet_key)
+        self.assertGreater(records[-1].response_bytes, 0)
+
+        stats = instrumentation.stats[(Endpoints.ADD_REQUEST, fleet.fleet_key)]
+        self.assertEqual(stats.status_codes, {StubDispatcher.ERROR_STATUS: 1})
+        self.assertEqual(stats.errors, {'StatusError': 1})
+
+        text = instrumentation.prometheus()
+        self.assertIn('pyrai_call_errors_total{{endpoint="{}",fleet_key="{}",error="StatusError"}} 1'.format(
+            Endpoints.ADD_REQUEST, fleet.fleet_key), text)
+        self.assertIn('pyrai_call_duration_seconds_count{{endpoint="{}",fleet_key="{}"}} 1'.format(
+            Endpoints.COMPUTE_ASSIGNMENTS, fleet.fleet_key), text)
+
+    def test_observers_never_break_calls(self):
+        def fail(record):
+            raise RuntimeError("hook")
+        records = []
+        instrumentation = pyrai.Instrumentation(hooks=[fail, records.append])
+
+        stub = StubDispatcher(seed=0, error_rate={Endpoints.ADD_REQUEST: 1})
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key", instrumentation=instrumentation)
+        stub.install(rai.connection)
+        fleet = rai.create_sim_fleet()
+        tracer = pyrai.Tracer()
+        tracer.record_call = fail
+        rai.connection.tracer = tracer
+
+        location = pyrai.Location(42.36, -71.05)
+        with self.assertLogs("pyrai", "ERROR"):
+            self.assertEqual(fleet.make_vehicle_online(1, location, 4).status, 0)
+            with self.assertRaises(pyrai.StatusError):
+                fleet.add_request(1, location, location, 1, self.time)
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(instrumentation.hook_errors, 3)
+
+        # a closed recorder no longer records, but calls still succeed
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = pyrai.TrafficRecorder(os.path.join(tmp, "traffic.log"))
+            instrumentation.hooks = [recorder]
+            recorder.close()
+            with self.assertLogs("pyrai", "ERROR"):
+                self.assertEqual(fleet.make_vehicle_offline(1, location).status, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import datetime
+import sys
+from unittest import mock
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestJSONCodec(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+    location = pyrai.Location(42.36, -71.05)
+
+    def fleet(self, codec):
+        stub = StubDispatcher(seed=0)
+        sent = []
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key", codec=codec,
+            instrumentation=pyrai.Instrumentation(hooks=[sent.append]))
+        stub.install(rai.connection)
+        return rai.create_sim_fleet(clock=pyrai.VirtualClock(self.time)), sent
+
+    def test_stdlib_fallback(self):
+        # an import of a module set to None in sys.modules raises ImportError
+        with mock.patch.dict(sys.modules, {'orjson': None}):
+            self.assertEqual(pyrai.JSONCodec.default().name, "json")
+            with self.assertRaises(ImportError):
+                pyrai.JSONCodec.orjson()
+
+            rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+            self.assertEqual(rai.connection.codec.name, "json")
+
+    def test_codecs_agree(self):
+        responses = []
+        for codec in (pyrai.JSONCodec.stdlib(), pyrai.JSONCodec.default()):
+            fleet, sent = self.fleet(codec)
+            fleet.make_vehicle_online(1, self.location, 4)
+            fleet.add_request(1, self.location, pyrai.Location(42.37, -71.06), 1, self.time)
+            assignments = fleet.get_assignments(self.time)
+            responses.append(([(r.endpoint, r.payload) for r in sent if r.endpoint != Endpoints.CREATE_SIM_FLEET],
+                str(assignments)))
+        self.assertEqual(responses[0], responses[1])
+
+    def test_user_key_dict(self):
+        fleet, sent = self.fleet(None)
+        key = fleet.user_key_dict
+        self.assertEqual(key, fleet.user_key.todict())
+        self.assertIs(fleet.user_key_dict, key)
+
+        fleet.add_request(1, self.location, self.location, 1, self.time)
+        self.assertIs(sent[-1].payload['user_key'], key)
+
+        # the cached dictionary follows the keys
+        fleet.fleet_key = "fleet_key"
+        self.assertEqual(fleet.user_key_dict, {'api_key': "api_key", 'fleet_key': "fleet_key"})
+        self.assertIsNot(fleet.user_key_dict, key)
+        self.assertEqual(fleet.user_key.fleet_key, "fleet_key")
+
+if __name__ == '__main__':
+    unittest.main()
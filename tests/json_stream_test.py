@@ -0,0 +1,39 @@
+import unittest
+import json
+from pyrai import JSONStream
+
+class TestJSONStream(unittest.TestCase):
+
+    doc = {
+        "status": 0,
+        "vehs": [{"veh_id": 1, "events": [{"req_id": 2}]}, {"veh_id": 3, "events": []}],
+        "reqs": [],
+        "notifications": [{"message": "café → done", "data": {"veh_id": 1}}],
+        "count": 123
+    }
+
+    def parse(self, body, size):
+        stream = JSONStream(["vehs", "reqs", "notifications"])
+        items = []
+        for i in range(0, len(body), size):
+            items += stream.feed(body[i:i + size])
+        return items, stream.close()
+
+    def test_any_chunking(self):
+        body = json.dumps(self.doc, indent=1).encode()
+        expected = [("vehs", v) for v in self.doc["vehs"]] + \
+            [("notifications", n) for n in self.doc["notifications"]]
+        for size in [1, 2, 7, len(body)]:
+            items, fields = self.parse(body, size)
+            self.assertEqual(items, expected, size)
+            self.assertEqual(fields, {"status": 0, "count": 123}, size)
+
+    def test_incomplete(self):
+        body = json.dumps(self.doc).encode()
+        with self.assertRaises(ValueError):
+            self.parse(body[:-1], 5)
+        with self.assertRaises(ValueError):
+            self.parse(b"[1, 2]", 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import datetime
+import pyrai
+
+class TestLocalSimulation(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        self.rai = pyrai.Pyrai(api_key="k", connection=pyrai.LocalConnection())
+        self.fleet = self.rai.create_sim_fleet(max_wait="5m", max_delay="10m")
+
+    def test_completes_trips(self):
+        self.fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+        self.fleet.add_request(1, pyrai.Location(42.361, -71.051), pyrai.Location(42.37, -71.06), 2, self.time)
+
+        assignments = self.fleet.forward_simulate("2m", self.time)
+        self.assertEqual(assignments.vehs[0].req_ids, [1])
+        self.assertEqual([e.event for e in assignments.vehs[0].events], [pyrai.VehicleEvent.DROPOFF])
+        self.assertEqual(self.fleet.get_request(1).veh_id, 1)
+
+        assignments = self.fleet.forward_simulate("30m", self.time + datetime.timedelta(minutes=2))
+        self.assertEqual(assignments.vehs[0].events, [])
+        self.assertEqual(assignments.requests, [])
+
+    def test_capacity_and_drops(self):
+        self.fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 2)
+        self.fleet.add_request(1, pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.06), 2, self.time)
+        self.fleet.add_request(2, pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.06), 3, self.time)
+        self.fleet.add_request(3, pyrai.Location(43.36, -72.05), pyrai.Location(43.37, -72.06), 1, self.time)
+
+        assignments = self.fleet.get_assignments(self.time)
+        self.assertEqual(assignments.vehs[0].req_ids, [1])
+        veh_ids = {r.req_id: r.veh_id for r in assignments.requests}
+        self.assertEqual(veh_ids, {1: 1, 2: -1, 3: -1})
+
+        # unassigned requests are dropped once they waited max_wait
+        self.fleet.get_assignments(self.time + datetime.timedelta(minutes=6))
+        assignments = self.fleet.get_assignments(self.time + datetime.timedelta(minutes=7))
+        self.assertEqual(assignments.requests, [])
+
+    def test_vehicles(self):
+        self.fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+        self.fleet.add_request(1, pyrai.Location(42.37, -71.06), pyrai.Location(42.38, -71.07), 1, self.time)
+        self.fleet.get_assignments(self.time)
+
+        veh = self.fleet.get_vehicle_info(1)
+        self.assertEqual(veh.req_ids, [1])
+        self.assertEqual(veh.location.todict(), {"lat": 42.36, "lng": -71.05})
+
+        self.assertEqual(self.fleet.cancel_request(1).status, 0)
+        self.assertIsNone(self.fleet.remove_vehicle(1, pyrai.Location(42.36, -71.05)))
+        with self.assertRaises(pyrai.StatusError):
+            self.fleet.get_vehicle_info(1)
+        with self.assertRaises(pyrai.StatusError):
+            self.fleet.get_metrics(cached=False)
+
+if __name__ == '__main__':
+    unittest.main()
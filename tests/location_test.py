@@ -0,0 +1,56 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.testing import StubDispatcher
+
+class TestLocation(unittest.TestCase):
+
+    def tearDown(self):
+        pyrai.Location.intern_locations(None)
+
+    def test_slots(self):
+        location = pyrai.Location(42.36, -71.05)
+        self.assertFalse(hasattr(location, '__dict__'))
+        with self.assertRaises(AttributeError):
+            location.name = "Boston"
+
+    def test_not_interned(self):
+        a = pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05})
+        b = pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05})
+        self.assertIsNot(a, b)
+        self.assertEqual(a.todict(), b.todict())
+
+    def test_intern_locations(self):
+        pyrai.Location.intern_locations(2)
+        a = pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05})
+        self.assertIs(pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05}), a)
+        self.assertIsNot(pyrai.Location.fromdict({'lat': 42.37, 'lng': -71.05}), a)
+
+        # the interned locations are forgotten when the size is reached
+        pyrai.Location.fromdict({'lat': 42.38, 'lng': -71.05})
+        self.assertIsNot(pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05}), a)
+
+        pyrai.Location.intern_locations(None)
+        self.assertIsNot(pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05}),
+            pyrai.Location.fromdict({'lat': 42.36, 'lng': -71.05}))
+
+    def test_interned_assignments(self):
+        time = datetime.datetime(2020, 7, 1, 12)
+        pickup, dropoff = pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.06)
+        stub = StubDispatcher(seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        stub.install(rai.connection)
+        fleet = rai.create_sim_fleet(clock=pyrai.VirtualClock(time))
+        fleet.make_vehicle_online(1, pickup, 4)
+        fleet.add_request(1, pickup, dropoff, 1, time)
+
+        pyrai.Location.intern_locations()
+        assignments = fleet.get_assignments(time)
+        veh, req = assignments.vehs[0], assignments.requests[0]
+        # the vehicle, its pickup event and the request share one location
+        self.assertIs(veh.events[0].location, req.pickup)
+        self.assertIs(veh.location, req.pickup)
+        self.assertIs(veh.events[1].location, req.dropoff)
+
+if __name__ == '__main__':
+    unittest.main()
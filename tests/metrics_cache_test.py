@@ -0,0 +1,108 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.helpers import to_rfc3339
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestMetricsCache(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0)
+        self.sent = []
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key",
+            instrumentation=pyrai.Instrumentation(hooks=[self.sent.append]))
+        self.stub.install(rai.connection)
+
+        self.fleet = rai.create_sim_fleet(clock=pyrai.VirtualClock(self.time))
+        self.fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+        self.fleet.add_request(1, pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.06), 1, self.time)
+        self.fleet.forward_simulate("2h", self.time)
+
+        self.cache = self.fleet.metrics_cache
+        self.cache.window = 1800
+
+    def at(self, minutes):
+        return self.time + datetime.timedelta(minutes=minutes)
+
+    def get(self, start, end, fields=(pyrai.Metrics.TOTAL_REQUESTS,)):
+        return self.fleet.get_metrics(self.at(start), self.at(end), list(fields))
+
+    def queried(self):
+        # the queries sent since the last call, with the times of each
+        queries = [r.payload['query'] for r in self.sent if r.endpoint == Endpoints.GRAPHQL]
+        del self.sent[:]
+        return queries
+
+    def assertPoints(self, rows, start, end):
+        self.assertEqual([row[pyrai.Metrics.TIME] for row in rows],
+            [to_rfc3339(self.at(m)) for m in range(start, end + 1)])
+
+    def test_missing_ranges(self):
+        # split into two windows, sharing the point at 30 minutes
+        self.assertPoints(self.get(0, 60), 0, 60)
+        queries = self.queried()
+        self.assertEqual(len(queries), 2)
+        self.assertIn(to_rfc3339(self.at(30)), queries[0])
+        self.assertIn(to_rfc3339(self.at(30)), queries[1])
+        self.assertEqual(len(self.cache.rows), 61)
+
+        # cached
+        self.assertPoints(self.get(10, 50), 10, 50)
+        self.assertEqual(self.queried(), [])
+
+        # only after the last cached point
+        self.assertPoints(self.get(0, 90), 0, 90)
+        queries = self.queried()
+        self.assertEqual(len(queries), 1)
+        self.assertIn(to_rfc3339(self.at(60)), queries[0])
+        self.assertNotIn(to_rfc3339(self.at(0)), queries[0])
+
+        # only before the first cached point
+        self.assertPoints(self.get(-20, 90), -20, 90)
+        queries = self.queried()
+        self.assertEqual(len(queries), 1)
+        self.assertIn(to_rfc3339(self.at(-20)), queries[0])
+        self.assertIn(to_rfc3339(self.at(0)), queries[0])
+
+        self.assertEqual(len(self.cache.rows), 111)
+        self.assertEqual(self.cache.queries, self.stub.calls[Endpoints.GRAPHQL])
+        self.assertEqual(self.cache.queries, 4)
+
+    def test_fields(self):
+        self.get(0, 30)
+        self.assertEqual(len(self.queried()), 1)
+        self.assertEqual(self.cache.fields, {pyrai.Metrics.TOTAL_REQUESTS})
+
+        # a metric that is not cached clears the cache, refilled with both
+        rows = self.get(0, 30, [pyrai.Metrics.IDLE_VEHICLES])
+        queries = self.queried()
+        self.assertEqual(len(queries), 1)
+        self.assertIn(pyrai.Metrics.TOTAL_REQUESTS, queries[0])
+        self.assertIn(pyrai.Metrics.IDLE_VEHICLES, queries[0])
+        self.assertEqual(self.cache.fields, {pyrai.Metrics.TOTAL_REQUESTS, pyrai.Metrics.IDLE_VEHICLES})
+        self.assertIn(pyrai.Metrics.TOTAL_REQUESTS, rows[0])
+
+        # both are cached now
+        self.get(0, 30)
+        self.get(0, 30, [pyrai.Metrics.IDLE_VEHICLES, pyrai.Metrics.TOTAL_REQUESTS])
+        self.assertEqual(self.queried(), [])
+
+        # all metrics
+        rows = self.fleet.get_metrics(self.at(0), self.at(30))
+        self.assertEqual(len(self.queried()), 1)
+        self.assertIsNone(self.cache.fields)
+        self.assertEqual(set(rows[0]), set(pyrai.Metrics.FIELDS))
+        self.get(0, 30)
+        self.assertEqual(self.queried(), [])
+
+    def test_not_cached(self):
+        self.fleet.get_metrics(self.at(0), self.at(30), cached=False)
+        self.fleet.get_metrics(self.at(0), self.at(30), cached=False)
+        self.assertEqual(self.stub.calls[Endpoints.GRAPHQL], 2)
+        self.assertEqual(self.cache.queries, 0)
+
+if __name__ == '__main__':
+    unittest.main()
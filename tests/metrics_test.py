@@ -0,0 +1,27 @@
+import unittest
+from pyrai import Metrics
+
+class TestMetricsQuery(unittest.TestCase):
+
+    def test_fields(self):
+        query = Metrics.query([("api", "fleet")], "s", "e", [Metrics.AVG_WAIT])
+        self.assertIn(Metrics.TIME, query)
+        self.assertIn(Metrics.AVG_WAIT, query)
+        self.assertNotIn(Metrics.PASSENGERS, query)
+
+        query = Metrics.query([("api", "fleet")], "s", "e")
+        for field in Metrics.FIELDS:
+            self.assertIn(field, query)
+
+    def test_fleets(self):
+        query = Metrics.query([("api", "a"), ("api", "b")], "s", "e")
+        self.assertIn('{}: live_fleets'.format(Metrics.alias(0)), query)
+        self.assertIn('{}: live_fleets'.format(Metrics.alias(1)), query)
+        self.assertIn('fleet_key: "b"', query)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            Metrics.query([("api", "fleet")], "s", "e", ["speed"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import datetime
+import os
+import tempfile
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestReplay(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+    def fleet(self, hook):
+        stub = StubDispatcher(seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key",
+            instrumentation=pyrai.Instrumentation(hooks=[hook]))
+        stub.install(rai.connection)
+        return rai.create_sim_fleet()
+
+    def test_record_and_replay(self):
+        path = os.path.join(tempfile.mkdtemp(), "traffic.log")
+        with pyrai.TrafficRecorder(path) as recorder:
+            fleet = self.fleet(recorder)
+            for vid in range(10):
+                fleet.make_vehicle_online(vid, pyrai.Location(42.36, -71.05), 4)
+            for tick in range(3):
+                fleet.update_vehicles([{
+                    'vid': vid,
+                    'location': pyrai.Location(42.36 + tick * 1e-3, -71.05),
+                    'event': pyrai.VehicleEvent.UNASSIGNED,
+                    'event_time': self.time
+                } for vid in range(10)])
+                fleet.add_request(tick, pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.04), 1, self.time)
+                fleet.get_assignments(self.time)
+
+        # a frame cut short by a crash is ignored
+        with open(path, "ab") as f:
+            f.write(b"\xff\x00\x00\x00{")
+
+        with pyrai.TrafficLog(path) as log:
+            entries = list(log)
+        self.assertEqual(len(entries), 1 + 10 + 3 * 12)
+        self.assertNotIn('user_key', entries[1]['payload'])
+
+        records = []
+        replayed = self.fleet(records.append)
+        result = replayed.replay(path, speed=None)
+        self.assertEqual(result.count, len(entries) - 1)
+        self.assertEqual(result.failed, 0)
+
+        def locations(calls):
+            by_vehicle = {}
+            for endpoint, payload in calls:
+                if endpoint == Endpoints.UPDATE_VEHICLE:
+                    by_vehicle.setdefault(payload['id'], []).append(payload['location']['lat'])
+            return by_vehicle
+
+        self.assertEqual(locations((r.endpoint, r.payload) for r in records),
+            locations((e['endpoint'], e['payload']) for e in entries))
+
+    def test_keys_not_recorded(self):
+        path = os.path.join(tempfile.mkdtemp(), "traffic.log")
+        with pyrai.TrafficRecorder(path) as recorder:
+            stub = StubDispatcher(seed=0)
+            rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="secret-api-key",
+                instrumentation=pyrai.Instrumentation(hooks=[recorder]))
+            stub.install(rai.connection)
+            fleet = rai.create_sim_fleet()
+            fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+            fleet.get_metrics(self.time, self.time + datetime.timedelta(minutes=5))
+
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertNotIn(b"secret-api-key", data)
+
+        with pyrai.TrafficLog(path) as log:
+            query = [e for e in log if e['endpoint'] == Endpoints.GRAPHQL][0]['payload']['query']
+        self.assertIn('api_key: ""', query)
+        self.assertIn('fleet_key: ""', query)
+
+if __name__ == '__main__':
+    unittest.main()
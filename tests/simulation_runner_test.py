@@ -0,0 +1,92 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestSimulationRunner(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        self.rai = pyrai.Pyrai(api_key="k", connection=pyrai.LocalConnection())
+        self.fleet = self.rai.create_sim_fleet(max_wait="5m", max_delay="10m")
+        self.fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+        self.fleet.make_vehicle_online(2, pyrai.Location(42.37, -71.06), 4)
+
+    def trips(self, n, seconds):
+        return [{
+            'rid': i,
+            'pickup': {'lat': 42.36, 'lng': -71.05},
+            'dropoff': {'lat': 42.37, 'lng': -71.06},
+            'load': 1,
+            'request_time': (self.time + datetime.timedelta(seconds=i * seconds)).isoformat()
+        } for i in range(n)]
+
+    def test_schedule(self):
+        steps = []
+        runner = pyrai.SimulationRunner(self.fleet, self.trips(10, 20), step=["1m", 120],
+            snapshot_every=2, on_step=lambda step, assignments: steps.append(step))
+        report = runner.run()
+
+        self.assertEqual([(s['time'], s['seconds'], s['requests']) for s in report.steps], [
+            (self.time, 60, 3),
+            (self.time + datetime.timedelta(minutes=1), 120, 6),
+            (self.time + datetime.timedelta(minutes=3), 120, 1)
+        ])
+        self.assertEqual(steps, report.steps)
+        self.assertEqual(report.requests, 10)
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.simulated_seconds, 300)
+        self.assertEqual([t for t, _ in report.snapshots], [
+            self.time + datetime.timedelta(minutes=1),
+            self.time + datetime.timedelta(minutes=5)
+        ])
+        self.assertGreater(report.sim_hours_per_wall_minute, 0)
+
+    def test_adaptive_steps(self):
+        trips = self.trips(20, 10) + [dict(t, rid=t['rid'] + 20) for t in self.trips(4, 600)[1:]]
+        trips[20:] = [dict(t, request_time=(self.time + datetime.timedelta(seconds=200 + i * 600)).isoformat())
+            for i, t in enumerate(trips[20:])]
+        report = pyrai.SimulationRunner(self.fleet, trips, target_requests=5, min_step=30,
+            max_step=900, snapshot_every=None).run()
+
+        self.assertEqual([(s['seconds'], s['requests']) for s in report.steps][:4],
+            [(41, 5), (50, 5), (50, 5), (50, 5)])
+        self.assertIn(900, [s['seconds'] for s in report.steps])
+        self.assertEqual(report.requests, 23)
+        self.assertEqual(report.snapshots, [])
+
+    def test_end_time(self):
+        end_time = self.time + datetime.timedelta(minutes=2)
+        report = pyrai.SimulationRunner(self.fleet, self.trips(30, 10), start_time=self.time,
+            end_time=end_time, step=90, pipeline=False).run()
+
+        self.assertEqual([s['seconds'] for s in report.steps], [90, 30])
+        self.assertEqual(report.requests, 12)
+        self.assertEqual(self.fleet.get_request(11).req_id, 11)
+
+    def test_pipeline_overlap(self):
+        # the next requests reach the stub while it waits to forward simulate
+        trips = [dict(t, dropoff={'lat': 42.46, 'lng': -71.06}) for t in self.trips(4, 20)]
+        trips[2:] = [dict(t, request_time=(self.time + datetime.timedelta(seconds=70 + i * 10)).isoformat())
+            for i, t in enumerate(trips[2:])]
+        end = self.time + datetime.timedelta(minutes=1)
+        latency = lambda endpoint: 0.2 if endpoint == Endpoints.FORWARD_SIMULATE else 0
+
+        for pipeline in (True, False):
+            stub = StubDispatcher(seed=0, latency=latency)
+            rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+            stub.install(rai.connection)
+            fleet = rai.create_sim_fleet(max_wait="5m")
+            fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+
+            report = pyrai.SimulationRunner(fleet, trips, step=60, pipeline=pipeline).run()
+            _, snapshot = report.snapshots[0]
+            later = [r.req_id for r in snapshot.requests if r.request_time >= end]
+
+            self.assertEqual(sorted(later), [2, 3] if pipeline else [])
+            self.assertEqual([(s['requests'], s['assigned']) for s in report.steps], [(2, 2), (2, 4)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import datetime
+import pyrai
+from pyrai.testing import StubDispatcher
+
+class TestStubDispatcher(unittest.TestCase):
+
+    api_key = "774721b6-2e77-4d4a-8b4c-e997bcef11c3"
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+    def setUp(self):
+        self.stub = StubDispatcher(api_keys=[self.api_key], seed=0)
+
+    def run_calls(self, url, connect=lambda rai: None):
+        rai = pyrai.Pyrai(url=url, api_key=self.api_key)
+        bad_rai = pyrai.Pyrai(url=url, api_key="abcd")
+        connect(rai)
+        connect(bad_rai)
+
+        sim_fleet = rai.create_sim_fleet(max_wait="3m", max_delay="6m",
+            unlocked_window="2m", close_pickup_window="1s")
+        self.assertIsNotNone(sim_fleet.fleet_key)
+        with self.assertRaises(pyrai.StatusError):
+            bad_rai.create_sim_fleet()
+
+        resp = sim_fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 5)
+        self.assertEqual(resp.status, 0, resp.error)
+
+        veh = sim_fleet.get_vehicle_info(1)
+        self.assertEqual(veh.veh_id, 1)
+        veh.update(pyrai.VehicleEvent.UNASSIGNED, location=pyrai.Location(42.35, -71.06))
+        self.assertEqual(veh.location.todict(), {"lat": 42.35, "lng": -71.06})
+
+        resp = sim_fleet.add_request(2, pyrai.Location(42.37, -71.04), pyrai.Location(42.39, -71.02), 3, self.time)
+        self.assertEqual(resp.status, 0, resp.error)
+
+        req = sim_fleet.get_request(2)
+        self.assertEqual(req.veh_id, -1)
+        self.assertEqual(req.load, 3)
+        self.assertEqual(req.assigned, False)
+
+        assignments = sim_fleet.get_assignments(self.time)
+        self.assertEqual([v.veh_id for v in assignments.vehs], [1])
+        self.assertEqual([r.req_id for r in assignments.requests], [2])
+        self.assertEqual([e.event for e in assignments.vehs[0].events], ["pickup", "dropoff"])
+        self.assertEqual(assignments.notifications[0].data.assigned, True)
+
+        assignments = sim_fleet.forward_simulate("1h", self.time)
+        self.assertEqual(assignments.vehs[0].events, [])
+        self.assertEqual(assignments.requests, [])
+
+        metrics = sim_fleet.get_metrics(self.time, self.time + datetime.timedelta(hours=1),
+            [pyrai.Metrics.TOTAL_REQUESTS], cached=False)
+        self.assertEqual(len(metrics), 61)
+        self.assertEqual(metrics[-1], {"time": "2020-07-01T13:00:00Z", "total_requests": 1})
+
+        self.assertEqual(veh.make_offline().status, 0)
+        self.assertEqual(veh.remove(), None)
+        with self.assertRaises(pyrai.StatusError):
+            sim_fleet.get_vehicle_info(1)
+
+    def test_in_process(self):
+        self.run_calls(StubDispatcher.URL, lambda rai: self.stub.install(rai.connection))
+
+    def test_http(self):
+        with self.stub.serve() as server:
+            self.run_calls(server.url)
+
+    def test_fleet_size_and_errors(self):
+        stub = StubDispatcher(vehicles=100, requests=50, seed=0, error_rate={"/dispatcher/request/add": 1})
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key=self.api_key)
+        stub.install(rai.connection)
+        fleet = rai.create_sim_fleet()
+
+        assignments = fleet.get_assignments(self.time)
+        self.assertEqual(len(assignments.vehs), 100)
+        self.assertEqual(len(assignments.requests), 50)
+        self.assertTrue(all(r.assigned for r in assignments.requests))
+
+        with self.assertRaises(pyrai.StatusError):
+            fleet.add_request(100, pyrai.Location(42.37, -71.04), pyrai.Location(42.39, -71.02), 1, self.time)
+        self.assertEqual(stub.calls["/dispatcher/request/add"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
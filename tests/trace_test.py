@@ -0,0 +1,49 @@
+import unittest
+import datetime
+import json
+import os
+import tempfile
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestTrace(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12, tzinfo=datetime.timezone.utc)
+
+    def test_trace(self):
+        stub = StubDispatcher(vehicles=10, seed=0)
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key")
+        stub.install(rai.connection)
+        fleet = rai.create_sim_fleet()
+        location = pyrai.Location(42.36, -71.05)
+
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        with fleet.trace(path) as tracer:
+            with tracer.span("tick"):
+                fleet.add_request(1, location, location, 1, self.time)
+                fleet.get_assignments(self.time)
+        fleet.get_assignments(self.time)
+        self.assertIsNone(rai.connection.tracer)
+
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        calls = [e for e in events if e['cat'] == "call"]
+        self.assertEqual([e['name'] for e in calls], [Endpoints.ADD_REQUEST, Endpoints.COMPUTE_ASSIGNMENTS])
+        self.assertEqual(calls[0]['args']['fleet_key'], fleet.fleet_key)
+        self.assertEqual([e['name'] for e in events if e['cat'] == "span"], ["tick"])
+
+        summary = tracer.summary()
+        self.assertEqual(set(summary[Endpoints.ADD_REQUEST]),
+            {"total", "build", "encode", "network", "decode", "model"})
+        self.assertEqual(set(summary[Endpoints.COMPUTE_ASSIGNMENTS]),
+            {"total", "build", "network", "decode", "model"})
+
+        # phases lie within their call
+        for call in calls:
+            phases = [e for e in events if e['cat'] == "phase"
+                and call['ts'] <= e['ts'] <= call['ts'] + call['dur']]
+            self.assertTrue(all(e['ts'] + e['dur'] <= call['ts'] + call['dur'] + 1 for e in phases))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import datetime
+import threading
+import pyrai
+from pyrai.dispatcher.structures.endpoints import Endpoints
+from pyrai.testing import StubDispatcher
+
+class TestUpdateBuffer(unittest.TestCase):
+
+    time = datetime.datetime(2020, 7, 1, 12)
+
+    def setUp(self):
+        self.stub = StubDispatcher(seed=0)
+        self.sent = []
+        self.instrumentation = pyrai.Instrumentation(hooks=[self.sent.append])
+        rai = pyrai.Pyrai(url=StubDispatcher.URL, api_key="api_key", instrumentation=self.instrumentation)
+        self.stub.install(rai.connection)
+
+        self.clock = pyrai.VirtualClock(self.time)
+        self.fleet = rai.create_sim_fleet(clock=self.clock)
+        self.fleet.make_vehicle_online(1, pyrai.Location(42.36, -71.05), 4)
+        self.fleet.add_request(1, pyrai.Location(42.36, -71.05), pyrai.Location(42.37, -71.06), 1, self.time)
+        self.buffer = self.fleet.enable_update_buffer(window=None)
+        del self.sent[:]
+
+    def tearDown(self):
+        self.fleet.disable_update_buffer()
+
+    def updates(self):
+        return [(r.payload['event'], r.payload['event_time'], r.status_code)
+            for r in self.sent if r.endpoint == Endpoints.UPDATE_VEHICLE]
+
+    def test_coalesces(self):
+        for minute in range(3):
+            self.clock.set(self.time + datetime.timedelta(minutes=minute))
+            self.assertIsNone(self.fleet.update_vehicle(1, pyrai.Location(42.36, -71.05 + minute / 100),
+                pyrai.VehicleEvent.PROGRESS, req_id=1))
+        self.assertEqual(self.updates(), [])
+
+        self.clock.set(self.time + datetime.timedelta(minutes=10))
+        result = self.buffer.flush()
+        self.assertEqual(result.count, 1)
+        # the update keeps the time it was received at
+        self.assertEqual(self.updates(), [("progress", "2020-07-01T12:02:00Z", 200)])
+        self.assertEqual((self.buffer.received, self.buffer.coalesced, self.buffer.sent), (3, 2, 1))
+
+    def test_pickup_after_held_update(self):
+        self.fleet.update_vehicle(1, pyrai.Location(42.36, -71.05), pyrai.VehicleEvent.PROGRESS, req_id=1)
+        self.clock.set(self.time + datetime.timedelta(minutes=1))
+        veh = self.fleet.update_vehicle(1, pyrai.Location(42.36, -71.05), pyrai.VehicleEvent.PICKUP, req_id=1)
+
+        self.assertEqual(veh.veh_id, 1)
+        self.assertEqual(self.updates(), [
+            ("progress", "2020-07-01T12:00:00Z", 200),
+            ("pickup", "2020-07-01T12:01:00Z", 200)
+        ])
+        self.assertEqual((self.buffer.sent, self.buffer.passed_through, self.buffer.failed), (2, 1, 0))
+        self.assertIsNone(self.buffer.flush())
+
+    def test_held_update_failure(self):
+        self.fleet.update_vehicle(1, pyrai.Location(42.36, -71.05), pyrai.VehicleEvent.PROGRESS, req_id=1)
+
+        # only the held update fails
+        self.stub.error_rate = {Endpoints.UPDATE_VEHICLE: 1}
+        self.instrumentation.add_hook(lambda record: setattr(self.stub, 'error_rate', 0))
+        veh = self.fleet.update_vehicle(1, pyrai.Location(42.36, -71.05), pyrai.VehicleEvent.PICKUP, req_id=1)
+
+        self.assertEqual(veh.veh_id, 1)
+        self.assertEqual([u[::2] for u in self.updates()], [("progress", 503), ("pickup", 200)])
+        self.assertEqual(self.buffer.last_result.failed, 1)
+        self.assertIsInstance(self.buffer.last_result.errors[0].error, pyrai.StatusError)
+        self.assertEqual((self.buffer.sent, self.buffer.failed), (1, 1))
+
+    def test_sends_wait_only_for_the_same_vehicle(self):
+        self.fleet.make_vehicle_online(2, pyrai.Location(42.37, -71.06), 4)
+        self.fleet.update_vehicle(1, pyrai.Location(42.36, -71.05), pyrai.VehicleEvent.PROGRESS, req_id=1)
+        del self.sent[:]
+
+        # the first update sent is held in flight until the gate opens
+        blocked, gate = threading.Event(), threading.Event()
+        def latency(endpoint):
+            if endpoint == Endpoints.UPDATE_VEHICLE and not blocked.is_set():
+                blocked.set()
+                gate.wait(5)
+            return 0
+        self.stub.latency = latency
+        flush = threading.Thread(target=self.buffer.flush)
+        flush.start()
+        self.assertTrue(blocked.wait(5))
+
+        # a pickup of another vehicle is not held behind the flush
+        self.fleet.update_vehicle(2, pyrai.Location(42.37, -71.06), pyrai.VehicleEvent.PICKUP, req_id=1)
+        self.assertEqual([r.payload['id'] for r in self.sent], [2])
+
+        # a pickup of the flushed vehicle waits for it
+        pickup = threading.Thread(target=self.fleet.update_vehicle,
+            args=(1, pyrai.Location(42.36, -71.05), pyrai.VehicleEvent.PICKUP), kwargs={'req_id': 1})
+        pickup.start()
+        pickup.join(0.2)
+        self.assertTrue(pickup.is_alive())
+
+        gate.set()
+        flush.join()
+        pickup.join()
+        self.assertEqual([(r.payload['id'], r.payload['event']) for r in self.sent],
+            [(2, "pickup"), (1, "progress"), (1, "pickup")])
+        self.assertEqual(self.buffer._in_flight, {})
+
+if __name__ == '__main__':
+    unittest.main()